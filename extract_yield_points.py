@@ -0,0 +1,39 @@
+# System packages
+import sys
+import os
+
+# Local-packages
+from homogenization_scripts.post_processor.yield_point_extraction import extract_yield_points, find_result_files, write_yield_points_to_file
+
+def extract_yield_points_to_file(condition: str, values: list[float], output_path: str, paths: list[str]) -> None:
+    # Finds the yield points of all result files for each of the yield values, see yield_point_extraction.py
+    result_files = find_result_files(paths)
+    if len(result_files) == 0:
+        print(f"No result files (.hdf5) found in {paths}")
+        return
+    print(f"Extracting {len(values)} yield point(s) from {len(result_files)} result file(s)")
+    yield_points = extract_yield_points(result_files, condition, values)
+    write_yield_points_to_file(yield_points, output_path)
+    print(f"Found {sum(yield_points['yield_found'])} of {len(yield_points)} yield point(s), written to {os.path.abspath(output_path)}")
+    if any(yield_points['error'] != ''):
+        print(f"{sum(yield_points['error'] != '')} yield point(s) could not be extracted, see the error column.")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 5:
+        print("Not the right amount of arguments given!")
+        print("Use:")
+        print("python extract_yield_points.py 'condition' 'values' 'output_path' 'result_file_or_folder' [...]")
+        print("condition is one of: stress_strain_curve, modulus_degradation, plastic_work")
+        print("values is one or more yield values, separated by commas (i.e. 0.001,0.002)")
+        print("output_path is the .csv file to write the yield points to")
+        print("result_file_or_folder are DAMASK_grid result files (.hdf5) or folders to search for these (i.e. the damask_files folder of a project)")
+        print("Got the following arguments:")
+        for arg in range(len(sys.argv[1:])):
+            print(f"arg_{arg} = {sys.argv[arg+1]}")
+        print("")
+        raise ValueError("Not the right number of arguments supplied! See previous output for help")
+
+    condition: str = sys.argv[1]
+    values: list[float] = [float(value) for value in sys.argv[2].split(',')]
+    output_path: str = sys.argv[3]
+    extract_yield_points_to_file(condition, values, output_path, sys.argv[4:])
@@ -90,6 +90,22 @@ def create_unconstrained_tensor(number_of_tensors: int) -> list[list[list[float
     
     return tensor_set
 
+def yield_condition_values(problem_definition: ProblemDefinition) -> dict[str, float]:
+    # The yield value of every yield condition, as set in the problem definition.
+    return {
+        'stress_strain_curve': problem_definition.yielding_condition.plastic_strain_yield,
+        'modulus_degradation': problem_definition.yielding_condition.modulus_degradation_percentage,
+        'plastic_work': problem_definition.yielding_condition.plastic_work_threshold,
+    }
+
+def tracked_yield_conditions(problem_definition: ProblemDefinition) -> dict[str, float]:
+    # With track_all_yield_conditions all yield conditions are evaluated while the job runs, else only the yield_condition.
+    yield_values = yield_condition_values(problem_definition)
+    if getattr(problem_definition.yielding_condition, "track_all_yield_conditions", False):
+        return yield_values
+    yield_condition = problem_definition.yielding_condition.yield_condition
+    return {yield_condition: yield_values[yield_condition]}
+
 def define_stop_condition_yielding(problem_definition: ProblemDefinition) -> StopCondition.Yielding:
     yield_condition = problem_definition.yielding_condition.yield_condition
     if yield_condition == 'stress_strain_curve':
@@ -101,11 +117,73 @@ def define_stop_condition_yielding(problem_definition: ProblemDefinition) -> Sto
     else:
         raise Exception(f"Yield condition {yield_condition} not yet implemented for creating the stopping condition for jobs!")
 
-    stop_condition = StopCondition.Yielding(problem_definition.yielding_condition.yield_condition, yield_value)
+    stop_condition = StopCondition.Yielding(problem_definition.yielding_condition.yield_condition, yield_value, tracked_yield_conditions(problem_definition))
 
     return stop_condition
 
 
+def create_elastic_strain_step(direction: str, strain_step: float) -> tuple[list[list[float | str]], list[list[bool]]]:
+    # Creates the deformation gradient tensor and loaded directions for a (combined) elastic strain step.
+    deformation_gradient_tensor: list[list[float | str]] = [
+        [1, 0, 0],
+        [0, 1, 0],
+        [0, 0, 1]]
+
+    loaded_directions: list[list[bool]] = [
+        [False, False, False],
+        [False, False, False],
+        [False, False, False]]
+
+    match direction:
+        # If the load step is uniaxial, take the full strain step.
+        case 'strain_xx':
+            deformation_gradient_tensor[0][0] += strain_step # type: ignore
+            loaded_directions[0][0] = True
+        case 'strain_yy':
+            deformation_gradient_tensor[1][1] += strain_step # type: ignore
+            loaded_directions[1][1] = True
+        case 'strain_zz':
+            deformation_gradient_tensor[2][2] += strain_step # type: ignore
+            loaded_directions[2][2] = True
+        case 'strain_xy':
+            deformation_gradient_tensor[0][1] += strain_step # type: ignore
+            deformation_gradient_tensor[1][0] += strain_step # type: ignore
+            loaded_directions[0][1] = True
+        case 'strain_xz':
+            deformation_gradient_tensor[0][2] += strain_step # type: ignore
+            deformation_gradient_tensor[2][0] += strain_step # type: ignore
+            loaded_directions[2][1] = True
+        case 'strain_yz':
+            deformation_gradient_tensor[1][2] += strain_step # type: ignore
+            deformation_gradient_tensor[2][1] += strain_step # type: ignore
+            loaded_directions[1][2] = True
+        case _:
+            # If the load step is bi-directional, make sure the total magnitude equals the intended strain step
+            if "_xx" in direction:
+                deformation_gradient_tensor[0][0] += 1/2*sqrt(2)*strain_step # type: ignore
+                loaded_directions[0][0] = True
+            if "_yy" in direction:
+                deformation_gradient_tensor[1][1] += 1/2*sqrt(2)*strain_step # type: ignore
+                loaded_directions[1][1] = True    
+            if "_zz" in direction:
+                deformation_gradient_tensor[2][2] += 1/2*sqrt(2)*strain_step # type: ignore
+                loaded_directions[2][2] = True    
+            if "_xy" in direction:
+                deformation_gradient_tensor[0][1] += 1/2*sqrt(2)*strain_step # type: ignore
+                deformation_gradient_tensor[1][0] += 1/2*sqrt(2)*strain_step # type: ignore
+                loaded_directions[0][1] = True    
+            if "_xz" in direction:
+                deformation_gradient_tensor[0][2] += 1/2*sqrt(2)*strain_step # type: ignore
+                deformation_gradient_tensor[2][0] += 1/2*sqrt(2)*strain_step # type: ignore
+                loaded_directions[0][2] = True    
+            if "_yz" in direction:
+                deformation_gradient_tensor[1][2] += 1/2*sqrt(2)*strain_step # type: ignore
+                deformation_gradient_tensor[2][1] += 1/2*sqrt(2)*strain_step # type: ignore
+                loaded_directions[1][2] = True 
+
+    return deformation_gradient_tensor, loaded_directions
+
+
 class       DamaskJob:
     # Each type of DamaskJob should have the following fields:
     # The following is for python editors to understand the structure of the class
@@ -127,6 +205,7 @@ class       DamaskJob:
         stop_condition      : StopCondition.NoConditions 
         simulation_type     : str
         field_name          : str
+        directions          : list[str]
         load_steps          : int
         reduce_parasitic_stresses: bool
         use_restart_file: bool
@@ -135,79 +214,52 @@ class       DamaskJob:
         job_number: int
         total_jobs: int
 
-        def __init__(self, problem_definition: ProblemDefinition, direction: str):
+        def __init__(self, problem_definition: ProblemDefinition, direction: str | list[str]):
             # This function creates the elastic_tensor DamaskJob type from a direction.
             # This can be a uniaxial direction or combined direction.
+            # When a list of directions is given, all directions are applied in a single DAMASK_grid run.
+            # Each strain step is then followed by a load step returning to the undeformed state (F = I).
 
             self.runtime = RunTime()
             self.runtime_main = RunTime()
 
             N_increments = 1
-            
-            target_stress: list[list[list[float | str]]] = [[
-                ['x', 'x', 'x'],
-                ['x', 'x', 'x'],
-                ['x', 'x', 'x']]]
-            
-            deformation_gradient_tensor: list[list[list[float| str]]] = [[
-                [1, 0, 0],
-                [0, 1, 0],
-                [0, 0, 1]]]
-            
-            loaded_directions: list[list[list[bool]]] = [[
-                [False, False, False],
-                [False, False, False],
-                [False, False, False]
-            ]]
+
+            if isinstance(direction, str):
+                directions = [direction]
+            else:
+                directions = list(direction)
 
             strain_step = problem_definition.elastic_tensor.strain_step
 
-            match direction:
-                # If the load step is uniaxial, take the full strain step.
-                case 'strain_xx':
-                    deformation_gradient_tensor[0][0][0] += strain_step # type: ignore
-                    loaded_directions[0][0][0] = True
-                case 'strain_yy':
-                    deformation_gradient_tensor[0][1][1] += strain_step # type: ignore
-                    loaded_directions[0][1][1] = True
-                case 'strain_zz':
-                    deformation_gradient_tensor[0][2][2] += strain_step # type: ignore
-                    loaded_directions[0][2][2] = True
-                case 'strain_xy':
-                    deformation_gradient_tensor[0][0][1] += strain_step # type: ignore
-                    deformation_gradient_tensor[0][1][0] += strain_step # type: ignore
-                    loaded_directions[0][0][1] = True
-                case 'strain_xz':
-                    deformation_gradient_tensor[0][0][2] += strain_step # type: ignore
-                    deformation_gradient_tensor[0][2][0] += strain_step # type: ignore
-                    loaded_directions[0][2][1] = True
-                case 'strain_yz':
-                    deformation_gradient_tensor[0][1][2] += strain_step # type: ignore
-                    deformation_gradient_tensor[0][2][1] += strain_step # type: ignore
-                    loaded_directions[0][1][2] = True
-                case _:
-                    # If the load step is bi-directional, make sure the total magnitude equals the intended strain step
-                    if "_xx" in direction:
-                        deformation_gradient_tensor[0][0][0] += 1/2*sqrt(2)*strain_step # type: ignore
-                        loaded_directions[0][0][0] = True
-                    if "_yy" in direction:
-                        deformation_gradient_tensor[0][1][1] += 1/2*sqrt(2)*strain_step # type: ignore
-                        loaded_directions[0][1][1] = True    
-                    if "_zz" in direction:
-                        deformation_gradient_tensor[0][2][2] += 1/2*sqrt(2)*strain_step # type: ignore
-                        loaded_directions[0][2][2] = True    
-                    if "_xy" in direction:
-                        deformation_gradient_tensor[0][0][1] += 1/2*sqrt(2)*strain_step # type: ignore
-                        deformation_gradient_tensor[0][1][0] += 1/2*sqrt(2)*strain_step # type: ignore
-                        loaded_directions[0][0][1] = True    
-                    if "_xz" in direction:
-                        deformation_gradient_tensor[0][0][2] += 1/2*sqrt(2)*strain_step # type: ignore
-                        deformation_gradient_tensor[0][2][0] += 1/2*sqrt(2)*strain_step # type: ignore
-                        loaded_directions[0][0][2] = True    
-                    if "_yz" in direction:
-                        deformation_gradient_tensor[0][1][2] += 1/2*sqrt(2)*strain_step # type: ignore
-                        deformation_gradient_tensor[0][2][1] += 1/2*sqrt(2)*strain_step # type: ignore
-                        loaded_directions[0][1][2] = True 
+            target_stress: list[list[list[float | str]]] = []
+            deformation_gradient_tensor: list[list[list[float| str]]] = []
+            loaded_directions: list[list[list[bool]]] = []
+
+            for direction_number, strain_direction in enumerate(directions):
+                (F_direction, loaded_direction) = create_elastic_strain_step(strain_direction, strain_step)
+
+                # Return to the undeformed state before the next direction is loaded.
+                if direction_number > 0:
+                    target_stress.append([
+                        ['x', 'x', 'x'],
+                        ['x', 'x', 'x'],
+                        ['x', 'x', 'x']])
+                    deformation_gradient_tensor.append([
+                        [1, 0, 0],
+                        [0, 1, 0],
+                        [0, 0, 1]])
+                    loaded_directions.append([
+                        [False, False, False],
+                        [False, False, False],
+                        [False, False, False]])
+
+                target_stress.append([
+                    ['x', 'x', 'x'],
+                    ['x', 'x', 'x'],
+                    ['x', 'x', 'x']])
+                deformation_gradient_tensor.append(F_direction)
+                loaded_directions.append(loaded_direction)
 
             # Setup all the variables that are needed during the simulation.
             self.target_stress = target_stress
@@ -217,13 +269,23 @@ class       DamaskJob:
             self.stop_condition = StopCondition.NoConditions()
 
             self.simulation_type = 'elastic_tensor'
-            self.field_name = direction
+            if len(directions) == 1:
+                self.field_name = directions[0]
+            else:
+                self.field_name = "all_directions"
+            self.directions = directions
+            self.load_steps = len(deformation_gradient_tensor)
             self.reduce_parasitic_stresses = False
             self.use_restart_number = 0
             self.stress_tensor = copy.deepcopy(target_stress)
             self.deformation_gradient_tensor  : list[list[list[float | str]]] = copy.deepcopy(deformation_gradient_tensor)
             self.use_restart_file = False
 
+        def loaded_load_step_numbers(self) -> list[int]:
+            # Index of the load step (0-based) at which each direction is fully loaded.
+            # Strain steps and returns to identity alternate: 0, 2, 4, ...
+            return [2*direction_number for direction_number in range(len(self.directions))]
+
 
     # This class is not used any more, kept here for now just in case.
     # class YieldPoint:
@@ -603,6 +665,7 @@ class       DamaskJob:
         job_number: int
         total_jobs: int
         angle_in_plane: float
+        equivalent_results: list[tuple[str, list[list[float]]]]
 
         def __init__(self, problem_definition: ProblemDefinition, target_stress_input: list[list[float | str]], field_name: str):
             # From the settings recieved, complete the DamaskJob
@@ -659,13 +722,13 @@ class       DamaskJob:
             match problem_definition.yielding_condition.yield_condition:
                 case 'modulus_degradation':
                     yield_value = problem_definition.yielding_condition.modulus_degradation_percentage
-                    stop_condition = StopCondition.Yielding('modulus_degradation', yield_value)
+                    stop_condition = StopCondition.Yielding('modulus_degradation', yield_value, tracked_yield_conditions(problem_definition))
                 case 'stress_strain_curve':
                     yield_value = problem_definition.yielding_condition.plastic_strain_yield #???
-                    stop_condition = StopCondition.Yielding('stress_strain_curve', yield_value)
+                    stop_condition = StopCondition.Yielding('stress_strain_curve', yield_value, tracked_yield_conditions(problem_definition))
                 case 'plastic_work':
                     yield_value = problem_definition.yielding_condition.plastic_work_threshold
-                    stop_condition = StopCondition.Yielding('plastic_work', yield_value)
+                    stop_condition = StopCondition.Yielding('plastic_work', yield_value, tracked_yield_conditions(problem_definition))
                     # raise Exception("The stress-strain curve plastic deformation condition is not useable in yield_surface simulation types")
                 case _: # type: ignore
                     raise Exception(f"The yield condition {problem_definition.yielding_condition.yield_condition} is not yet implememted for yield_surface simulation job creations")
@@ -680,6 +743,8 @@ class       DamaskJob:
             self.general_yield_value_plastic_strain = problem_definition.yielding_condition.plastic_strain_yield
             self.reduce_parasitic_stresses = problem_definition.general.reduce_parasitic_stresses
             self.use_restart_number = 0
+            # Results of equivalent jobs (field_name, symmetry operation) derived from this job, see yield_surface_job_planner.py
+            self.equivalent_results = []
             if not self.reduce_parasitic_stresses: 
                 # For non-iterative approach the input stress (PK1) is the same as the target stress (PK1)
                 self.stress_tensor = copy.deepcopy(self.target_stress)
@@ -56,6 +56,13 @@ End of error message.
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         """)
 
+    @typing.no_type_check
+    def repeated_cutbacks(subsequent_cutbacks, max_subsequent_cutbacks):
+        print("")
+        print(f"DAMASK_grid cut back {subsequent_cutbacks} times since the last increment that converged with the full step (stop_after_subsequent_cutbacks = {max_subsequent_cutbacks}).")
+        print("The simulation is unlikely to reach the stop condition, stopping DAMASK_grid.")
+        print("Consider more increments (N_increments) or different numerics settings (N_iter_max, eps_*).")
+
 class Errors:
 
     @typing.no_type_check
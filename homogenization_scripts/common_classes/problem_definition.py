@@ -73,12 +73,20 @@ class General:
     path                                    : Path
     stress_tensor_type                      : StressTensors
     strain_tensor_type                      : StrainTensors
+    grid_cells                              : list[int]
+    grid_and_material_key                   : str
+    result_cache                            : bool
+    result_cache_folder                     : str
+    result_cache_quota                      : float
 
 class YieldingCondition:
     yield_condition                         : Literal["stress_strain_curve", "modulus_degradation", "plastic_work"]
     plastic_strain_yield                    : float
     modulus_degradation_percentage          : float
     plastic_work_threshold                  : float
+    plastic_work_xi_averaging               : Literal["endpoint", "trapezoidal"]
+    yield_interpolation                     : Literal["linear", "cubic_hermite"]
+    track_all_yield_conditions              : bool
     estimated_tensile_yield                 : float
     estimated_shear_yield                   : float
 
@@ -86,6 +94,7 @@ class Solver:
     N_increments                            : int
     cpu_cores                               : int
     stop_after_subsequent_parsing_errors    : int
+    stop_after_subsequent_cutbacks          : int
     solver_type                             : str
     N_staggered_iter_max                    : int
     N_cutback_max                           : int
@@ -99,6 +108,23 @@ class Solver:
     eps_rel_curl_F                          : float          
     simulation_time                         : float
     monitor_update_cycle                    : float
+    live_plots                              : bool
+    live_plot_interval                      : float
+    monitor_profiling                       : bool
+    job_ordering                            : Literal["creation", "longest_first"]
+    parallel_jobs                           : int
+    launcher                                : Literal["local", "mpi", "batch"]
+    mpi_runner                              : str
+    mpi_runner_arguments                    : str
+    mpi_ranks                               : int
+    mpi_threads_per_rank                    : int
+    mpi_auto_tune                           : bool
+    numerics_tuning                         : Literal["off", "suggest", "apply"]
+    numerics_yield_tolerance                : float
+    configured_numerics                     : dict[str, int | float]
+    batch_submit_command                    : str
+    batch_status_command                    : str
+    batch_cancel_command                    : str
 
 class YieldPoint:
     load_direction                          : Literal[ "x-x", "x-y", "x-z", "y-y", "y-z", "z-z"] | list[Literal[ "x-x", "x-y", "x-z", "y-y", "y-z", "z-z"]]
@@ -108,6 +134,13 @@ class YieldSurface:
     yield_stress_ref                        : float
     load_points_per_quadrant                : int
     assume_tensile_compressive_symmetry     : bool
+    material_symmetry                       : Literal["none", "orthotropic", "cubic"]
+    adaptive_sampling                       : bool
+    adaptive_batch_size                     : int
+    adaptive_tolerance                      : float
+    adaptive_max_jobs                       : int
+    adaptive_fit_criterion                  : Literal["Hill", "Cazacu-Plunkett-Barlat"]
+    adaptive_previous_predictions           : dict[str, float]
     stress_state_creation                   : Literal["manual", "automatic"]
     stress_x_x                              : list[float]
     stress_x_y                              : list[float]
@@ -119,8 +152,9 @@ class YieldSurface:
 class ElasticTensor:
     material_type                           : Literal["anisotropic",  "monoclinic", "orthotropic", "tetragonal", "cubic", "isotropic"]
     strain_step                             : float
-    number_of_load_cases                    : Literal["minimum", "all_directions", "combined_directions"]
+    number_of_load_cases                    : Literal["minimum", "all_directions", "combined_directions", "superposition"]
     component_fitting                       : Literal["algebraic", "optimization"]
+    single_damask_run                       : bool
 
 class LoadPath:
     stress_x_x                              : list[float]
@@ -0,0 +1,133 @@
+# System packages
+import os
+import yaml
+import hashlib
+import datetime
+import threading
+import damask # type: ignore
+
+# Local packages
+from ..common_classes.problem_definition import ProblemDefinition
+from ..common_classes.damask_job import DamaskJobTypes
+from .input_fingerprint import input_files_hash
+
+# The campaign journal keeps track of the state of every job of a project (results/campaign_journal.yaml):
+#   queued -> running -> finished -> post_processed   (or failed)
+# When the python process is stopped unexpectedly (crash, reboot, killed job on a cluster), the journal is used to:
+# - Resume jobs that were running from the last restart point of DAMASK_grid instead of starting them from scratch.
+# - Post-process jobs of which DAMASK_grid had finished, without running them again.
+# The journal is written to a temporary file first and then moved, so it is never left half written.
+# Only changes of the state of a job are written, not every increment: the increment to resume from is read from the
+# result file of the job (see interrupted_job_state).
+# The parallel monitor updates the journal from several threads, journal_lock keeps the updates from overwriting each other.
+
+journal_lock = threading.RLock()
+
+def campaign_journal_file(problem_definition: ProblemDefinition) -> str:
+    return os.path.join(problem_definition.general.path.results_folder, 'campaign_journal.yaml')
+
+def read_campaign_journal(problem_definition: ProblemDefinition) -> dict[str, dict[str, str | int | None]]:
+    journal_file = campaign_journal_file(problem_definition)
+    if not os.path.exists(journal_file):
+        return dict()
+    try:
+        with open(journal_file, 'r') as journal_reader:
+            campaign_journal: dict[str, dict[str, str | int | None]] = yaml.safe_load(journal_reader) or dict()
+    except yaml.YAMLError:
+        print(f"Could not read the campaign journal {journal_file}, all jobs are started from scratch.")
+        return dict()
+    return campaign_journal
+
+def write_campaign_journal(problem_definition: ProblemDefinition, campaign_journal: dict[str, dict[str, str | int | None]]) -> None:
+    journal_file = campaign_journal_file(problem_definition)
+    temporary_journal_file = journal_file + '.tmp'
+    # The results folder does not exist yet for a new load_path campaign, or after it was moved to the backup folder.
+    os.makedirs(os.path.dirname(journal_file), exist_ok=True)
+    with open(temporary_journal_file, 'w') as journal_writer:
+        yaml.dump(campaign_journal, journal_writer)
+        journal_writer.flush()
+        os.fsync(journal_writer.fileno())
+    os.replace(temporary_journal_file, journal_file)
+
+def journal_key(damask_job: DamaskJobTypes) -> str:
+    return f"{damask_job.simulation_type}/{damask_job.field_name}"
+
+def job_fingerprint(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes) -> str:
+    # A job can only be resumed when its load case and inputs did not change since it was started.
+    job_definition = {
+        'target_stress': getattr(damask_job, 'target_stress', None),
+        'stress_tensor': damask_job.stress_tensor,
+        'deformation_gradient_tensor': damask_job.deformation_gradient_tensor,
+        'N_increments': problem_definition.solver.N_increments,
+        'simulation_time': problem_definition.solver.simulation_time,
+        'input_files': input_files_hash(problem_definition),
+    }
+    return hashlib.sha1(yaml.dump(job_definition).encode()).hexdigest()
+
+def update_job_state(
+        problem_definition: ProblemDefinition,
+        damask_job: DamaskJobTypes,
+        state: str) -> None:
+    with journal_lock:
+        campaign_journal = read_campaign_journal(problem_definition)
+        job_entry = campaign_journal.get(journal_key(damask_job), dict())
+
+        job_entry['state'] = state
+        job_entry['fingerprint'] = job_fingerprint(problem_definition, damask_job)
+        job_entry['updated'] = datetime.datetime.now().isoformat(timespec='seconds')
+        if hasattr(damask_job.runtime, 'damask_files'):
+            job_entry['damask_files'] = damask_job.runtime.damask_files
+
+        campaign_journal[journal_key(damask_job)] = job_entry
+        write_campaign_journal(problem_definition, campaign_journal)
+
+def journal_queued_jobs(problem_definition: ProblemDefinition, damask_jobs: list[DamaskJobTypes]) -> None:
+    # Jobs that were interrupted keep their state, so they can be resumed.
+    campaign_journal = read_campaign_journal(problem_definition)
+    for damask_job in damask_jobs:
+        job_entry = campaign_journal.get(journal_key(damask_job), dict())
+        if job_entry.get('state') in ['running', 'finished'] and job_entry.get('fingerprint') == job_fingerprint(problem_definition, damask_job):
+            continue
+        campaign_journal[journal_key(damask_job)] = {
+            'state': 'queued',
+            'fingerprint': job_fingerprint(problem_definition, damask_job),
+            'updated': datetime.datetime.now().isoformat(timespec='seconds'),
+        }
+    write_campaign_journal(problem_definition, campaign_journal)
+
+def interrupted_job_state(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes) -> tuple[str, int]:
+    # Returns how an earlier run of this job can be continued:
+    #   ('finished', last increment): DAMASK_grid completed, only post-processing is needed.
+    #   ('resume', restart increment): DAMASK_grid was interrupted, restart from the increment.
+    #   ('new', 0): run the job from scratch.
+    if problem_definition.general.path.postprocessing_only:
+        return 'new', 0
+
+    job_entry = read_campaign_journal(problem_definition).get(journal_key(damask_job), dict())
+    state = job_entry.get('state')
+    if not state in ['running', 'finished']:
+        return 'new', 0
+    if not job_entry.get('fingerprint') == job_fingerprint(problem_definition, damask_job):
+        return 'new', 0
+
+    damask_files = job_entry.get('damask_files')
+    if not isinstance(damask_files, str):
+        return 'new', 0
+    damask_result_file = os.path.join(damask_files, f"{problem_definition.general.project_name}.hdf5")
+    damask_restart_file = os.path.join(damask_files, f"{problem_definition.general.project_name}_restart.hdf5")
+    if not os.path.isfile(damask_result_file):
+        return 'new', 0
+
+    # The increments are written to the result file together with the restart data (f_out = f_restart = 1).
+    # A result file that can not be read was likely interrupted while writing.
+    try:
+        last_increment = int(damask.Result(damask_result_file).increments_in_range()[-1])
+    except Exception:
+        return 'new', 0
+
+    if state == 'finished':
+        return 'finished', last_increment
+
+    if last_increment < 1 or not os.path.isfile(damask_restart_file):
+        return 'new', 0
+    return 'resume', last_increment
@@ -368,32 +368,42 @@ def get_averaged_plastic_strain_per_increment(damask_results: damask.Result, ten
 
     return (damask_results, plastic_strain_per_increment)
 
-def get_Wp_per_increment(damask_results: damask.Result, display_prefix:str = "") -> tuple[damask.Result, NDArray[np.float64]]:
-    #(damask_results, plastic_strain) = get_plastic_strain(damask_results, tensor_type, display_prefix=display_prefix)
+# Increments per chunk in the plastic work calculation, bounds the memory of the temporary arrays for long load paths.
+Wp_chunk_size = 64
+
+def calculate_Wp_per_increment(
+        gamma: NDArray[np.float64], 
+        xi: NDArray[np.float64], 
+        xi_averaging: str = "endpoint",
+        chunk_size: int = Wp_chunk_size) -> NDArray[np.float64]:
+    # Cumulative plastic work per increment, averaged over the material points:
+    #   Wp[e] = sum over increments k <= e of sum(delta_gamma_k * xi_k) / N_matpoints
+    # xi_k is the slip resistance at the end of increment k (endpoint) or the mean of its start and end (trapezoidal).
+    # The input is of size (n_increments, n_matpoints, n_slip_systems), the output of size (n_increments), with Wp[0] = 0.
+    N_incs = np.shape(gamma)[0]
+    Wp_increment = np.zeros(N_incs)
+    if N_incs < 2:
+        return Wp_increment
+    N_matpoints = np.shape(gamma)[1]
+
+    for start in range(1, N_incs, chunk_size):
+        end = min(start + chunk_size, N_incs)
+        gamma_delta = gamma[start:end] - gamma[start-1:end-1]
+        match xi_averaging:
+            case "trapezoidal":
+                xi_increment = 0.5 * (xi[start:end] + xi[start-1:end-1])
+            case _:
+                xi_increment = xi[start:end]
+        Wp_increment[start:end] = np.sum((gamma_delta * xi_increment).reshape(end - start, -1), axis=1)
+
+    return np.cumsum(Wp_increment) / N_matpoints
+
+def get_Wp_per_increment(damask_results: damask.Result, display_prefix:str = "", xi_averaging: str = "endpoint") -> tuple[damask.Result, NDArray[np.float64]]:
+    # Plastic work per increment visible in the damask_result, relative to the first visible increment.
     (damask_results, xi)    = get_slip_system_xi(damask_results, display_prefix=display_prefix)
     (damask_results, gamma) = get_slip_system_gamma(damask_results, display_prefix=display_prefix)
 
-    # Wp_per_increment = np.empty(0)
-    # # This function calculates the homogonized strain per increment visible in the damask_result.
-
-    # # Shape of output is (n_increments_visible, 3, 3) always
-    # N_matpoints = np.shape(gamma[0])[0]
-    # N_incs      = np.shape(xi)[0]
-    # for increment in range(N_incs):
-    #     Wp = np.sum(xi[increment]*gamma[increment]) / N_matpoints
-
-    #     Wp_per_increment = np.append(Wp_per_increment, np.array([Wp]), axis=0)
-    N_incs      = np.shape(gamma)[0]
-    Wp_per_increment = np.zeros(N_incs)
-    N_matpoints = np.shape(gamma[0])[0]
-    gamma_delta = np.zeros_like(gamma)
-    
-    for e,inc in enumerate(damask_results.increments):
-        if e>0:
-            gamma_delta[e,:,:] = (gamma[e,:,:]-gamma[e-1,:,:]) 
-            
-            Wp_upto = np.sum(gamma_delta * xi) / N_matpoints
-            Wp_per_increment[e] = Wp_upto
+    Wp_per_increment = calculate_Wp_per_increment(gamma, xi, xi_averaging)
     
     return (damask_results, Wp_per_increment)
 
@@ -0,0 +1,69 @@
+# System packages
+import os
+import hashlib
+
+# Local packages
+from ..common_classes.problem_definition import ProblemDefinition
+
+# The fingerprint of an input file (grid, dimensions and material file) is the sha1 hash of its content, with its size and
+# modification time. It is stored in the general_settings of the results database, so changes to the content of a file
+# are detected (also when it is edited in place), while moving or renaming a file does not invalidate the results.
+# Hashing a multi-GB grid takes a while, so:
+# - The file is hashed in blocks, it is never loaded completely.
+# - When the path, size and modification time equal those of the stored fingerprint, the content is assumed unchanged.
+# - A file is hashed at most once per run (as long as its size and modification time do not change).
+
+hash_block_size = 1 << 20
+fingerprinted_files: dict[tuple[str, int, int], str] = dict()
+
+def file_hash(file_path: str) -> str:
+    file_state = os.stat(file_path)
+    memo_key = (os.path.abspath(file_path), file_state.st_size, file_state.st_mtime_ns)
+    if memo_key in fingerprinted_files:
+        return fingerprinted_files[memo_key]
+    content_hash = hashlib.sha1()
+    with open(file_path, 'rb') as file_reader:
+        for block in iter(lambda: file_reader.read(hash_block_size), b''):
+            content_hash.update(block)
+    fingerprinted_files[memo_key] = content_hash.hexdigest()
+    return fingerprinted_files[memo_key]
+
+def file_fingerprint(file_path: str) -> dict[str, str | int]:
+    file_state = os.stat(file_path)
+    return {
+        'path': os.path.abspath(file_path),
+        'size': int(file_state.st_size),
+        'mtime_ns': int(file_state.st_mtime_ns),
+        'sha1': file_hash(file_path),
+    }
+
+def fingerprint_matches(file_path: str, stored_fingerprint: dict[str, str | int]) -> bool:
+    # The size and modification time shortcut only applies to the same path, a moved file is hashed.
+    if not os.path.isfile(file_path):
+        return False
+    file_state = os.stat(file_path)
+    if not file_state.st_size == stored_fingerprint.get('size'):
+        return False
+    if os.path.abspath(file_path) == stored_fingerprint.get('path') and file_state.st_mtime_ns == stored_fingerprint.get('mtime_ns'):
+        return True
+    return file_hash(file_path) == stored_fingerprint.get('sha1')
+
+def input_files(problem_definition: ProblemDefinition) -> dict[str, str]:
+    # The input files that define the microstructure, by their name in the general_settings of the results database.
+    files = {
+        'grid_file': problem_definition.general.path.grid_file,
+        'material_properties': problem_definition.general.path.material_properties,
+    }
+    if getattr(problem_definition.general.path, "dimensions_file", ''):
+        files['dimensions_file'] = problem_definition.general.path.dimensions_file
+    return files
+
+def input_fingerprints(problem_definition: ProblemDefinition) -> dict[str, dict[str, str | int]]:
+    return {name: file_fingerprint(file_path) for (name, file_path) in input_files(problem_definition).items()}
+
+def input_files_hash(problem_definition: ProblemDefinition) -> str:
+    # A single hash of the content of all input files, i.e. for the result cache.
+    combined_hash = hashlib.sha1()
+    for (name, file_path) in input_files(problem_definition).items():
+        combined_hash.update(f"{name}:{file_hash(file_path)};".encode())
+    return combined_hash.hexdigest()
@@ -0,0 +1,159 @@
+# System packages
+import os
+import yaml
+import heapq
+import datetime
+import numpy as np
+import damask # type: ignore
+
+# Local packages
+from ..common_classes.problem_definition import ProblemDefinition
+from ..common_classes.damask_job import DamaskJob, DamaskJobTypes
+
+# Estimates the run time of DAMASK jobs with:
+#   run_time = startup_time + time_per_cell_increment * grid_cells * expected_increments
+# The coefficients are fitted to the timings of earlier jobs (results/job_timings.yaml) when available.
+# Without timings, the default coefficients below give a rough estimate only.
+
+default_startup_time = 10.                  # [s]
+default_time_per_cell_increment = 1E-4      # [s] for a single cpu core
+
+def job_timings_file(problem_definition: ProblemDefinition) -> str:
+    return os.path.join(problem_definition.general.path.results_folder, 'job_timings.yaml')
+
+def read_job_timings(problem_definition: ProblemDefinition) -> list[dict[str, str | float | int]]:
+    timings_file = job_timings_file(problem_definition)
+    if not os.path.exists(timings_file):
+        return []
+    with open(timings_file, 'r') as timings_reader:
+        job_timings: list[dict[str, str | float | int]] = yaml.safe_load(timings_reader) or []
+    return job_timings
+
+def record_job_timing(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes) -> None:
+    # Appends the measured wall time of a finished job to the job timings of the project.
+    wall_time = getattr(damask_job, "wall_time", None)
+    if wall_time is None:
+        return
+
+    job_timings = read_job_timings(problem_definition)
+    job_timings.append({
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'simulation_type': damask_job.simulation_type,
+        'field_name': damask_job.field_name,
+        'grid_cells': get_number_of_grid_cells(problem_definition),
+        'increments': int(damask_job.increment_data.increment_last_update),
+        'cpu_cores': problem_definition.solver.cpu_cores,
+        'wall_time': float(wall_time),
+    })
+
+    with open(job_timings_file(problem_definition), 'w') as timings_writer:
+        yaml.dump(job_timings, timings_writer)
+
+def get_grid_cells(problem_definition: ProblemDefinition) -> list[int]:
+    # The grid is the same for all jobs, read it only once.
+    grid_cells = getattr(problem_definition.general, "grid_cells", None)
+    if grid_cells is not None:
+        return grid_cells
+
+    grid_file = problem_definition.general.path.grid_file
+    _, grid_file_extension = os.path.splitext(grid_file)
+    if grid_file_extension == '.txt':
+        # 2D grid from MTEX, DAMASK uses a single cell in z-direction (see grid_and_dimensions_file).
+        with open(grid_file, 'r') as grid_reader:
+            rows = [line for line in grid_reader if line.strip()]
+        grid_cells = [len(rows), len(rows[0].split(',')), 1]
+    else:
+        grid_cells = [int(cells) for cells in damask.GeomGrid.load(grid_file).cells] # type: ignore
+
+    problem_definition.general.grid_cells = grid_cells
+    return grid_cells
+
+def get_number_of_grid_cells(problem_definition: ProblemDefinition) -> int:
+    return int(np.prod(get_grid_cells(problem_definition)))
+
+def expected_increments(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes) -> float:
+    # Number of increments a job is expected to run before it is finished (or yields).
+    N_increments = problem_definition.solver.N_increments
+    match damask_job:
+        case DamaskJob.ElasticTensor():
+            return damask_job.load_steps * N_increments
+        case DamaskJob.LoadPath():
+            return damask_job.load_steps
+        case DamaskJob.YieldPointMultiaxial():
+            # The stress is increased linearly up to the target stress (amplified for combined loadings, see
+            # amplification_factor). Yielding is expected when the von Mises stress reaches the estimated yield stress.
+            stress = np.zeros((3, 3))
+            for i in range(3):
+                for j in range(i, 3):
+                    value = damask_job.target_stress[-1][i][j]
+                    if isinstance(value, (int, float)):
+                        stress[i][j] = value
+                        stress[j][i] = value
+            deviatoric_stress = stress - np.trace(stress)/3 * np.eye(3)
+            von_mises_stress = float(np.sqrt(3/2 * np.sum(deviatoric_stress**2)))
+
+            if 'shear' in damask_job.field_name:
+                estimated_yield = np.sqrt(3) * problem_definition.yielding_condition.estimated_shear_yield
+            else:
+                estimated_yield = problem_definition.yielding_condition.estimated_tensile_yield
+
+            fraction_to_yield = min(1., estimated_yield / von_mises_stress) if von_mises_stress > 0 else 1.
+            return N_increments * fraction_to_yield
+        case _: # type: ignore
+            return N_increments
+
+def fit_cost_coefficients(problem_definition: ProblemDefinition) -> tuple[float, float, bool]:
+    # Returns (startup_time, time_per_cell_increment, calibrated) for the cpu_cores of this project.
+    cpu_cores = problem_definition.solver.cpu_cores
+    job_timings = [timing for timing in read_job_timings(problem_definition) if timing.get('cpu_cores') == cpu_cores]
+    if len(job_timings) == 0:
+        return default_startup_time, default_time_per_cell_increment / max(cpu_cores, 1), False
+
+    work = np.array([float(timing['grid_cells']) * float(timing['increments']) for timing in job_timings])
+    wall_time = np.array([float(timing['wall_time']) for timing in job_timings])
+
+    if len(np.unique(work)) >= 2:
+        (time_per_cell_increment, startup_time) = np.polyfit(work, wall_time, 1)
+        if time_per_cell_increment > 0 and startup_time >= 0:
+            return float(startup_time), float(time_per_cell_increment), True
+
+    # Not enough spread in the timings for a linear fit, use the median time per unit of work.
+    time_per_cell_increment = float(np.median(wall_time / np.maximum(work, 1.)))
+    return 0., time_per_cell_increment, True
+
+def estimate_job_costs(problem_definition: ProblemDefinition, damask_jobs: list[DamaskJobTypes]) -> tuple[list[float], bool]:
+    # Estimated run time [s] per job and if the estimate is calibrated with earlier timings.
+    if len(damask_jobs) == 0:
+        return [], False
+
+    grid_cells = get_number_of_grid_cells(problem_definition)
+    (startup_time, time_per_cell_increment, calibrated) = fit_cost_coefficients(problem_definition)
+
+    job_costs: list[float] = []
+    for damask_job in damask_jobs:
+        job_cost = startup_time + time_per_cell_increment * grid_cells * expected_increments(problem_definition, damask_job)
+        damask_job.estimated_run_time = job_cost
+        job_costs.append(job_cost)
+
+    return job_costs, calibrated
+
+def order_jobs_longest_first(problem_definition: ProblemDefinition, damask_jobs: list[DamaskJobTypes]) -> list[DamaskJobTypes]:
+    # Longest processing time first: gives the shortest total wall time when jobs run in parallel.
+    (job_costs, _) = estimate_job_costs(problem_definition, damask_jobs)
+    order = sorted(range(len(damask_jobs)), key=lambda job_index: -job_costs[job_index])
+    damask_jobs = [damask_jobs[job_index] for job_index in order]
+
+    total_number_damask_jobs = len(damask_jobs)
+    for damask_job_index in range(total_number_damask_jobs):
+        damask_jobs[damask_job_index].job_number = damask_job_index + 1
+        damask_jobs[damask_job_index].total_jobs = total_number_damask_jobs
+
+    return damask_jobs
+
+def projected_wall_time(job_costs: list[float], parallel_jobs: int = 1) -> float:
+    # Wall time when the jobs are started in the given order on parallel_jobs slots.
+    slots = [0.] * max(parallel_jobs, 1)
+    for job_cost in job_costs:
+        slot_available_at = heapq.heappop(slots)
+        heapq.heappush(slots, slot_available_at + job_cost)
+    return max(slots)
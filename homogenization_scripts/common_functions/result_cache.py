@@ -0,0 +1,217 @@
+# System packages
+import os
+import yaml
+import hashlib
+import shutil
+import datetime
+import damask # type: ignore
+import numpy as np
+from numpy.typing import NDArray
+
+# Local packages
+from ..common_classes.problem_definition import ProblemDefinition
+from ..common_classes.damask_job import DamaskJob, DamaskJobTypes, yield_condition_values
+from ..damask_monitor.post_processor.store_result_to_database import store_result_to_database
+from ..damask_monitor.post_processor.curve_store import curve_file, store_rotated_curve
+from .input_fingerprint import input_files_hash
+
+# The result cache holds the yield point of every yield point job that was run, keyed by a hash of everything that affects it:
+# the content of the grid and material files, the numerics, the tensor types, the yield definition, the load of the job and
+# the DAMASK version. The cache is machine-wide, so all projects with the same inputs share the results:
+#   [result_cache_folder]/[key[:2]]/[key].yaml   the yield point
+#   [result_cache_folder]/[key[:2]]/[key].npz    the homogenized curve of the job (see curve_store.py)
+# The result_cache_folder is general.result_cache_folder, or else ~/.cache/homogenization_for_damask/result_cache
+# ($XDG_CACHE_HOME is followed). When a job is created whose key is in the cache, its result is taken from the cache and the
+# job is not run. The curves are hard-linked between the cache and the results folders (copied across file systems).
+# Every use of an entry updates its modification time, when the cache exceeds general.result_cache_quota [GB] the least
+# recently used entries are removed. The size of the cache is found once per run (walking the cache), and then kept up to
+# date with the entries that are stored: the cache is only walked again when this running total exceeds the quota.
+# Eviction frees up to eviction_fraction of the quota, so a full cache is not walked again for every new entry.
+# Jobs that continue from a restart file (pre-strained material) are not cached, their result also depends on that history.
+
+default_result_cache_quota = 10.   # [GB]
+eviction_fraction = 0.9
+cache_sizes: dict[str, int] = dict()   # [B] per result_cache_folder
+
+cached_numerics = ['N_increments', 'simulation_time', 'solver_type', 'N_staggered_iter_max', 'N_cutback_max', 'N_iter_min', 'N_iter_max',
+                   'eps_abs_div_P', 'eps_rel_div_P', 'eps_abs_P', 'eps_rel_P', 'eps_abs_curl_F', 'eps_rel_curl_F']
+
+def result_cache_is_used(problem_definition: ProblemDefinition) -> bool:
+    if not getattr(problem_definition.general, "result_cache", True):
+        return False
+    return not getattr(problem_definition.general.path, "restart_file_path", False)
+
+def result_cache_folder(problem_definition: ProblemDefinition) -> str:
+    cache_folder = getattr(problem_definition.general, "result_cache_folder", None)
+    if cache_folder:
+        return os.path.abspath(os.path.expanduser(cache_folder))
+    user_cache_folder = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(user_cache_folder, 'homogenization_for_damask', 'result_cache')
+
+def configured_numerics(problem_definition: ProblemDefinition) -> dict[str, int | float | str | None]:
+    # The numerics as given in the problem definition. With solver.numerics_tuning: apply, the jobs run with the tuned numerics
+    # (see numerics_tuner.py), but the cache is looked up before the tuning: the key is always based on the configured numerics.
+    # The tuning settings are part of the key, so results with tuned numerics are only shared with the same tuning.
+    tuned_from = getattr(problem_definition.solver, "configured_numerics", dict())
+    numerics = {setting: tuned_from.get(setting, getattr(problem_definition.solver, setting, None)) for setting in cached_numerics}
+    if getattr(problem_definition.solver, "numerics_tuning", "off") == "apply":
+        numerics['numerics_tuning'] = "apply"
+        numerics['numerics_yield_tolerance'] = getattr(problem_definition.solver, "numerics_yield_tolerance", 0.01)
+    return numerics
+
+def result_key(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes) -> str:
+    yielding_condition = problem_definition.yielding_condition
+    yield_condition = yielding_condition.yield_condition
+    result_inputs = {
+        'input_files': input_files_hash(problem_definition),
+        'numerics': configured_numerics(problem_definition),
+        'stress_tensor_type': problem_definition.general.stress_tensor_type.str(),
+        'strain_tensor_type': problem_definition.general.strain_tensor_type.str(),
+        'yield_condition': yield_condition,
+        'yield_condition_value': yield_condition_values(problem_definition)[yield_condition],
+        'plastic_work_xi_averaging': getattr(yielding_condition, "plastic_work_xi_averaging", "endpoint") if yield_condition == 'plastic_work' else None,
+        'yield_interpolation': getattr(yielding_condition, "yield_interpolation", "linear"),
+        'stress_tensor': damask_job.stress_tensor,
+        'deformation_gradient_tensor': damask_job.deformation_gradient_tensor,
+        'damask_version': damask.__version__,
+    }
+    return hashlib.sha1(yaml.dump(result_inputs).encode()).hexdigest()
+
+def result_cache_file(problem_definition: ProblemDefinition, key: str, extension: str = 'yaml') -> str:
+    return os.path.join(result_cache_folder(problem_definition), key[:2], f"{key}.{extension}")
+
+def link_file(source_file: str, target_file: str) -> None:
+    # Hard link (no extra disk space), a copy when the cache and the project are on different file systems.
+    os.makedirs(os.path.dirname(target_file), exist_ok=True)
+    if os.path.exists(target_file):
+        os.remove(target_file)
+    try:
+        os.link(source_file, target_file)
+    except OSError:
+        shutil.copy2(source_file, target_file)
+
+def mark_used(cache_files: list[str]) -> None:
+    for cache_file in cache_files:
+        if os.path.exists(cache_file):
+            os.utime(cache_file)
+
+def cache_entries(cache_folder: str) -> dict[str, list[str]]:
+    entries: dict[str, list[str]] = dict()
+    for (folder, _, file_names) in os.walk(cache_folder):
+        for file_name in file_names:
+            if file_name.endswith('.yaml') or file_name.endswith('.npz'):
+                key = os.path.splitext(file_name)[0]
+                entries.setdefault(key, []).append(os.path.join(folder, file_name))
+    return entries
+
+def add_to_cache_size(problem_definition: ProblemDefinition, cache_files: list[str]) -> None:
+    # Keeps the running total of the cache size, evicts when it exceeds the quota.
+    quota = getattr(problem_definition.general, "result_cache_quota", default_result_cache_quota) * 1E9
+    cache_folder = result_cache_folder(problem_definition)
+    if cache_folder in cache_sizes:
+        cache_sizes[cache_folder] += sum(os.path.getsize(cache_file) for cache_file in cache_files if os.path.isfile(cache_file))
+    else:
+        cache_sizes[cache_folder] = sum(os.path.getsize(cache_file) for cache_files in cache_entries(cache_folder).values() for cache_file in cache_files)
+    if cache_sizes[cache_folder] > quota:
+        evict_least_recently_used(problem_definition)
+
+def evict_least_recently_used(problem_definition: ProblemDefinition) -> None:
+    # Removes the entries (yield point and curve) that were used longest ago, until the cache fits in the quota.
+    quota = getattr(problem_definition.general, "result_cache_quota", default_result_cache_quota) * 1E9
+    cache_folder = result_cache_folder(problem_definition)
+    entries = cache_entries(cache_folder)
+
+    def last_used(key: str) -> float:
+        return max(os.path.getmtime(cache_file) for cache_file in entries[key])
+    cache_size = sum(os.path.getsize(cache_file) for cache_files in entries.values() for cache_file in cache_files)
+    cache_sizes[cache_folder] = cache_size
+    if cache_size <= quota:
+        return
+
+    evicted_entries = 0
+    for key in sorted(entries, key=last_used):
+        if cache_size <= eviction_fraction * quota:
+            break
+        for cache_file in entries[key]:
+            cache_size -= os.path.getsize(cache_file)
+            os.remove(cache_file)
+        evicted_entries += 1
+    cache_sizes[cache_folder] = cache_size
+    print(f"Removed {evicted_entries} least recently used result(s) from the result cache, to stay within {quota/1E9:.1f} GB.")
+
+def read_cached_result(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes) -> list[list[float | str]] | None:
+    if not result_cache_is_used(problem_definition) or not isinstance(damask_job, DamaskJob.YieldPointMultiaxial):
+        return None
+    cache_file = result_cache_file(problem_definition, result_key(problem_definition, damask_job))
+    if not os.path.isfile(cache_file):
+        return None
+    try:
+        with open(cache_file, 'r') as cache_reader:
+            cached_result = yaml.safe_load(cache_reader)
+        yield_stress = cached_result['yield_stress']
+    except Exception:
+        return None
+    mark_used([cache_file, os.path.splitext(cache_file)[0] + '.npz'])
+    return yield_stress
+
+def store_cached_result(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes, yield_stress: NDArray[np.float64] | list[list[str]]) -> None:
+    if not result_cache_is_used(problem_definition) or not isinstance(damask_job, DamaskJob.YieldPointMultiaxial):
+        return
+    cache_file = result_cache_file(problem_definition, result_key(problem_definition, damask_job))
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    cached_result = {
+        'yield_stress': np.array(yield_stress).tolist() if isinstance(yield_stress, np.ndarray) else yield_stress,
+        'project': problem_definition.general.project_name,
+        'simulation_type': damask_job.simulation_type,
+        'field_name': damask_job.field_name,
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+    }
+    # Written to a temporary file first, other projects may read the cache at the same time.
+    temporary_cache_file = f"{cache_file}.{os.getpid()}.tmp"
+    with open(temporary_cache_file, 'w') as cache_writer:
+        yaml.dump(cached_result, cache_writer)
+    os.replace(temporary_cache_file, cache_file)
+
+    # The homogenized curve of the job, stored by the post-processing before.
+    project_curve_file = curve_file(problem_definition, damask_job.simulation_type, damask_job.field_name)
+    cached_curve_file = os.path.splitext(cache_file)[0] + '.npz'
+    if os.path.isfile(project_curve_file):
+        link_file(project_curve_file, cached_curve_file)
+
+    add_to_cache_size(problem_definition, [cache_file, cached_curve_file])
+
+def reuse_cached_results(problem_definition: ProblemDefinition, damask_jobs: list[DamaskJobTypes]) -> list[DamaskJobTypes]:
+    # Stores the cached results (also of the equivalent jobs) to the results database and returns the jobs that still have to run.
+    # With track_all_yield_conditions the jobs are run, the cache does not hold the yield points of the other yield conditions.
+    if not result_cache_is_used(problem_definition) or problem_definition.general.path.postprocessing_only:
+        return damask_jobs
+    if getattr(problem_definition.yielding_condition, "track_all_yield_conditions", False):
+        return damask_jobs
+
+    jobs_to_run: list[DamaskJobTypes] = []
+    cached_jobs = 0
+    for damask_job in damask_jobs:
+        cached_yield_stress = read_cached_result(problem_definition, damask_job)
+        if cached_yield_stress is None:
+            jobs_to_run.append(damask_job)
+            continue
+        os.makedirs(problem_definition.general.path.results_folder, exist_ok=True)
+        store_result_to_database(problem_definition, damask_job.simulation_type, damask_job.field_name, cached_yield_stress)
+        # The cached curve is linked into the results folder, so the yield point can be re-derived later (see rederive_yield_points.py)
+        cached_curve_file = result_cache_file(problem_definition, result_key(problem_definition, damask_job), 'npz')
+        if os.path.isfile(cached_curve_file):
+            link_file(cached_curve_file, curve_file(problem_definition, damask_job.simulation_type, damask_job.field_name))
+        for (equivalent_field_name, symmetry_operation) in getattr(damask_job, "equivalent_results", []):
+            if isinstance(cached_yield_stress[0][0], str):
+                equivalent_yield_stress = cached_yield_stress
+            else:
+                Q = np.array(symmetry_operation)
+                equivalent_yield_stress = Q @ np.array(cached_yield_stress) @ Q.T
+            store_result_to_database(problem_definition, damask_job.simulation_type, equivalent_field_name, equivalent_yield_stress)
+            if os.path.isfile(cached_curve_file):
+                store_rotated_curve(cached_curve_file, curve_file(problem_definition, damask_job.simulation_type, equivalent_field_name), symmetry_operation)
+        cached_jobs += 1
+
+    if cached_jobs > 0:
+        print(f"Took the results of {cached_jobs} job(s) from the result cache ({result_cache_folder(problem_definition)}), {len(jobs_to_run)} job(s) left to run.")
+    return jobs_to_run
@@ -0,0 +1,147 @@
+# System packages
+import os
+import re
+
+# Local packages
+from ...common_classes.problem_definition import ProblemDefinition
+
+# The convergence telemetry follows how hard DAMASK_grid works for every increment, by parsing the lines it adds to:
+# - the log file (stdout of DAMASK_grid):
+#       Increment 5/40-3/4 @ Iteration 001≤012≤100     -> increment, step fraction (cut back if > 1) and iteration
+#       error divergence =   0.53 (...)                -> residuals relative to their tolerance (< 1 is converged)
+#       cutting back                                   -> the step of the increment is split
+#       increment 5 converged                          -> end of the increment
+# - the status file (jobname.sta): increment, time, cutback level, converged, iterations needed.
+# Both files are read incrementally, only the lines added since the last update are parsed.
+# With solver.stop_after_subsequent_cutbacks the run is stopped when DAMASK_grid keeps cutting back (counted since the
+# last increment that converged with the full step), before it reaches N_cutback_max and stops with an error.
+
+iteration_line = re.compile(r"Increment\s+(\d+)/\d+-\d+/(\d+)\s+@\s+Iteration\s+\d+\D+?(\d+)\D+?\d+")
+residual_line = re.compile(r"error\s+(divergence|curl|stress BC)\s*=\s*([-+\d.Ee]+)")
+converged_line = re.compile(r"increment\s+(\d+)\s+(NOT\s+)?converged")
+cutback_line = re.compile(r"cutting back")
+
+class FileTail:
+    # Returns the complete lines that were added to a file since the last call.
+    file_path: str
+    offset: int
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.offset = 0
+
+    def new_lines(self) -> list[str]:
+        if not os.path.isfile(self.file_path):
+            return []
+        if os.path.getsize(self.file_path) < self.offset:
+            # The file was replaced (i.e. DAMASK_grid was restarted).
+            self.offset = 0
+        with open(self.file_path, 'rb') as file_reader:
+            file_reader.seek(self.offset)
+            new_content = file_reader.read()
+        # A line that is being written is parsed at the next call.
+        complete_content = new_content[:new_content.rfind(b'\n') + 1]
+        self.offset += len(complete_content)
+        return complete_content.decode(errors='replace').splitlines()
+
+class ConvergenceTelemetry:
+    increments: list[dict[str, int | float | bool]]
+    reported_increments: int
+    subsequent_cutbacks: int
+    stop_after_subsequent_cutbacks: int | None
+
+    def __init__(self, problem_definition: ProblemDefinition, log_file: str, result_file: str):
+        (job_name, _) = os.path.splitext(result_file)
+        self.log_tail = FileTail(log_file)
+        self.status_tail = FileTail(f"{job_name}.sta")
+        # The log file is appended to by every run of the job, only the output of this run is parsed.
+        if os.path.isfile(log_file):
+            self.log_tail.offset = os.path.getsize(log_file)
+        self.N_iter_max = problem_definition.solver.N_iter_max
+        self.stop_after_subsequent_cutbacks = getattr(problem_definition.solver, "stop_after_subsequent_cutbacks", None)
+
+        self.increments = []
+        self.reported_increments = 0
+        self.subsequent_cutbacks = 0
+        self.current_iterations = 0
+        self.current_step_fraction = 1
+        self.current_cutbacks = 0
+        self.current_residuals: dict[str, float] = dict()
+
+    def parse_log_line(self, line: str) -> None:
+        if (match := iteration_line.search(line)):
+            self.current_step_fraction = int(match.group(2))
+            self.current_iterations = int(match.group(3))
+        elif (match := residual_line.search(line)):
+            try:
+                self.current_residuals[f"error_{match.group(1).replace(' ', '_')}"] = float(match.group(2))
+            except ValueError:
+                pass
+        elif cutback_line.search(line):
+            self.current_cutbacks += 1
+            self.subsequent_cutbacks += 1
+        elif (match := converged_line.search(line)):
+            increment_telemetry: dict[str, int | float | bool] = {
+                'increment': int(match.group(1)),
+                'converged': match.group(2) is None,
+                'iterations': self.current_iterations,
+                'step_fraction': self.current_step_fraction,
+                'cutbacks': self.current_cutbacks,
+            } | self.current_residuals
+            self.increments.append(increment_telemetry)
+            if self.current_step_fraction == 1 and self.current_cutbacks == 0:
+                self.subsequent_cutbacks = 0
+            self.current_cutbacks = 0
+            self.current_residuals = dict()
+
+    def parse_status_line(self, line: str) -> None:
+        # The .sta file is leading for the iterations and the cutback level of an increment.
+        columns = line.split()
+        if len(columns) < 5 or not columns[0].isdigit():
+            return
+        increment = int(columns[0])
+        for increment_telemetry in reversed(self.increments):
+            if increment_telemetry['increment'] == increment:
+                increment_telemetry['cutback_level'] = int(columns[2])
+                increment_telemetry['iterations'] = int(columns[4])
+                break
+
+    def update(self) -> None:
+        for line in self.log_tail.new_lines():
+            self.parse_log_line(line)
+        for line in self.status_tail.new_lines():
+            self.parse_status_line(line)
+
+    def cutback_limit_reached(self) -> bool:
+        if self.stop_after_subsequent_cutbacks is None:
+            return False
+        return self.subsequent_cutbacks >= self.stop_after_subsequent_cutbacks
+
+    def new_increments(self) -> list[dict[str, int | float | bool]]:
+        # The increments since the previous call, i.e. for the progress feed.
+        new_increments = self.increments[self.reported_increments:]
+        self.reported_increments = len(self.increments)
+        return new_increments
+
+    def summary(self) -> dict[str, int | float]:
+        iterations = [int(increment_telemetry['iterations']) for increment_telemetry in self.increments]
+        if len(iterations) == 0:
+            return dict()
+        return {
+            'increments': len(iterations),
+            'iterations': sum(iterations),
+            'mean_iterations': round(sum(iterations) / len(iterations), 2),
+            'max_iterations': max(iterations),
+            'increments_at_N_iter_max': sum(1 for iteration in iterations if iteration >= self.N_iter_max),
+            'cutbacks': sum(int(increment_telemetry['cutbacks']) for increment_telemetry in self.increments),
+        }
+
+    def print_summary(self) -> None:
+        summary = self.summary()
+        if len(summary) == 0:
+            return
+        print(f"Convergence: {summary['increments']} increment(s), {summary['iterations']} iteration(s) "
+              f"(mean {summary['mean_iterations']}, max {summary['max_iterations']} of N_iter_max = {self.N_iter_max}), "
+              f"{summary['cutbacks']} cutback(s).")
+        if summary['increments_at_N_iter_max'] > 0 or summary['cutbacks'] > 0:
+            print("Increments needed N_iter_max iterations or were cut back. More increments (N_increments) or less strict tolerances (eps_*) can save iterations.")
@@ -9,6 +9,7 @@ class IncrementData:
     subsequent_parsing_errors    : int
     increment_last_update       : int
     tracked_increments          : list[int]
+    analysed_increments         : list[int]
     last_file_timestamp         : float
     sleep_time                  : float
     stress_averaged_per_increment        : NDArray[np.float64]
@@ -20,11 +21,15 @@ class IncrementData:
     run_ended_succesfully       : bool
     stress_tensor_type         : StressTensors
     strain_tensor_type         : StrainTensors
+    xi_averaging               : str
+    yielded_conditions         : dict[str, int]
 
     def __init__(self, problem_definition: ProblemDefinition):
         self.subsequent_parsing_errors = 0
         self.increment_last_update = -1
         self.tracked_increments = []
+        # The increment of every entry of the tracked stresses, strains and Wp (the first entry is the initial state).
+        self.analysed_increments = [0]
         self.last_file_timestamp = 0
         self.sleep_time = problem_definition.solver.monitor_update_cycle
         self.stress_averaged_per_increment = np.zeros((1,3,3))
@@ -36,6 +41,9 @@ class IncrementData:
         self.run_ended_succesfully = True
         self.stress_tensor_type = problem_definition.general.stress_tensor_type
         self.strain_tensor_type = problem_definition.general.strain_tensor_type
+        self.xi_averaging = getattr(problem_definition.yielding_condition, "plastic_work_xi_averaging", "endpoint")
+        # The increment at which each tracked yield condition first detected yielding.
+        self.yielded_conditions = dict()
 
     def add_increment_stress_tensor(self, stress_tensor: NDArray[np.float64]) -> None:
         self.stress_averaged_per_increment = np.append(self.stress_averaged_per_increment, [stress_tensor], axis=0)
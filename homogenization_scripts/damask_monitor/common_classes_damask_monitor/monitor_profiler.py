@@ -0,0 +1,149 @@
+# System packages
+import os
+import json
+import time
+import yaml
+import datetime
+import contextlib
+from typing import Iterator
+
+# Local packages
+from ...common_classes.problem_definition import ProblemDefinition
+from ...common_classes.damask_job import DamaskJobTypes
+from ...common_functions.job_cost_model import get_grid_cells
+
+# The monitor profiler measures where the time of the damask monitor goes (solver.monitor_profiling).
+# Every stage of a monitor cycle is timed as a phase, next to a few counters (bytes read, reading errors).
+# - Per job, a JSON line with the phases and counters of every analysed increment is appended to
+#   results/monitor_metrics/[simulation_type]_[field_name].jsonl
+# - At the end of the campaign, the totals of all jobs are written to results/monitor_profile.yaml and printed.
+# The time that is not spent in any phase is the time the monitor waited for DAMASK_grid (sleep_time).
+# Without solver.monitor_profiling, the phases are not timed and nothing is written.
+
+monitor_phases = [
+    'result_file_check',    # .sta file and result file status (see result_file_handshake.py)
+    'result_file_copy',     # copying the result file to the temporary result file
+    'hdf5_open',            # opening the result file with damask.Result
+    'averaging',            # domain averaged stress, strain and plastic strain (incl. add_strain)
+    'plastic_work',         # xi and gamma of the slip systems
+    'stop_conditions',      # yield detection
+    'plotting',             # live plots of the monitor
+]
+
+class MonitorProfiler:
+    enabled: bool
+    job_name: str
+    metrics_file: str
+    grid_cells: int
+    phase_time: dict[str, float]
+    phase_calls: dict[str, int]
+    counters: dict[str, float]
+    increment_phase_time: dict[str, float]
+    increment_counters: dict[str, float]
+
+    def __init__(self, problem_definition: ProblemDefinition, damask_job: DamaskJobTypes):
+        self.enabled = getattr(problem_definition.solver, "monitor_profiling", False)
+        self.job_name = f"{damask_job.simulation_type}/{damask_job.field_name}"
+        self.metrics_file = os.path.join(problem_definition.general.path.results_folder, 'monitor_metrics', f"{damask_job.simulation_type}_{damask_job.field_name}.jsonl")
+        self.grid_cells = 0
+        self.start_time = time.perf_counter()
+        self.phase_time = {phase: 0. for phase in monitor_phases}
+        self.phase_calls = {phase: 0 for phase in monitor_phases}
+        self.counters = dict()
+        self.increment_phase_time = dict()
+        self.increment_counters = dict()
+
+        if self.enabled:
+            cells = get_grid_cells(problem_definition)
+            self.grid_cells = int(cells[0] * cells[1] * cells[2])
+            os.makedirs(os.path.dirname(self.metrics_file), exist_ok=True)
+            # A new run of the job starts a new metrics file.
+            if os.path.exists(self.metrics_file):
+                os.remove(self.metrics_file)
+
+    @contextlib.contextmanager
+    def phase(self, phase_name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        phase_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - phase_start
+            self.phase_time[phase_name] = self.phase_time.get(phase_name, 0.) + duration
+            self.phase_calls[phase_name] = self.phase_calls.get(phase_name, 0) + 1
+            self.increment_phase_time[phase_name] = self.increment_phase_time.get(phase_name, 0.) + duration
+
+    def count(self, counter_name: str, amount: float = 1) -> None:
+        if not self.enabled:
+            return
+        self.counters[counter_name] = self.counters.get(counter_name, 0) + amount
+        self.increment_counters[counter_name] = self.increment_counters.get(counter_name, 0) + amount
+
+    def end_of_increment(self, increment: int) -> None:
+        # Appends the phases and counters since the previous analysed increment to the metrics file of the job.
+        if not self.enabled:
+            return
+        metrics = {
+            'job': self.job_name,
+            'increment': int(increment),
+            'time': datetime.datetime.now().isoformat(timespec='seconds'),
+            'elapsed': round(time.perf_counter() - self.start_time, 6),
+            'phases': {phase: round(duration, 6) for phase, duration in self.increment_phase_time.items()},
+            'counters': self.increment_counters,
+        }
+        with open(self.metrics_file, 'a') as metrics_writer:
+            metrics_writer.write(json.dumps(metrics) + "\n")
+        self.increment_phase_time = dict()
+        self.increment_counters = dict()
+
+    def summary(self) -> dict[str, str | int | float | dict[str, float]]:
+        wall_time = time.perf_counter() - self.start_time
+        busy_time = sum(self.phase_time.values())
+        return {
+            'job': self.job_name,
+            'grid_cells': self.grid_cells,
+            'wall_time': float(wall_time),
+            'phases': {phase: float(duration) for phase, duration in self.phase_time.items()},
+            'calls': {phase: int(calls) for phase, calls in self.phase_calls.items()},
+            'counters': {counter: float(value) for counter, value in self.counters.items()} | {'sleep_time': float(max(wall_time - busy_time, 0.))},
+        }
+
+def monitor_profile_file(problem_definition: ProblemDefinition) -> str:
+    return os.path.join(problem_definition.general.path.results_folder, 'monitor_profile.yaml')
+
+def report_monitor_profile(problem_definition: ProblemDefinition, damask_jobs: list[DamaskJobTypes]) -> None:
+    # End of campaign report: which stage of the monitor dominates, per grid size.
+    if not getattr(problem_definition.solver, "monitor_profiling", False):
+        return
+    job_profiles = [damask_job.monitor_profile for damask_job in damask_jobs if hasattr(damask_job, 'monitor_profile')]
+    if len(job_profiles) == 0:
+        return
+
+    profile_per_grid: dict[int, dict[str, float | int | dict[str, float]]] = dict()
+    for job_profile in job_profiles:
+        grid_profile = profile_per_grid.setdefault(job_profile['grid_cells'], {'jobs': 0, 'wall_time': 0., 'increments': 0, 'phases': dict(), 'counters': dict()}) # type: ignore
+        grid_profile['jobs'] += 1 # type: ignore
+        grid_profile['wall_time'] += job_profile['wall_time'] # type: ignore
+        grid_profile['increments'] += int(job_profile['counters'].get('increments_analysed', 0)) # type: ignore
+        for phase, duration in job_profile['phases'].items(): # type: ignore
+            grid_profile['phases'][phase] = grid_profile['phases'].get(phase, 0.) + duration # type: ignore
+        for counter, value in job_profile['counters'].items(): # type: ignore
+            grid_profile['counters'][counter] = grid_profile['counters'].get(counter, 0.) + value # type: ignore
+
+    print("")
+    print("Monitor profile (time spent per stage of the damask monitor):")
+    for (grid_cells, grid_profile) in profile_per_grid.items():
+        wall_time = max(float(grid_profile['wall_time']), 1E-9) # type: ignore
+        increments = max(int(grid_profile['increments']), 1) # type: ignore
+        print(f"  Grid of {grid_cells} cells, {grid_profile['jobs']} job(s), {grid_profile['increments']} increment(s) analysed:")
+        stages = grid_profile['phases'] | {'waiting for DAMASK_grid': grid_profile['counters'].get('sleep_time', 0.)} # type: ignore
+        for (stage, duration) in sorted(stages.items(), key=lambda stage: -stage[1]): # type: ignore
+            print(f"    {stage:<25} {duration:10.2f} s  {100 * duration / wall_time:5.1f} %  {duration / increments:8.3f} s/increment")
+        if grid_profile['counters'].get('parse_errors', 0) > 0: # type: ignore
+            print(f"    Result file reading errors: {int(grid_profile['counters']['parse_errors'])}") # type: ignore
+
+    with open(monitor_profile_file(problem_definition), 'w') as profile_writer:
+        yaml.dump({'per_grid_size': profile_per_grid, 'jobs': job_profiles}, profile_writer)
+    print(f"Monitor profile written to {monitor_profile_file(problem_definition)}, metrics per increment in the monitor_metrics folder.")
@@ -0,0 +1,128 @@
+# System packages
+import os
+import json
+import time
+import datetime
+import numpy as np
+
+# Local packages
+from .increment_data import IncrementData
+from ...common_classes.problem_definition import ProblemDefinition
+from ...common_classes.damask_job import DamaskJobTypes
+from ...common_functions import damask_helper
+
+# The progress feed is a small append-only file per job with one JSON line per analysed increment:
+#   results/progress/[simulation_type]_[field_name].jsonl
+# A line holds the increment, the homogenized stress [MPa] and strain, the modulus ratio (k / k_0, see the modulus
+# degradation plot), the plastic work Wp, the wall time and the convergence of DAMASK_grid (see convergence_telemetry.py).
+# The first and last line of a run give the state of the job.
+# The feed is meant to be followed while the jobs are running, i.e. with: python show_progress.py [project]
+# Writing a line costs (much) less than a millisecond, so the feed is always written.
+
+Pa_unit = 1e6
+
+class ProgressFeed:
+    progress_file: str
+    job_name: str
+    start_time: float
+
+    def __init__(self, problem_definition: ProblemDefinition, damask_job: DamaskJobTypes):
+        self.job_name = f"{damask_job.simulation_type}/{damask_job.field_name}"
+        self.progress_file = os.path.join(problem_definition.general.path.results_folder, 'progress', f"{damask_job.simulation_type}_{damask_job.field_name}.jsonl")
+        self.start_time = time.time()
+        os.makedirs(os.path.dirname(self.progress_file), exist_ok=True)
+        # A new run of the job starts a new feed.
+        with open(self.progress_file, 'w') as _:
+            pass
+
+    def write(self, progress: dict[str, str | int | float | list[list[float]] | None]) -> None:
+        progress = {
+            'job': self.job_name,
+            'time': datetime.datetime.now().isoformat(timespec='seconds'),
+            'wall_time': round(time.time() - self.start_time, 1),
+        } | progress
+        with open(self.progress_file, 'a') as progress_writer:
+            progress_writer.write(json.dumps(progress) + "\n")
+
+    def job_started(self, damask_job: DamaskJobTypes) -> None:
+        self.write({'state': 'running', 'job_number': damask_job.job_number, 'total_jobs': damask_job.total_jobs})
+
+    def increment_progress(self, increment_data: IncrementData) -> dict[str, str | int | float | list[list[float]] | None]:
+        stress = increment_data.stress_averaged_per_increment
+        strain = increment_data.strain_averaged_per_increment
+
+        # k / k_0 as in the modulus degradation plot, not defined before the first increment has a strain.
+        modulus_ratio = None
+        if np.shape(stress)[0] > 2:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratio = damask_helper.calculate_linear_modulus(stress[-1], strain[-1]) / damask_helper.calculate_linear_modulus(stress[1], strain[1])
+            if np.isfinite(ratio):
+                modulus_ratio = round(float(ratio), 6)
+
+        return {
+            'increment': int(increment_data.increment_last_update),
+            'stress': np.round(stress[-1] / Pa_unit, 6).tolist(),
+            'strain': np.round(strain[-1], 9).tolist(),
+            'modulus_ratio': modulus_ratio,
+            'Wp': float(increment_data.Wp_per_increment[-1]),
+        }
+
+    def increment_analysed(self, increment_data: IncrementData, convergence: list[dict[str, int | float | bool]] | None = None) -> None:
+        # convergence: iterations, cutbacks and residuals of the DAMASK_grid increments since the previous line.
+        self.write({'state': 'running'} | self.increment_progress(increment_data) | {'convergence': convergence})
+
+    def job_ended(self, run_ended_succesfully: bool, increment_data: IncrementData, convergence_summary: dict[str, int | float] | None = None) -> None:
+        # The last line repeats the last analysed increment, so it is enough to read the last line of a feed.
+        self.write({
+            'state': 'finished' if run_ended_succesfully else 'failed',
+            'stop_condition_reached': bool(increment_data.stop_condition_reached),
+        } | self.increment_progress(increment_data) | {'convergence_summary': convergence_summary})
+
+def read_last_progress(progress_file: str) -> dict[str, str | int | float | list[list[float]] | None]:
+    # Reads only the end of the feed, so following many (long) feeds stays cheap.
+    with open(progress_file, 'rb') as progress_reader:
+        progress_reader.seek(0, os.SEEK_END)
+        file_size = progress_reader.tell()
+        progress_reader.seek(max(file_size - 4096, 0))
+        tail = progress_reader.read()
+    for line in reversed(tail.splitlines()):
+        try:
+            return json.loads(line)
+        except ValueError:
+            # A line that is being written, or cut off by the seek.
+            continue
+    return dict()
+
+def find_progress_files(results_folder: str) -> list[str]:
+    progress_files: list[str] = []
+    for (folder, _, file_names) in os.walk(results_folder):
+        if os.path.basename(folder) == 'progress':
+            progress_files += [os.path.join(folder, file_name) for file_name in sorted(file_names) if file_name.endswith('.jsonl')]
+    return progress_files
+
+def format_progress(progress: dict[str, str | int | float | list[list[float]] | None]) -> str:
+    # One line per job: the stress and strain of the largest stress component.
+    stress_text = ""
+    if isinstance(progress.get('stress'), list) and isinstance(progress.get('strain'), list):
+        stress = np.array(progress['stress'])
+        strain = np.array(progress['strain'])
+        (i, j) = np.unravel_index(np.argmax(np.abs(stress)), np.shape(stress))
+        stress_text = f"{'xyz'[i]}-{'xyz'[j]}: {stress[i, j]:10.2f} MPa at {strain[i, j]:.3e}"
+    modulus_ratio = progress.get('modulus_ratio')
+    modulus_text = f"{modulus_ratio:.4f}" if isinstance(modulus_ratio, float) else "-"
+    Wp = progress.get('Wp')
+    Wp_text = f"{Wp:.4g}" if isinstance(Wp, float) else "-"
+    increment = progress.get('increment', '-')
+    wall_time = datetime.timedelta(seconds=round(float(progress.get('wall_time', 0.)))) # type: ignore
+    return f"{str(progress.get('job', '')):<35} {str(progress.get('state', '')):<9} {str(increment):>5} {stress_text:<40} {modulus_text:>8} {Wp_text:>10} {str(wall_time):>9}"
+
+def show_progress(results_folder: str) -> None:
+    progress_files = find_progress_files(results_folder)
+    if len(progress_files) == 0:
+        print(f"No progress feeds found in {results_folder}")
+        return
+    print(f"{'job':<35} {'state':<9} {'inc':>5} {'largest stress component':<40} {'k/k_0':>8} {'Wp':>10} {'wall time':>9}")
+    for progress_file in progress_files:
+        progress = read_last_progress(progress_file)
+        if len(progress) > 0:
+            print(format_progress(progress))
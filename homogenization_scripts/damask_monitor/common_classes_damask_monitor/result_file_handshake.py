@@ -0,0 +1,89 @@
+# System packages
+import os
+import time
+import shutil
+
+# The result file handshake tells when an increment in the DAMASK_grid result file (.hdf5) is completely written,
+# so the monitor can copy it without scanning for .lock files and without retrying on half written files.
+#
+# DAMASK_grid writes a line to the status file (jobname.sta) as soon as an increment has converged. Only after that,
+# the results of the increment are saved to the result file. Hence, increment N is completely written when:
+# - the .sta file reports increment N as converged,
+# - the result file was modified after the .sta file (saving of the results has started),
+# - the result file was not modified for settle_time seconds (saving of the results has finished).
+# The .sta file is read incrementally, only the lines added since the last check are parsed.
+#
+# The monitor never opens the result file DAMASK_grid writes to with HDF5: the averaging adds datasets (i.e. the strain)
+# to the file it reads. The completed result file is copied to the temporary result file, which is read instead.
+
+settle_time = 1.     # [s]
+
+def status_file_of_result_file(result_file: str) -> str:
+    (job_name, _) = os.path.splitext(result_file)
+    return f"{job_name}.sta"
+
+def damask_is_writing_results(result_file: str) -> bool:
+    # True when DAMASK_grid is (about to start) saving results to the result file.
+    if result_file == '' or not os.path.isfile(result_file):
+        return False
+    result_file_modified = os.path.getmtime(result_file)
+    if time.time() - result_file_modified < settle_time:
+        return True
+    status_file = status_file_of_result_file(result_file)
+    if os.path.isfile(status_file) and os.path.getmtime(status_file) > result_file_modified:
+        # An increment converged, but its results are not yet saved.
+        return True
+    return False
+
+class ResultFileHandshake:
+    result_file: str
+    status_file: str
+    status_file_offset: int
+    converged_increment: int
+    result_file_read_time: float
+
+    def __init__(self, result_file: str):
+        self.result_file = result_file
+        self.status_file = status_file_of_result_file(result_file)
+        self.status_file_offset = 0
+        self.converged_increment = -1
+        self.result_file_read_time = 0.
+
+    def read_converged_increment(self) -> int:
+        # Parses the lines added to the .sta file since the last call. The first column is the increment counter.
+        if not os.path.isfile(self.status_file):
+            return self.converged_increment
+        if os.path.getsize(self.status_file) < self.status_file_offset:
+            # The .sta file was replaced (i.e. DAMASK_grid was restarted).
+            self.status_file_offset = 0
+        with open(self.status_file, 'rb') as status_reader:
+            status_reader.seek(self.status_file_offset)
+            new_status = status_reader.read()
+
+        # Only complete lines are used, a line that is being written is parsed at the next call.
+        complete_status = new_status[:new_status.rfind(b'\n') + 1]
+        self.status_file_offset += len(complete_status)
+        for line in complete_status.decode(errors='ignore').splitlines():
+            columns = line.split()
+            if len(columns) > 0 and columns[0].isdigit():
+                self.converged_increment = max(self.converged_increment, int(columns[0]))
+        return self.converged_increment
+
+    def new_increment_available(self, last_analysed_increment: int) -> bool:
+        # Cheap check (no HDF5 access) if there is an increment that was not yet analysed.
+        if not os.path.isfile(self.result_file):
+            return False
+        if os.path.isfile(self.status_file):
+            return self.read_converged_increment() > last_analysed_increment
+        # Without a .sta file, fall back to the modification time of the result file.
+        return os.path.getmtime(self.result_file) > self.result_file_read_time
+
+    def result_file_is_complete(self, damask_grid_is_running: bool = True) -> bool:
+        return not (damask_grid_is_running and damask_is_writing_results(self.result_file))
+
+    def copy_result_file(self, temporary_result_file: str) -> str:
+        shutil.copy2(self.result_file, temporary_result_file)
+        return temporary_result_file
+
+    def mark_result_file_read(self) -> None:
+        self.result_file_read_time = os.path.getmtime(self.result_file)
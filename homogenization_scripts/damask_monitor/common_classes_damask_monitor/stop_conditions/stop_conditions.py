@@ -3,16 +3,21 @@ class StopCondition:
     name: str
     yield_condition : str
     yield_value     : float
+    tracked_conditions: dict[str, float]
 
     
 
     class Yielding:
-        def __init__(self, yield_condition: str, yield_value: float):
+        def __init__(self, yield_condition: str, yield_value: float, tracked_conditions: dict[str, float] | None = None):
             self.name = 'yielding'
             self.yield_condition = yield_condition
             self.yield_value = yield_value
+            # The yield conditions (and values) evaluated by the monitor, the job stops when all of these detected yielding.
+            self.tracked_conditions = tracked_conditions if tracked_conditions is not None else {yield_condition: yield_value}
 
         def __str__(self ):
+            if len(self.tracked_conditions) > 1:
+                return f"Stop condition: stop when yielding is detected by all of {self.tracked_conditions}, the yield point is defined by {self.yield_condition} at value {self.yield_value}"
             return f"Stop condition: stop when yielding is detected, defined by {self.yield_condition} at value {self.yield_value}"
     
     class NoConditions:
@@ -20,5 +25,6 @@ class StopCondition:
             self.name = 'no_conditions'
             self.yield_condition = None
             self.yield_value = None
+            self.tracked_conditions = dict()
         def __str__(self ):
             return f"Stop condition: no stopping condition set."
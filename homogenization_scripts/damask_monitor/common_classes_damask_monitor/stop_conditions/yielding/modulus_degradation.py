@@ -1,8 +1,6 @@
 # System packages
 import numpy as np
 from numpy.typing import NDArray
-import damask # type: ignore
-import scipy.optimize # type: ignore
 
 # Local packages
 from .....common_functions import damask_helper 
@@ -10,6 +8,8 @@ from ....common_classes_damask_monitor.increment_data import IncrementData
 from .....common_classes.damask_job import DamaskJobTypes 
 from .....common_classes.problem_definition import ProblemDefinition
 from ....post_processor.interpolate_results import InterpolatedResults
+from ....post_processor.increment_history import IncrementHistory, read_increment_history
+from ....post_processor.interpolation_fraction import modulus_root, hermite_root
 from ....post_processor.plots import plot_modulus_degradation, plot_stress_strain_curves
 
 # def calculate_linear_deformation_energy(
@@ -75,7 +75,7 @@ def modulus_degradation(
 
     return yield_deteced
 
-def interpolation_fraction(
+def normalized_modulus_threshold(
         yield_value: float, 
         stress_linear: NDArray[np.float64], 
         strain_linear: NDArray[np.float64], 
@@ -83,10 +83,7 @@ def interpolation_fraction(
         strain_before_yield: NDArray[np.float64], 
         stress_after_yield: NDArray[np.float64],
         strain_after_yield: NDArray[np.float64]) -> float:
-    # This function finds to interpolate between the loadstates before and after yield such that the yield condition is met.
-    # It is assumed that the yielding actually happens in between the load states
-    
-    # Returns the fraction for interpolation (x): stress_yield = stress_before + x * (stress_after - stress_before)
+    # The modulus can degrade (1 - yield_value) or stiffen (1 + yield_value), this follows from the slope between the load states.
 
     stiffness_linear = damask_helper.calculate_linear_modulus(stress_linear, strain_linear)
     stiffness_before = damask_helper.calculate_linear_modulus(stress_before_yield, strain_before_yield)
@@ -105,30 +102,37 @@ def interpolation_fraction(
         threshold = 1+yield_value
     else:
         threshold = 1-yield_value
-        
-    modulus_linear = damask_helper.calculate_linear_modulus(stress_linear, strain_linear)
-
-    # Finding the intersection of the yield condition and the interpolated state with a optimizer
-    # Due non-linearity involved in the relationship between stress/strain and modulus.
-    def objective_function(x: float) -> float:
-        stress = stress_before_yield + x*(stress_after_yield - stress_before_yield)
-        strain = strain_before_yield + x*(strain_after_yield - strain_before_yield)
-        modulus = damask_helper.calculate_linear_modulus(stress, strain)
 
-        normalized_modulus = modulus / modulus_linear
+    return threshold
 
-        objective_value = (normalized_modulus-threshold)**2 
-        return objective_value
+def interpolation_fraction(
+        yield_value: float, 
+        stress_linear: NDArray[np.float64], 
+        strain_linear: NDArray[np.float64], 
+        stress_before_yield: NDArray[np.float64], 
+        strain_before_yield: NDArray[np.float64], 
+        stress_after_yield: NDArray[np.float64],
+        strain_after_yield: NDArray[np.float64]) -> float:
+    # This function finds to interpolate between the loadstates before and after yield such that the yield condition is met.
+    # It is assumed that the yielding actually happens in between the load states
+    
+    # Returns the fraction for interpolation (x): stress_yield = stress_before + x * (stress_after - stress_before)
 
-    optimization_result = scipy.optimize.minimize_scalar(objective_function, options={'disp': False}, method="Golden")
+    threshold = normalized_modulus_threshold(yield_value, stress_linear, strain_linear,
+                                             stress_before_yield, strain_before_yield,
+                                             stress_after_yield, strain_after_yield)
+    modulus_linear = damask_helper.calculate_linear_modulus(stress_linear, strain_linear)
 
-    fraction_for_interpolation = optimization_result.x
-    # fraction_for_interpolation = ( strain_norm_yield - strain_norm_before ) / ( strain_norm_after - strain_norm_before )
+    # The modulus of the interpolated state is a ratio of two quadratics in x, the intersection with the yield condition
+    # is the root of a quadratic equation (see interpolation_fraction.py).
+    fraction_for_interpolation = modulus_root(threshold, modulus_linear,
+                                              stress_before_yield, strain_before_yield,
+                                              stress_after_yield, strain_after_yield)
 
     return fraction_for_interpolation
     
 
-def modulus_degradation_monitor(damask_job: DamaskJobTypes, increment_data: IncrementData) -> tuple[bool, float]:
+def modulus_degradation_monitor(damask_job: DamaskJobTypes, increment_data: IncrementData, yield_value_condition: float | None = None) -> tuple[bool, float]:
     # This function is used during monitoring of the DAMASK_grid process and test for yielding by the modulus degradation.
 
     # Output of this function is true or false for yielding detection and the degradation of the modulus.
@@ -144,7 +148,8 @@ def modulus_degradation_monitor(damask_job: DamaskJobTypes, increment_data: Incr
     strain_iteration_1: NDArray[np.float64] = increment_data.strain_averaged_per_increment[1]
     strain_current: NDArray[np.float64] = increment_data.strain_averaged_per_increment[-1]
 
-    yield_value = damask_job.stop_condition.yield_value
+    # yield_value_condition is given when more yield conditions are tracked, see tracked_yield_conditions
+    yield_value = damask_job.stop_condition.yield_value if yield_value_condition is None else yield_value_condition
 
     # If there is an error in the code, the yield value will not be set, likely stop conditions have gotten mixed up.
     if  yield_value is None:
@@ -160,76 +165,98 @@ def modulus_degradation_monitor(damask_job: DamaskJobTypes, increment_data: Incr
     
     return yield_detected, yield_value
 
-def modulus_degradation_post_process(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes) -> InterpolatedResults | None:
-    # This function finds the yield point occourding to modulus degradation. This is meant to be run after the simulation is completed.
-
-    # Output is the interpolated stress/strain state at which the yielding condition is met. 
-    damask_results       = damask.Result(damask_job.runtime.damask_result_file)
-
-    stress_tensor_type = problem_definition.general.stress_tensor_type
-    strain_tensor_type = problem_definition.general.strain_tensor_type
-
-    display_prefix = "[Post process] "
+def modulus_degradation_yield_point(
+        yield_value: float,
+        increment_history: IncrementHistory,
+        interpolation_method: str = "linear") -> InterpolatedResults | None:
+    # This function finds the yield point occourding to modulus degradation in the stresses and strains per increment.
+    # It does not read results or make plots, so it is also used by the batch extraction (yield_point_extraction.py).
 
-    (damask_results, stress_averaged_per_increment) = damask_helper.get_averaged_stress_per_increment(damask_results, stress_tensor_type, display_prefix=display_prefix)
-    (damask_results, strain_averaged_per_increment) = damask_helper.get_averaged_strain_per_increment(damask_results, strain_tensor_type, display_prefix=display_prefix)
+    # Output is the interpolated stress/strain state at which the yielding condition is met, None if there is no yielding.
+    stress_averaged_per_increment = increment_history.stress_averaged_per_increment
+    strain_averaged_per_increment = increment_history.strain_averaged_per_increment
 
-    stored_iteration = damask_results.increments_in_range()
+    stored_iteration = increment_history.increments
 
     stress_iteration_1 = stress_averaged_per_increment[1]
     strain_iteration_1 = strain_averaged_per_increment[1]
 
-    yield_value = damask_job.general_yield_value_modulus_degradation
-
-    iteration_before_yield = 0
-    iteration_after_yield  = 0
+    index_before_yield = 0
+    index_after_yield  = 0
     yield_found = False
 
-    # detect iteration numbers with yielding
-    for iteration in stored_iteration:
+    # detect iteration numbers with yielding, the values are stored per position in stored_iteration (the result file
+    # may not hold every increment, i.e. with f_out > 1)
+    for (index, iteration) in enumerate(stored_iteration):
         if iteration == 0:
             continue
 
-        stress = stress_averaged_per_increment[iteration]
-        strain = strain_averaged_per_increment[iteration]
+        stress = stress_averaged_per_increment[index]
+        strain = strain_averaged_per_increment[index]
 
         yield_detected = modulus_degradation(yield_value,
                                              stress_iteration_1, strain_iteration_1,
                                              stress, strain)
         
         if yield_detected:
-            iteration_before_yield = iteration - 1
-            iteration_after_yield = iteration
+            index_before_yield = index - 1
+            index_after_yield = index
             yield_found = True
             break
 
-
-    
     if not yield_found:
-        plot_stress_strain_curves(problem_definition, damask_job, stress_averaged_per_increment,strain_averaged_per_increment)
-        plot_modulus_degradation(problem_definition, damask_job, stress_averaged_per_increment,strain_averaged_per_increment)
-        yield_detected = False
         return None 
+
+    iteration_before_yield = stored_iteration[index_before_yield]
+    iteration_after_yield = stored_iteration[index_after_yield]
     
-    stress_before_yield = stress_averaged_per_increment[iteration_before_yield]
-    strain_before_yield = strain_averaged_per_increment[iteration_before_yield]
+    stress_before_yield = stress_averaged_per_increment[index_before_yield]
+    strain_before_yield = strain_averaged_per_increment[index_before_yield]
 
-    stress_after_yield = stress_averaged_per_increment[iteration_after_yield]
-    strain_after_yield = strain_averaged_per_increment[iteration_after_yield]
+    stress_after_yield = stress_averaged_per_increment[index_after_yield]
+    strain_after_yield = strain_averaged_per_increment[index_after_yield]
     
-    fraction_for_interpolation = interpolation_fraction(yield_value,
-                                                        stress_iteration_1, strain_iteration_1,
-                                                        stress_before_yield, strain_before_yield,
-                                                        stress_after_yield, strain_after_yield)
+    if interpolation_method == "cubic_hermite":
+        # The residual of the normalized modulus per increment, not defined at increment 0 (no strain).
+        threshold = normalized_modulus_threshold(yield_value,
+                                                 stress_iteration_1, strain_iteration_1,
+                                                 stress_before_yield, strain_before_yield,
+                                                 stress_after_yield, strain_after_yield)
+        modulus_linear = damask_helper.calculate_linear_modulus(stress_iteration_1, strain_iteration_1)
+        residuals = np.full(len(stored_iteration), np.nan)
+        for index in range(1, len(stored_iteration)):
+            residuals[index] = damask_helper.calculate_linear_modulus(stress_averaged_per_increment[index], strain_averaged_per_increment[index]) / modulus_linear - threshold
+        if np.isfinite(residuals[index_before_yield]):
+            fraction_for_interpolation = hermite_root(residuals, index_before_yield)
+        else:
+            interpolation_method = "linear"
+    if not interpolation_method == "cubic_hermite":
+        fraction_for_interpolation = interpolation_fraction(yield_value,
+                                                            stress_iteration_1, strain_iteration_1,
+                                                            stress_before_yield, strain_before_yield,
+                                                            stress_after_yield, strain_after_yield)
 
     # interpolate the yield value
+    interpolated_results = InterpolatedResults(fraction_for_interpolation, increment_history, iteration_before_yield, iteration_after_yield, interpolation_method)
+    return interpolated_results
+
+def modulus_degradation_post_process(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes) -> InterpolatedResults | None:
+    # This function finds the yield point occourding to modulus degradation. This is meant to be run after the simulation is completed.
+
+    # Output is the interpolated stress/strain state at which the yielding condition is met. 
+    display_prefix = "[Post process] "
+
+    # The stresses and strains tracked by the monitor, see increment_history.py
+    increment_history = read_increment_history(problem_definition, damask_job, display_prefix)
+    stress_averaged_per_increment = increment_history.stress_averaged_per_increment
+    strain_averaged_per_increment = increment_history.strain_averaged_per_increment
 
-    interpolated_results = InterpolatedResults(fraction_for_interpolation, damask_results, iteration_before_yield, iteration_after_yield,stress_tensor_type, strain_tensor_type)
+    interpolation_method = getattr(problem_definition.yielding_condition, "yield_interpolation", "linear")
+    interpolated_results = modulus_degradation_yield_point(damask_job.general_yield_value_modulus_degradation, increment_history, interpolation_method)
 
-    damask_results = damask_results.view_all()
-    # Make the plots including the interpolated yield point
+    # Make the plots, including the interpolated yield point if yielding was found
     plot_stress_strain_curves(problem_definition, damask_job, stress_averaged_per_increment,strain_averaged_per_increment, interpolated_results)
     plot_modulus_degradation(problem_definition, damask_job, stress_averaged_per_increment,strain_averaged_per_increment, interpolated_results)
 
     post_process_succeeded = True # type: ignore
-    return  interpolated_results
\ No newline at end of file
+    return  interpolated_results
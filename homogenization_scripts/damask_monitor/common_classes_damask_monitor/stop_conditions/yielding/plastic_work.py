@@ -1,15 +1,14 @@
 # System packages
 import numpy as np
 from numpy.typing import NDArray
-import damask # type: ignore
-import scipy.optimize # type: ignore
 
 # Local packages
-from .....common_functions import damask_helper 
 from ....common_classes_damask_monitor.increment_data import IncrementData
 from .....common_classes.damask_job import DamaskJobTypes 
 from .....common_classes.problem_definition import ProblemDefinition
 from ....post_processor.interpolate_results import InterpolatedResults
+from ....post_processor.increment_history import IncrementHistory, read_increment_history
+from ....post_processor.interpolation_fraction import linear_root, hermite_root
 from ....post_processor.plots import plot_modulus_degradation, plot_stress_strain_curves
 
 # def calculate_linear_deformation_energy(
@@ -99,26 +98,13 @@ def interpolation_fraction(
         
     #modulus_linear = damask_helper.calculate_linear_modulus(stress_linear, strain_linear)
 
-    # Finding the intersection of the yield condition and the interpolated state with a optimizer
-    # Due non-linearity involved in the relationship between stress/strain and modulus.3
-    def objective_function(x: float) -> float:
-        Wp = Wp_before_yield + x*(Wp_after_yield - Wp_before_yield)
-        #strain = strain_before_yield + x*(strain_after_yield - strain_before_yield)
-        #modulus = damask_helper.calculate_linear_modulus(stress, strain)
-
-        #normalized_modulus = modulus / modulus_linear    
-        objective_value = (Wp-threshold)**2 
-        return objective_value
-
-    optimization_result = scipy.optimize.minimize_scalar(objective_function, options={'disp': False}, method="Golden")
-
-    fraction_for_interpolation = optimization_result.x
-    # fraction_for_interpolation = ( strain_norm_yield - strain_norm_before ) / ( strain_norm_after - strain_norm_before )
+    # Wp is interpolated linearly between the load states, so the intersection with the yield condition has a closed form.
+    fraction_for_interpolation = linear_root(float(Wp_before_yield - threshold), float(Wp_after_yield - threshold))
 
     return fraction_for_interpolation
     
 
-def plastic_work_monitor(damask_job: DamaskJobTypes, increment_data: IncrementData) -> tuple[bool, float]:
+def plastic_work_monitor(damask_job: DamaskJobTypes, increment_data: IncrementData, yield_value_condition: float | None = None) -> tuple[bool, float]:
     # This function is used during monitoring of the DAMASK_grid process and test for yielding by the modulus degradation.
 
     # Output of this function is true or false for yielding detection and the degradation of the modulus.
@@ -136,7 +122,8 @@ def plastic_work_monitor(damask_job: DamaskJobTypes, increment_data: IncrementDa
     
     Wp_current: NDArray[np.float64] = increment_data.Wp_per_increment[-1]
 
-    yield_value = damask_job.stop_condition.yield_value
+    # yield_value_condition is given when more yield conditions are tracked, see tracked_yield_conditions
+    yield_value = damask_job.stop_condition.yield_value if yield_value_condition is None else yield_value_condition
 
     # If there is an error in the code, the yield value will not be set, likely stop conditions have gotten mixed up.
     if  yield_value is None:
@@ -150,76 +137,75 @@ def plastic_work_monitor(damask_job: DamaskJobTypes, increment_data: IncrementDa
     
     return yield_detected, yield_value
 
-def plastic_work_post_process(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes) -> InterpolatedResults | None:
-    # This function finds the yield point occourding to modulus degradation. This is meant to be run after the simulation is completed.
-
-    # Output is the interpolated stress/strain state at which the yielding condition is met. 
-    damask_results       = damask.Result(damask_job.runtime.damask_result_file)
-
-    stress_tensor_type = problem_definition.general.stress_tensor_type
-    strain_tensor_type = problem_definition.general.strain_tensor_type
-
-    display_prefix = "[Post process] "
-
-    (damask_results, stress_averaged_per_increment) = damask_helper.get_averaged_stress_per_increment(damask_results, stress_tensor_type, display_prefix=display_prefix)
-    (damask_results, strain_averaged_per_increment) = damask_helper.get_averaged_strain_per_increment(damask_results, strain_tensor_type, display_prefix=display_prefix)
-    (damask_results, plastic_strain_averaged_per_increment) = damask_helper.get_averaged_plastic_strain_per_increment(damask_results, strain_tensor_type, display_prefix=display_prefix)
-    
-    (damask_results, Wp_per_increment) = damask_helper.get_Wp_per_increment(damask_results, display_prefix=display_prefix)
-    
-
-    stored_iteration = damask_results.increments_in_range()
+def plastic_work_yield_point(
+        yield_value: float,
+        increment_history: IncrementHistory,
+        interpolation_method: str = "linear") -> InterpolatedResults | None:
+    # This function finds the yield point occourding to the plastic work in the Wp per increment.
+    # It does not read results or make plots, so it is also used by the batch extraction (yield_point_extraction.py).
 
-    # stress_iteration_1 = stress_averaged_per_increment[1]
-    # strain_iteration_1 = plastic_strain_averaged_per_increment[1]
+    # Output is the interpolated stress/strain state at which the yielding condition is met, None if there is no yielding.
+    Wp_per_increment = increment_history.Wp_per_increment
 
-    yield_value = damask_job.general_yield_value_plastic_work
+    stored_iteration = increment_history.increments
 
-    iteration_before_yield = 0
-    iteration_after_yield  = 0
+    index_before_yield = 0
+    index_after_yield  = 0
     yield_found = False
 
-    # detect iteration numbers with yielding
-    for iteration in stored_iteration:
+    # detect iteration numbers with yielding, the values are stored per position in stored_iteration (the result file
+    # may not hold every increment, i.e. with f_out > 1)
+    for (index, iteration) in enumerate(stored_iteration):
         if iteration == 0:
             continue
 
-        #stress = stress_averaged_per_increment[iteration]
-        plastic_strain = Wp_per_increment[iteration]
+        plastic_strain = Wp_per_increment[index]
 
         yield_detected = plastic_work(yield_value, plastic_strain)
         
         if yield_detected:
-            iteration_before_yield = iteration - 1
-            iteration_after_yield = iteration
+            index_before_yield = index - 1
+            index_after_yield = index
             yield_found = True
             break
 
-
-    
     if not yield_found:
-        plot_stress_strain_curves(problem_definition, damask_job, stress_averaged_per_increment,strain_averaged_per_increment)
-        #plot_plastic_work(problem_definition, damask_job, stress_averaged_per_increment,strain_averaged_per_increment)
-        yield_detected = False
         return None 
-    
-    Wp_before_yield = Wp_per_increment[iteration_before_yield]
-    #strain_before_yield = plastic_strain_averaged_per_increment[iteration_before_yield]
 
-    Wp_after_yield = Wp_per_increment[iteration_after_yield]
-    #strain_after_yield = plastic_strain_averaged_per_increment[iteration_after_yield]
+    iteration_before_yield = stored_iteration[index_before_yield]
+    iteration_after_yield = stored_iteration[index_after_yield]
     
-    fraction_for_interpolation = interpolation_fraction(yield_value,
-                                                        Wp_before_yield,
-                                                        Wp_after_yield,)
+    Wp_before_yield = Wp_per_increment[index_before_yield]
+    Wp_after_yield = Wp_per_increment[index_after_yield]
+    
+    if interpolation_method == "cubic_hermite":
+        fraction_for_interpolation = hermite_root(Wp_per_increment - yield_value, index_before_yield)
+    else:
+        fraction_for_interpolation = interpolation_fraction(yield_value,
+                                                            Wp_before_yield,
+                                                            Wp_after_yield,)
 
     # interpolate the yield value
-    interpolated_results = InterpolatedResults(fraction_for_interpolation, damask_results, iteration_before_yield, iteration_after_yield,stress_tensor_type, strain_tensor_type)
+    interpolated_results = InterpolatedResults(fraction_for_interpolation, increment_history, iteration_before_yield, iteration_after_yield, interpolation_method)
+    return interpolated_results
+
+def plastic_work_post_process(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes) -> InterpolatedResults | None:
+    # This function finds the yield point occourding to modulus degradation. This is meant to be run after the simulation is completed.
+
+    # Output is the interpolated stress/strain state at which the yielding condition is met. 
+    display_prefix = "[Post process] "
+
+    # The stresses, strains and Wp tracked by the monitor, see increment_history.py
+    increment_history = read_increment_history(problem_definition, damask_job, display_prefix)
+    stress_averaged_per_increment = increment_history.stress_averaged_per_increment
+    strain_averaged_per_increment = increment_history.strain_averaged_per_increment
+
+    interpolation_method = getattr(problem_definition.yielding_condition, "yield_interpolation", "linear")
+    interpolated_results = plastic_work_yield_point(damask_job.general_yield_value_plastic_work, increment_history, interpolation_method)
 
-    damask_results = damask_results.view_all()
-    # Make the plots including the interpolated yield point
+    # Make the plots, including the interpolated yield point if yielding was found
     plot_stress_strain_curves(problem_definition, damask_job, stress_averaged_per_increment,strain_averaged_per_increment, interpolated_results)
     #plot_plastic_work(problem_definition, damask_job, stress_averaged_per_increment,strain_averaged_per_increment, interpolated_results)
 
     post_process_succeeded = True # type: ignore
-    return  interpolated_results
\ No newline at end of file
+    return  interpolated_results
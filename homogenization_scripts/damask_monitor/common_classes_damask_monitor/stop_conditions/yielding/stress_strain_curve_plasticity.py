@@ -1,14 +1,13 @@
     # System packages
 import numpy as np
 from numpy.typing import NDArray
-import damask # type: ignore
 
 # Local packages
-from .....common_functions import damask_helper 
 from .....common_classes.damask_job import DamaskJobTypes
 from .....common_classes.problem_definition import ProblemDefinition
 from ....post_processor.interpolate_results import InterpolatedResults
-from .....common_functions import damask_helper
+from ....post_processor.increment_history import IncrementHistory, read_increment_history
+from ....post_processor.interpolation_fraction import hermite_root
 from ....common_classes_damask_monitor.increment_data import IncrementData
 from ....post_processor.plots import plot_stress_strain_curves, plot_modulus_degradation
 
@@ -98,7 +97,7 @@ def interpolation_fraction(
     # As there should always at least be one loaded direction, this code should be unreachable.
     raise Exception("Interpolation did not find a loaded direction, this should be impossible.")
 
-def slope_stress_strain_curve_monitor(damask_job: DamaskJobTypes, increment_data: IncrementData) -> tuple[bool, float]:
+def slope_stress_strain_curve_monitor(damask_job: DamaskJobTypes, increment_data: IncrementData, yield_value_condition: float | None = None) -> tuple[bool, float]:
     current_iteration = increment_data.increment_last_update
     # This function formats the data to be used for yield point detection while monitoring damask.
     # Data from the first, second to last and last increment is needed.
@@ -126,7 +125,7 @@ def slope_stress_strain_curve_monitor(damask_job: DamaskJobTypes, increment_data
     loaded_directions = damask_job.loaded_directions[0]
 
     yielding_detected, yield_value = slope_stress_strain_curve_and_value(
-        damask_job.general_yield_value_plastic_strain, loaded_directions,
+        damask_job.general_yield_value_plastic_strain if yield_value_condition is None else yield_value_condition, loaded_directions,
         stress_iteration_1, strain_iteration_1,
         stress_current, strain_current)
     
@@ -141,101 +140,101 @@ def slope_stress_strain_curve_monitor(damask_job: DamaskJobTypes, increment_data
     #     print("=======")
     return yielding_detected, yield_value
 
-def slope_stress_strain_curve_post_process(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes) -> InterpolatedResults | None:
-    # This function finds the two iterations before and after the yielding condition is met. 
-    # Intented to be used when the simulation is completed.
-
-    # Returns None if no yielding is found or the fraction used for linear interpolation between the states where yielding is met.
-
-    damask_results       = damask.Result(damask_job.runtime.damask_result_file)
-    stress_tensor_type = problem_definition.general.stress_tensor_type
-    strain_tensor_type = problem_definition.general.strain_tensor_type
-
-    display_prefix = "[Post process] "
+def slope_stress_strain_curve_yield_point(
+        yield_value: float,
+        loaded_directions: list[list[bool]],
+        increment_history: IncrementHistory,
+        interpolation_method: str = "linear",
+        existing_incs: int = 0) -> InterpolatedResults | None:
+    # This function finds the two iterations before and after the yielding condition is met in the stresses and strains per increment.
+    # It does not read results or make plots, so it is also used by the batch extraction (yield_point_extraction.py).
 
-    (damask_results, stress_averaged_per_increment) = damask_helper.get_averaged_stress_per_increment(damask_results, stress_tensor_type, display_prefix=display_prefix)
-    (damask_results, strain_averaged_per_increment) = damask_helper.get_averaged_strain_per_increment(damask_results, strain_tensor_type, display_prefix=display_prefix)
+    # Returns None if no yielding is found or the interpolated stress/strain state at which the yielding condition is met.
+    stress_averaged_per_increment = increment_history.stress_averaged_per_increment
+    strain_averaged_per_increment = increment_history.strain_averaged_per_increment
 
-    stored_iteration = damask_results.increments_in_range()
+    stored_iteration = increment_history.increments
 
-    if getattr(damask_job,"existing_incs",False):
-        stress_iteration_1 = stress_averaged_per_increment[damask_job.existing_incs + 2] - stress_averaged_per_increment[damask_job.existing_incs+1]
-        strain_iteration_1 = strain_averaged_per_increment[damask_job.existing_incs + 2] - strain_averaged_per_increment[damask_job.existing_incs+1]
+    if existing_incs:
+        stress_iteration_1 = stress_averaged_per_increment[existing_incs + 2] - stress_averaged_per_increment[existing_incs+1]
+        strain_iteration_1 = strain_averaged_per_increment[existing_incs + 2] - strain_averaged_per_increment[existing_incs+1]
     else:
         stress_iteration_1 = stress_averaged_per_increment[1]
         strain_iteration_1 = strain_averaged_per_increment[1]
-        
-
-    # if getattr(damask_job,"stress_iteration_1",None) is not None:
-    #     print("Overwrite stiffness")
-    #     stress_iteration_1 = damask_job.stress_iteration_1
-    #     strain_iteration_1 = damask_job.strain_iteration_1
-
-    # yield_value = damask_job.general_yield_value_plastic_strain
     
-    iteration_before_yield = 0
-    iteration_after_yield  = 0
+    index_before_yield = 0
+    index_after_yield  = 0
     yield_found = False
     
-    
-    # detect iteration numbers with yielding
-    if getattr(damask_job,"existing_incs",False):
-        stored_iteration = [x for x in stored_iteration if x > damask_job.existing_incs]
-        
-    for iteration in stored_iteration:
-        if iteration == stored_iteration[0]:
-            continue
-    
-        stress = stress_averaged_per_increment[iteration]
-        strain = strain_averaged_per_increment[iteration]
-        
-        loaded_directions = damask_job.loaded_directions[0]
+    # detect iteration numbers with yielding, the values are stored per position in stored_iteration (the result file
+    # may not hold every increment, i.e. with f_out > 1). The first increment (after the existing increments) is skipped.
+    first_index = 0
+    if existing_incs:
+        first_index = next((index for (index, iteration) in enumerate(stored_iteration) if iteration > existing_incs), len(stored_iteration))
         
+    for index in range(first_index + 1, len(stored_iteration)):
+        stress = stress_averaged_per_increment[index]
+        strain = strain_averaged_per_increment[index]
         
         yield_detected = slope_stress_strain_curve(
-            damask_job.general_yield_value_plastic_strain, loaded_directions,
+            yield_value, loaded_directions,
             stress_iteration_1, strain_iteration_1,
             stress, strain)
-        
 
         if yield_detected:
-            iteration_before_yield = iteration - 1
-            iteration_after_yield = iteration
+            index_before_yield = index - 1
+            index_after_yield = index
             yield_found = True
-            #print(yield_found)
-
             break
 
-    # Produce the completed set of plots including the interpolated yielding value.
-
-
     if not yield_found:
-        plot_stress_strain_curves(problem_definition, damask_job, stress_averaged_per_increment,strain_averaged_per_increment)
-        plot_modulus_degradation(problem_definition, damask_job, stress_averaged_per_increment,strain_averaged_per_increment)
-        yield_detected = False # type: ignore
         return None
+
+    iteration_before_yield = stored_iteration[index_before_yield]
+    iteration_after_yield = stored_iteration[index_after_yield]
     
-    stress_before_yield = stress_averaged_per_increment[iteration_before_yield]
-    strain_before_yield = strain_averaged_per_increment[iteration_before_yield]
-    
-    stress_after_yield = stress_averaged_per_increment[iteration_after_yield]
-    strain_after_yield = strain_averaged_per_increment[iteration_after_yield]
-    
+    stress_before_yield = stress_averaged_per_increment[index_before_yield]
+    strain_before_yield = strain_averaged_per_increment[index_before_yield]
     
-    loaded_directions = damask_job.loaded_directions[0]
-
-    fraction_for_interpolation = interpolation_fraction(damask_job.general_yield_value_plastic_strain, loaded_directions,
-                                                    stress_iteration_1, strain_iteration_1,
-                                                    stress_before_yield, strain_before_yield,
-                                                    stress_after_yield, strain_after_yield)
+    stress_after_yield = stress_averaged_per_increment[index_after_yield]
+    strain_after_yield = strain_averaged_per_increment[index_after_yield]
+
+    if interpolation_method == "cubic_hermite":
+        # The distance (in stress) of every increment to the offset line of the loaded direction.
+        (i, j) = [(i, j) for i in range(3) for j in range(3) if loaded_directions[i][j]][0]
+        slope_stress_stain_curve_linear = stress_iteration_1[i][j] / strain_iteration_1[i][j]
+        residuals = slope_stress_stain_curve_linear * (strain_averaged_per_increment[:, i, j] - yield_value) - stress_averaged_per_increment[:, i, j]
+        fraction_for_interpolation = hermite_root(residuals, index_before_yield)
+    else:
+        fraction_for_interpolation = interpolation_fraction(yield_value, loaded_directions,
+                                                        stress_iteration_1, strain_iteration_1,
+                                                        stress_before_yield, strain_before_yield,
+                                                        stress_after_yield, strain_after_yield)
     # probably add existing incs here
     
-    interpolated_results = InterpolatedResults(fraction_for_interpolation, damask_results, iteration_before_yield, iteration_after_yield, stress_tensor_type, strain_tensor_type)
+    interpolated_results = InterpolatedResults(fraction_for_interpolation, increment_history, iteration_before_yield, iteration_after_yield, interpolation_method)
+    return interpolated_results
 
+def slope_stress_strain_curve_post_process(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes) -> InterpolatedResults | None:
+    # This function finds the two iterations before and after the yielding condition is met. 
+    # Intented to be used when the simulation is completed.
+
+    # Returns None if no yielding is found or the fraction used for linear interpolation between the states where yielding is met.
 
+    display_prefix = "[Post process] "
+
+    # The stresses and strains tracked by the monitor, see increment_history.py
+    increment_history = read_increment_history(problem_definition, damask_job, display_prefix)
+    stress_averaged_per_increment = increment_history.stress_averaged_per_increment
+    strain_averaged_per_increment = increment_history.strain_averaged_per_increment
+
+    interpolation_method = getattr(problem_definition.yielding_condition, "yield_interpolation", "linear")
+    interpolated_results = slope_stress_strain_curve_yield_point(damask_job.general_yield_value_plastic_strain, damask_job.loaded_directions[0],
+                                                                 increment_history, interpolation_method, getattr(damask_job,"existing_incs",0))
+
+    # Produce the completed set of plots including the interpolated yielding value.
     plot_stress_strain_curves(problem_definition, damask_job, stress_averaged_per_increment, strain_averaged_per_increment, interpolated_results)
     plot_modulus_degradation(problem_definition, damask_job, stress_averaged_per_increment, strain_averaged_per_increment, interpolated_results)
 
     post_process_succeeded = True # type: ignore
     return interpolated_results
-    
\ No newline at end of file
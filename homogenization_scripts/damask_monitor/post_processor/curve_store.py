@@ -0,0 +1,149 @@
+# System packages
+import os
+import numpy as np
+from numpy.typing import NDArray
+
+# Local packages
+from ...common_classes.problem_definition import ProblemDefinition
+from ...common_classes.damask_job import DamaskJob
+from .increment_history import IncrementHistory
+from .interpolate_results import InterpolatedResults
+from ..common_classes_damask_monitor.stop_conditions.yielding.modulus_degradation import modulus_degradation_yield_point
+from ..common_classes_damask_monitor.stop_conditions.yielding.plastic_work import plastic_work_yield_point
+from ..common_classes_damask_monitor.stop_conditions.yielding.stress_strain_curve_plasticity import slope_stress_strain_curve_yield_point
+
+# The homogenized curve of a yield point job is its increment history (stress, strain, plastic strain and Wp per increment),
+# stored next to the other results of the job as a compressed numpy file:
+#   results/[simulation_type]/[field_name]/homogenized_curve.npz
+# With the curve, the yield point for another yield condition or yield value is found again without running DAMASK_grid,
+# see rederive_yield_points.py. This is only possible when the curve passed the new yield value, or when the full load was
+# applied (the job was not stopped by the yield condition): then no yielding is a valid result as well.
+# The curve also holds what the yield point depends on: the loaded direction, the tensor types and the xi averaging (Wp).
+
+curve_file_name = 'homogenized_curve.npz'
+
+def curve_file(problem_definition: ProblemDefinition, simulation_type: str, field_name: str) -> str:
+    return os.path.join(problem_definition.general.path.results_folder, simulation_type, field_name, curve_file_name)
+
+def remove_curve(curve_path: str) -> None:
+    # Curves can be hard-linked to the result cache, a new curve is written to a new file instead of into the linked one.
+    os.makedirs(os.path.dirname(curve_path), exist_ok=True)
+    if os.path.exists(curve_path):
+        os.remove(curve_path)
+
+def rotate_tensors(tensors: NDArray[np.float64], Q: NDArray[np.float64]) -> NDArray[np.float64]:
+    return np.einsum('ij,njk,lk->nil', Q, tensors, Q)
+
+def rotate_loaded_directions(loaded_directions: NDArray[np.float64], Q: NDArray[np.float64]) -> NDArray[np.bool_]:
+    return (np.abs(Q) @ np.array(loaded_directions, dtype=float) @ np.abs(Q).T) > 0.5
+
+def store_rotated_curve(source_curve_path: str, target_curve_path: str, symmetry_operation: NDArray[np.float64] | list[list[float]]) -> None:
+    # The curve of an equivalent job, from a stored curve (i.e. one from the result cache).
+    Q = np.array(symmetry_operation)
+    with np.load(source_curve_path) as curve:
+        rotated_curve = {name: curve[name] for name in curve.files}
+    for name in ['stress', 'strain', 'plastic_strain']:
+        rotated_curve[name] = rotate_tensors(rotated_curve[name], Q)
+    rotated_curve['loaded_directions'] = rotate_loaded_directions(rotated_curve['loaded_directions'], Q)
+    remove_curve(target_curve_path)
+    np.savez_compressed(target_curve_path, **rotated_curve)
+
+def store_curve(
+        problem_definition: ProblemDefinition,
+        damask_job: DamaskJob.YieldPointMultiaxial,
+        increment_history: IncrementHistory,
+        field_name: str | None = None,
+        symmetry_operation: NDArray[np.float64] | None = None) -> None:
+    # Equivalent jobs (that were not run) store the curve of this job, rotated by their symmetry operation Q.
+    field_name = damask_job.field_name if field_name is None else field_name
+    Q = np.eye(3) if symmetry_operation is None else np.array(symmetry_operation)
+    loaded_directions = rotate_loaded_directions(damask_job.loaded_directions[0], Q)
+
+    increment_data = getattr(damask_job, "increment_data", None)
+    full_load_applied = not bool(getattr(increment_data, "stop_condition_reached", True))
+
+    curve_path = curve_file(problem_definition, damask_job.simulation_type, field_name)
+    remove_curve(curve_path)
+    np.savez_compressed(curve_path,
+        increments=np.array(increment_history.increments),
+        stress=rotate_tensors(increment_history.stress_averaged_per_increment, Q),
+        strain=rotate_tensors(increment_history.strain_averaged_per_increment, Q),
+        plastic_strain=rotate_tensors(increment_history.plastic_strain_averaged_per_increment, Q),
+        Wp=increment_history.Wp_per_increment,
+        loaded_directions=loaded_directions,
+        existing_incs=int(getattr(damask_job, "existing_incs", 0) or 0),
+        full_load_applied=full_load_applied,
+        stress_tensor_type=problem_definition.general.stress_tensor_type.str(),
+        strain_tensor_type=problem_definition.general.strain_tensor_type.str(),
+        xi_averaging=getattr(problem_definition.yielding_condition, "plastic_work_xi_averaging", "endpoint"))
+
+class StoredCurve:
+    increment_history: IncrementHistory
+    loaded_directions: list[list[bool]]
+    existing_incs: int
+    full_load_applied: bool
+    stress_tensor_type: str
+    strain_tensor_type: str
+    xi_averaging: str
+
+    def __init__(self, curve_path: str):
+        with np.load(curve_path) as curve:
+            self.increment_history = IncrementHistory([int(increment) for increment in curve['increments']], 'curve store')
+            self.increment_history.stress_averaged_per_increment = curve['stress']
+            self.increment_history.strain_averaged_per_increment = curve['strain']
+            self.increment_history.plastic_strain_averaged_per_increment = curve['plastic_strain']
+            self.increment_history.Wp_per_increment = curve['Wp']
+            self.loaded_directions = curve['loaded_directions'].tolist()
+            self.existing_incs = int(curve['existing_incs'])
+            self.full_load_applied = bool(curve['full_load_applied'])
+            self.stress_tensor_type = str(curve['stress_tensor_type'])
+            self.strain_tensor_type = str(curve['strain_tensor_type'])
+            self.xi_averaging = str(curve['xi_averaging'])
+
+def read_curve(problem_definition: ProblemDefinition, simulation_type: str, field_name: str) -> StoredCurve | None:
+    curve_path = curve_file(problem_definition, simulation_type, field_name)
+    if not os.path.isfile(curve_path):
+        return None
+    try:
+        return StoredCurve(curve_path)
+    except Exception:
+        return None
+
+def curve_matches_settings(problem_definition: ProblemDefinition, stored_curve: StoredCurve, yield_condition: str) -> bool:
+    if not stored_curve.stress_tensor_type == problem_definition.general.stress_tensor_type.str():
+        return False
+    if not stored_curve.strain_tensor_type == problem_definition.general.strain_tensor_type.str():
+        return False
+    if yield_condition == 'plastic_work':
+        return stored_curve.xi_averaging == getattr(problem_definition.yielding_condition, "plastic_work_xi_averaging", "endpoint")
+    return True
+
+def yield_point_of_curve(stored_curve: StoredCurve, yield_condition: str, yield_value: float, interpolation_method: str = "linear") -> InterpolatedResults | None:
+    increment_history = stored_curve.increment_history
+    with np.errstate(divide='ignore', invalid='ignore'):
+        match yield_condition:
+            case 'modulus_degradation':
+                return modulus_degradation_yield_point(yield_value, increment_history, interpolation_method)
+            case 'stress_strain_curve':
+                return slope_stress_strain_curve_yield_point(yield_value, stored_curve.loaded_directions, increment_history, interpolation_method, stored_curve.existing_incs)
+            case 'plastic_work':
+                return plastic_work_yield_point(yield_value, increment_history, interpolation_method)
+            case _:
+                raise Exception(f"Yield point post processing of damask results not yet implemented for {yield_condition}")
+
+def rederive_yield_point(
+        problem_definition: ProblemDefinition,
+        simulation_type: str,
+        field_name: str,
+        yield_condition: str,
+        yield_value: float) -> tuple[bool, NDArray[np.float64] | None]:
+    # Returns if the yield point could be found from the stored curve, and the yield stress (None when there is no yielding).
+    stored_curve = read_curve(problem_definition, simulation_type, field_name)
+    if stored_curve is None or not curve_matches_settings(problem_definition, stored_curve, yield_condition):
+        return False, None
+    interpolation_method = getattr(problem_definition.yielding_condition, "yield_interpolation", "linear")
+    interpolated_results = yield_point_of_curve(stored_curve, yield_condition, yield_value, interpolation_method)
+    if interpolated_results is None:
+        # The curve did not pass the yield value: only a valid result if the job applied the full load.
+        return stored_curve.full_load_applied, None
+    return True, interpolated_results.stress
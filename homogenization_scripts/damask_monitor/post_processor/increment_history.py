@@ -0,0 +1,169 @@
+# System packages
+import os
+import damask # type: ignore
+import numpy as np
+from numpy.typing import NDArray
+
+# Local packages
+from ...common_classes.problem_definition import ProblemDefinition
+from ...common_classes.damask_job import DamaskJobTypes
+from ...common_functions import damask_helper
+
+# The increment history is the homogenized stress, strain, plastic strain and plastic work Wp of every increment in the result file.
+# These values are tracked by the damask monitor while the job runs (IncrementData), so the post-processing uses these:
+# - The last increment that was analysed by the monitor is read again from the result file, to verify the tracked values.
+# - Only increments the monitor did not analyse (i.e. increments that finished between two monitor cycles, or after the
+#   stop condition was reached) are read from the result file.
+# The complete result file is read (as before) when there is no usable history: in the postprocessing_only mode,
+# for jobs that continue from a restart file, or when the verification fails.
+
+verification_rtol = 1E-6
+verification_stress_atol = 1E-3   # [Pa], far below any meaningful stress
+verification_strain_atol = 1E-9   # [-], far below any meaningful strain
+
+class IncrementHistory:
+    increments: list[int]
+    stress_averaged_per_increment: NDArray[np.float64]
+    strain_averaged_per_increment: NDArray[np.float64]
+    plastic_strain_averaged_per_increment: NDArray[np.float64]
+    Wp_per_increment: NDArray[np.float64]
+    increments_read: int
+    source: str
+
+    def __init__(self, increments: list[int], source: str):
+        self.increments = increments
+        self.stress_averaged_per_increment = np.zeros((len(increments), 3, 3))
+        self.strain_averaged_per_increment = np.zeros((len(increments), 3, 3))
+        self.plastic_strain_averaged_per_increment = np.zeros((len(increments), 3, 3))
+        self.Wp_per_increment = np.zeros(len(increments))
+        self.increments_read = 0
+        self.source = source
+
+    def index_of(self, increment: int) -> int:
+        return self.increments.index(increment)
+
+def averaged_values(
+        damask_results: damask.Result,
+        stress_tensor_type: str,
+        strain_tensor_type: str,
+        xi_averaging: str = "endpoint",
+        include_Wp: bool = True,
+        display_prefix: str = "") -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+    # Stress, strain, plastic strain and Wp (relative to the first visible increment) of all visible increments.
+    # Wp needs the slip of every slip system, without include_Wp it is not read (and 0).
+    (damask_results, stress_averaged_per_increment) = damask_helper.get_averaged_stress_per_increment(damask_results, stress_tensor_type, display_prefix=display_prefix) # type: ignore
+    (damask_results, strain_averaged_per_increment) = damask_helper.get_averaged_strain_per_increment(damask_results, strain_tensor_type, display_prefix=display_prefix) # type: ignore
+    (damask_results, plastic_strain_averaged_per_increment) = damask_helper.get_averaged_plastic_strain_per_increment(damask_results, strain_tensor_type, display_prefix=display_prefix) # type: ignore
+    if include_Wp:
+        (damask_results, Wp_per_increment) = damask_helper.get_Wp_per_increment(damask_results, display_prefix=display_prefix, xi_averaging=xi_averaging)
+    else:
+        Wp_per_increment = np.zeros(np.shape(stress_averaged_per_increment)[0])
+    return stress_averaged_per_increment, strain_averaged_per_increment, plastic_strain_averaged_per_increment, Wp_per_increment
+
+def averaged_values_of_result(damask_results: damask.Result, problem_definition: ProblemDefinition, display_prefix: str = "") -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+    xi_averaging = getattr(problem_definition.yielding_condition, "plastic_work_xi_averaging", "endpoint")
+    return averaged_values(damask_results, problem_definition.general.stress_tensor_type, problem_definition.general.strain_tensor_type, xi_averaging, display_prefix=display_prefix)
+
+def increment_history_from_result_file(problem_definition: ProblemDefinition, damask_results: damask.Result, display_prefix: str = "") -> IncrementHistory:
+    increment_history = IncrementHistory([int(increment) for increment in damask_results.increments_in_range()], 'result file')
+    (increment_history.stress_averaged_per_increment,
+     increment_history.strain_averaged_per_increment,
+     increment_history.plastic_strain_averaged_per_increment,
+     increment_history.Wp_per_increment) = averaged_values_of_result(damask_results, problem_definition, display_prefix)
+    increment_history.increments_read = len(increment_history.increments)
+    return increment_history
+
+def monitor_history_is_usable(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes) -> bool:
+    increment_data = getattr(damask_job, "increment_data", None)
+    if increment_data is None or problem_definition.general.path.postprocessing_only:
+        return False
+    # The increments of a restart file are numbered and averaged differently, these jobs are read completely.
+    if getattr(problem_definition.general.path, "restart_file_path", False) or getattr(damask_job, "existing_incs", False):
+        return False
+    analysed_increments = getattr(increment_data, "analysed_increments", [])
+    return len(analysed_increments) == np.shape(increment_data.stress_averaged_per_increment)[0] == np.shape(increment_data.Wp_per_increment)[0]
+
+def tracked_values_are_verified(problem_definition: ProblemDefinition, damask_results: damask.Result, increment_data, display_prefix: str = "") -> bool: # type: ignore
+    # Reads the last analysed increment from the result file and compares it with the tracked stress and strain.
+    last_increment = increment_data.analysed_increments[-1]
+    if last_increment == 0:
+        return True
+    stress_tensor_type = problem_definition.general.stress_tensor_type
+    strain_tensor_type = problem_definition.general.strain_tensor_type
+    damask_results_last = damask_results.view(increments=last_increment)
+    (damask_results_last, stress) = damask_helper.get_averaged_stress_per_increment(damask_results_last, stress_tensor_type, display_prefix=display_prefix)
+    (damask_results_last, strain) = damask_helper.get_averaged_strain_per_increment(damask_results_last, strain_tensor_type, display_prefix=display_prefix)
+    stress_matches = np.allclose(stress[-1], increment_data.stress_averaged_per_increment[-1], rtol=verification_rtol, atol=verification_stress_atol)
+    strain_matches = np.allclose(strain[-1], increment_data.strain_averaged_per_increment[-1], rtol=verification_rtol, atol=verification_strain_atol)
+    return bool(stress_matches and strain_matches)
+
+def missing_segments(missing_indices: list[int]) -> list[list[int]]:
+    # Groups the indices of the increments that were not analysed into runs of subsequent increments.
+    segments: list[list[int]] = []
+    for index in missing_indices:
+        if len(segments) > 0 and segments[-1][-1] == index - 1:
+            segments[-1].append(index)
+        else:
+            segments.append([index])
+    return segments
+
+def increment_history_from_monitor(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes, damask_results: damask.Result, display_prefix: str = "") -> IncrementHistory | None:
+    increment_data = damask_job.increment_data
+    file_increments = [int(increment) for increment in damask_results.increments_in_range()]
+    tracked_index = {int(increment): index for index, increment in enumerate(increment_data.analysed_increments)}
+    if any(not increment in file_increments for increment in tracked_index):
+        return None
+    if not tracked_values_are_verified(problem_definition, damask_results, increment_data, display_prefix):
+        return None
+
+    increment_history = IncrementHistory(file_increments, 'monitor')
+    missing_indices: list[int] = []
+    for (index, increment) in enumerate(file_increments):
+        if increment in tracked_index:
+            tracked = tracked_index[increment]
+            increment_history.stress_averaged_per_increment[index] = increment_data.stress_averaged_per_increment[tracked]
+            increment_history.strain_averaged_per_increment[index] = increment_data.strain_averaged_per_increment[tracked]
+            increment_history.plastic_strain_averaged_per_increment[index] = increment_data.plastic_strain_averaged_per_increment[tracked]
+            increment_history.Wp_per_increment[index] = increment_data.Wp_per_increment[tracked]
+        else:
+            missing_indices.append(index)
+
+    # Wp accumulates over the increments: a missing segment is read together with the increment before it, its Wp continues from there.
+    for segment in missing_segments(missing_indices):
+        first_index = segment[0]
+        read_indices = ([first_index - 1] if first_index > 0 else []) + segment
+        offset = len(read_indices) - len(segment)
+        damask_results_segment = damask_results.view(increments=[file_increments[index] for index in read_indices])
+        (stress, strain, plastic_strain, Wp) = averaged_values_of_result(damask_results_segment, problem_definition, display_prefix)
+        Wp_before_segment = increment_history.Wp_per_increment[first_index - 1] if first_index > 0 else 0.
+        for (position, index) in enumerate(segment):
+            increment_history.stress_averaged_per_increment[index] = stress[position + offset]
+            increment_history.strain_averaged_per_increment[index] = strain[position + offset]
+            increment_history.plastic_strain_averaged_per_increment[index] = plastic_strain[position + offset]
+            increment_history.Wp_per_increment[index] = Wp_before_segment + Wp[position + offset]
+        increment_history.increments_read += len(read_indices)
+
+    return increment_history
+
+def read_increment_history(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes, display_prefix: str = "") -> IncrementHistory:
+    # The history is kept with the job, so the post-processing steps of a job share it (as long as the result file is unchanged).
+    result_file = damask_job.runtime.damask_result_file
+    result_file_state = (os.path.getsize(result_file), os.path.getmtime(result_file))
+    cached_history = getattr(damask_job, "increment_history", None)
+    if cached_history is not None and getattr(damask_job, "increment_history_file_state", None) == result_file_state:
+        return cached_history
+
+    damask_results = damask.Result(result_file)
+    increment_history = None
+    if monitor_history_is_usable(problem_definition, damask_job):
+        increment_history = increment_history_from_monitor(problem_definition, damask_job, damask_results, display_prefix)
+        if increment_history is None:
+            print(f"{display_prefix}The stresses tracked by the monitor do not match the result file, reading all increments from the result file.")
+    if increment_history is None:
+        increment_history = increment_history_from_result_file(problem_definition, damask_results, display_prefix)
+    else:
+        print(f"{display_prefix}Using the {len(increment_history.increments)} increment(s) tracked by the monitor, {increment_history.increments_read} read from the result file.")
+
+    damask_job.increment_history = increment_history
+    damask_job.increment_history_file_state = result_file_state
+    return increment_history
@@ -1,11 +1,11 @@
 # System packages
-import damask  # type: ignore
 import numpy as np
 from numpy.typing import NDArray
 
 # Local packages
 from ...common_functions import damask_helper
-from ...common_classes.problem_definition import StressTensors, StrainTensors
+from .increment_history import IncrementHistory
+from .interpolation_fraction import hermite_value
 
 def interpolate_values_float(
         fraction: float, 
@@ -45,34 +45,23 @@ class InterpolatedResults:
     deformation_energy_linear: float
 
     def __init__(self,
-            interpolation_fraction: float, damask_results: damask.Result,
-            iteration_1: int, iteration_2: int,
-            stress_tensor_type: StressTensors, strain_tensor_type: StrainTensors) -> None:
+            interpolation_fraction: float, increment_history: IncrementHistory,
+            iteration_1: int, iteration_2: int, interpolation_method: str = "linear") -> None:
 
         self.interpolation_fraction = interpolation_fraction
         self.iteration_1 = iteration_1
         self.iteration_2 = iteration_2
 
-        damask_results = damask_results.view(increments=[0, 1])
+        # The values per increment are taken from the increment history of the job, see increment_history.py
+        self.stress_linear = increment_history.stress_averaged_per_increment[1]
+        self.strain_linear = increment_history.strain_averaged_per_increment[1]
 
-
-        (damask_results, stress_averaged_per_increment) = damask_helper.get_averaged_stress_per_increment(damask_results, stress_tensor_type)
-        (damask_results, strain_averaged_per_increment) = damask_helper.get_averaged_strain_per_increment(damask_results, strain_tensor_type)
-
-        self.stress_linear = stress_averaged_per_increment[1]
-        self.strain_linear = strain_averaged_per_increment[1]
-
-
-
-        damask_results = damask_results.view(increments=[iteration_1, iteration_2])
-
-        (damask_results, stress_averaged_per_increment) = damask_helper.get_averaged_stress_per_increment(damask_results,stress_tensor_type)
-        (damask_results, strain_averaged_per_increment) = damask_helper.get_averaged_strain_per_increment(damask_results,strain_tensor_type)
-        (damask_results, plastic_strain_averaged_per_increment) = damask_helper.get_averaged_plastic_strain_per_increment(damask_results,strain_tensor_type)
-        
-        damask_results = damask_results.view(increments=[idu for idu in range(iteration_2+1)])
-        (damask_results, Wp_per_increment) = damask_helper.get_Wp_per_increment(damask_results)
-        Wp_per_increment = Wp_per_increment[-2:]
+        index_1 = increment_history.index_of(iteration_1)
+        index_2 = increment_history.index_of(iteration_2)
+        stress_averaged_per_increment = increment_history.stress_averaged_per_increment[[index_1, index_2]]
+        strain_averaged_per_increment = increment_history.strain_averaged_per_increment[[index_1, index_2]]
+        plastic_strain_averaged_per_increment = increment_history.plastic_strain_averaged_per_increment[[index_1, index_2]]
+        Wp_per_increment = increment_history.Wp_per_increment[[index_1, index_2]]
 
         stress_1: np.float64 = stress_averaged_per_increment[0]
         strain_1: np.float64 = strain_averaged_per_increment[0]
@@ -89,6 +78,12 @@ class InterpolatedResults:
         plastic_strain_interpolated: NDArray[np.float64] = interpolate_values_tensor(interpolation_fraction, plastic_strain_1, plastic_strain_2) # type: ignore
         Wp_interpolated: NDArray[np.float64] = interpolate_values_float(interpolation_fraction, Wp_1, Wp_2) # type: ignore
 
+        # With cubic_hermite the yield point lies on the spline through the neighbouring increments, see interpolation_fraction.py
+        if interpolation_method == "cubic_hermite" and index_2 == index_1 + 1:
+            stress_interpolated = hermite_value(increment_history.stress_averaged_per_increment, index_1, interpolation_fraction)
+            strain_interpolated = hermite_value(increment_history.strain_averaged_per_increment, index_1, interpolation_fraction)
+            plastic_strain_interpolated = hermite_value(increment_history.plastic_strain_averaged_per_increment, index_1, interpolation_fraction)
+            Wp_interpolated = hermite_value(increment_history.Wp_per_increment, index_1, interpolation_fraction)
 
         self.stress: NDArray[np.float64] = stress_interpolated
         self.strain: NDArray[np.float64] = strain_interpolated
@@ -0,0 +1,92 @@
+# System packages
+import numpy as np
+from numpy.typing import NDArray
+import scipy.optimize # type: ignore
+
+# Local packages
+from ...common_functions import damask_helper
+
+# The yield point lies between the increment before (x = 0) and after (x = 1) the yield condition is met.
+# The fraction x where the condition is met exactly is found without a (squared residual) optimizer:
+# - linear: the residual of the yield condition is interpolated linearly between the two increments. For the plastic work
+#   and the stress strain curve the residual is linear in x, so the fraction is found directly. For the modulus degradation,
+#   the modulus of the interpolated stress and strain is a ratio of two quadratics in x, which gives a quadratic equation.
+# - cubic_hermite: the residual (and the stress and strain) are interpolated with a cubic Hermite spline through the two
+#   increments, with the slopes taken from the neighbouring increments. This is more accurate for coarse increments.
+#   The fraction is the root of the signed residual, bracketed between the two increments.
+
+def linear_root(residual_before: float, residual_after: float) -> float:
+    # Fraction where the linearly interpolated residual is 0.
+    residual_change = residual_after - residual_before
+    if residual_change == 0:
+        return 1.
+    return float(-residual_before / residual_change)
+
+def closest_root(coefficients: tuple[float, float, float]) -> float:
+    # The root of a x^2 + b x + c in [0, 1] (the first one if there are two), else the real root closest to [0, 1].
+    # Without real roots the residual does not cross 0, x is then where the residual is closest to 0.
+    (a, b, c) = coefficients
+    if abs(a) < 1E-12 * max(abs(b), abs(c), 1E-300):
+        return float(-c / b) if not b == 0 else 1.
+    discriminant = b**2 - 4 * a * c
+    if discriminant < 0:
+        return float(-b / (2 * a))
+    roots = sorted([(-b - np.sqrt(discriminant)) / (2 * a), (-b + np.sqrt(discriminant)) / (2 * a)])
+    roots_in_interval = [root for root in roots if 0 <= root <= 1]
+    if len(roots_in_interval) > 0:
+        return float(roots_in_interval[0])
+    return float(min(roots, key=lambda root: min(abs(root), abs(root - 1))))
+
+def modulus_root(
+        normalized_modulus_threshold: float,
+        modulus_linear: float,
+        stress_before: NDArray[np.float64],
+        strain_before: NDArray[np.float64],
+        stress_after: NDArray[np.float64],
+        strain_after: NDArray[np.float64]) -> float:
+    # Fraction where the modulus (linear deformation energy / |strain|^2) of the linearly interpolated stress and strain
+    # equals normalized_modulus_threshold * modulus_linear:
+    #   0.5 * (s0 + x ds) . (e0 + x de) = k * (e0 + x de) . (e0 + x de)
+    stress_0 = damask_helper.stress_tensor_to_vector_notation(stress_before).flatten()
+    strain_0 = damask_helper.strain_tensor_to_vector_notation(strain_before).flatten()
+    stress_change = damask_helper.stress_tensor_to_vector_notation(stress_after).flatten() - stress_0
+    strain_change = damask_helper.strain_tensor_to_vector_notation(strain_after).flatten() - strain_0
+    k = normalized_modulus_threshold * modulus_linear
+
+    a = 0.5 * np.dot(stress_change, strain_change) - k * np.dot(strain_change, strain_change)
+    b = 0.5 * (np.dot(stress_0, strain_change) + np.dot(stress_change, strain_0)) - 2 * k * np.dot(strain_0, strain_change)
+    c = 0.5 * np.dot(stress_0, strain_0) - k * np.dot(strain_0, strain_0)
+    return closest_root((float(a), float(b), float(c)))
+
+def hermite_tangents(values: NDArray[np.float64], index_before: int) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    # Slopes (per increment) at the increments before and after yield, from the neighbouring increments (Catmull-Rom).
+    # At the ends of the history, or next to values that are not defined (i.e. the modulus at increment 0), one-sided.
+    index_after = index_before + 1
+    secant = values[index_after] - values[index_before]
+    if index_before > 0 and np.all(np.isfinite(values[index_before - 1])):
+        tangent_before = 0.5 * (values[index_after] - values[index_before - 1])
+    else:
+        tangent_before = secant
+    if index_after + 1 < len(values) and np.all(np.isfinite(values[index_after + 1])):
+        tangent_after = 0.5 * (values[index_after + 1] - values[index_before])
+    else:
+        tangent_after = secant
+    return tangent_before, tangent_after
+
+def hermite_value(values: NDArray[np.float64], index_before: int, fraction: float) -> NDArray[np.float64]:
+    # Cubic Hermite interpolation between values[index_before] and values[index_before + 1], for scalars and tensors.
+    (tangent_before, tangent_after) = hermite_tangents(values, index_before)
+    x = fraction
+    h00 = 2 * x**3 - 3 * x**2 + 1
+    h10 = x**3 - 2 * x**2 + x
+    h01 = -2 * x**3 + 3 * x**2
+    h11 = x**3 - x**2
+    return h00 * values[index_before] + h10 * tangent_before + h01 * values[index_before + 1] + h11 * tangent_after
+
+def hermite_root(residuals: NDArray[np.float64], index_before: int) -> float:
+    # Fraction where the Hermite interpolated residual is 0, bracketed by the increments before and after yield.
+    residual_before = float(residuals[index_before])
+    residual_after = float(residuals[index_before + 1])
+    if not np.sign(residual_before) * np.sign(residual_after) < 0:
+        return linear_root(residual_before, residual_after)
+    return float(scipy.optimize.brentq(lambda x: float(hermite_value(residuals, index_before, x)), 0., 1.))
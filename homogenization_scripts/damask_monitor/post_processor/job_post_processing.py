@@ -1,17 +1,22 @@
 # System packages
 import damask
+import numpy as np
+from numpy.typing import NDArray
 
 # Local packages 
 from ...common_classes.damask_job import DamaskJobTypes, DamaskJob
 from ...common_classes.problem_definition import ProblemDefinition
 from ...common_classes import messages
 from ...common_functions import damask_helper
-from ..common_classes_damask_monitor.stop_conditions.yielding.modulus_degradation import modulus_degradation_post_process
-from ..common_classes_damask_monitor.stop_conditions.yielding.plastic_work import plastic_work_post_process
-from ..common_classes_damask_monitor.stop_conditions.yielding.stress_strain_curve_plasticity import slope_stress_strain_curve_post_process
+from ..common_classes_damask_monitor.stop_conditions.yielding.modulus_degradation import modulus_degradation_post_process, modulus_degradation_yield_point
+from ..common_classes_damask_monitor.stop_conditions.yielding.plastic_work import plastic_work_post_process, plastic_work_yield_point
+from ..common_classes_damask_monitor.stop_conditions.yielding.stress_strain_curve_plasticity import slope_stress_strain_curve_post_process, slope_stress_strain_curve_yield_point
 from .load_path.load_path_post_processor import load_path_post_process
 from .interpolate_results import InterpolatedResults
-from .store_result_to_database import store_result_to_database
+from .increment_history import read_increment_history
+from .store_result_to_database import store_result_to_database, store_tracked_yield_points_to_database
+from .curve_store import store_curve
+from ...common_functions.result_cache import store_cached_result
 
 
 def yield_point_post_processing(
@@ -30,6 +35,28 @@ def yield_point_post_processing(
 
     return interpolated_results
 
+def tracked_yield_points(
+        problem_definition: ProblemDefinition, 
+        damask_job: DamaskJob.YieldPointMultiaxial) -> dict[str, NDArray[np.float64] | None]:
+    # The yield point (stress) of every tracked yield condition (track_all_yield_conditions), None if it did not yield.
+    # The increment history is shared with the yield point post processing of the job.
+    increment_history = read_increment_history(problem_definition, damask_job, "[Post process] ")
+    interpolation_method = getattr(problem_definition.yielding_condition, "yield_interpolation", "linear")
+
+    yield_points: dict[str, NDArray[np.float64] | None] = dict()
+    for (yield_condition, yield_value) in damask_job.stop_condition.tracked_conditions.items():
+        match yield_condition:
+            case 'modulus_degradation':
+                interpolated_results = modulus_degradation_yield_point(yield_value, increment_history, interpolation_method)
+            case 'stress_strain_curve':
+                interpolated_results = slope_stress_strain_curve_yield_point(yield_value, damask_job.loaded_directions[0], increment_history, interpolation_method, getattr(damask_job,"existing_incs",0))
+            case 'plastic_work':
+                interpolated_results = plastic_work_yield_point(yield_value, increment_history, interpolation_method)
+            case _:
+                raise Exception(f"Yield point post processing of damask results not yet implemented for {yield_condition}")
+        yield_points[yield_condition] = None if interpolated_results is None else interpolated_results.stress
+    return yield_points
+
 def load_path_post_processing(
         problem_definition: ProblemDefinition, 
         damask_job: DamaskJob.LoadPath) -> bool:
@@ -82,17 +109,45 @@ def run_post_processing_job(
             else:
                 post_process_succeeded = True
                 value_to_store = interpolated_result.stress
+                damask_job.yield_stress = interpolated_result.stress
             store_result_to_database(problem_definition, damask_job.simulation_type, damask_job.field_name, value_to_store)
+
+            # Store the results of equivalent jobs that were not run: stress = Q * stress * Q^T
+            for (equivalent_field_name, symmetry_operation) in damask_job.equivalent_results:
+                if interpolated_result is None:
+                    equivalent_value_to_store = value_to_store
+                else:
+                    Q = np.array(symmetry_operation)
+                    equivalent_value_to_store = Q @ np.array(interpolated_result.stress) @ Q.T
+                store_result_to_database(problem_definition, damask_job.simulation_type, equivalent_field_name, equivalent_value_to_store)
+
+            # Store the homogenized curve, so yield points for other yield values can be found without running again (see curve_store.py)
+            increment_history = read_increment_history(problem_definition, damask_job, "[Post process] ")
+            store_curve(problem_definition, damask_job, increment_history)
+            for (equivalent_field_name, symmetry_operation) in damask_job.equivalent_results:
+                store_curve(problem_definition, damask_job, increment_history, equivalent_field_name, symmetry_operation)
+
+            # The yield point and curve are shared with other projects through the result cache, see result_cache.py
+            store_cached_result(problem_definition, damask_job, value_to_store)
+
+            # With track_all_yield_conditions, the yield points of all yield conditions are stored as well.
+            tracked_conditions = getattr(damask_job.stop_condition, "tracked_conditions", dict())
+            if len(tracked_conditions) > 1:
+                yield_points = tracked_yield_points(problem_definition, damask_job)
+                no_yield_detected = [["NO_YIELD_DETECTED"] * 3 for _ in range(3)]
+                store_tracked_yield_points_to_database(problem_definition, damask_job.simulation_type, damask_job.field_name, tracked_conditions,
+                    {yield_condition: no_yield_detected if stress is None else stress for (yield_condition, stress) in yield_points.items()})
+                for (equivalent_field_name, symmetry_operation) in damask_job.equivalent_results:
+                    Q = np.array(symmetry_operation)
+                    store_tracked_yield_points_to_database(problem_definition, damask_job.simulation_type, equivalent_field_name, tracked_conditions,
+                        {yield_condition: no_yield_detected if stress is None else Q @ np.array(stress) @ Q.T for (yield_condition, stress) in yield_points.items()})
             
             if problem_definition.general.simulation_type == "yield_point":
                 load_path_post_process(problem_definition, damask_job, interpolated_result)
 
         case DamaskJob.ElasticTensor():
             # elastic_tensor jobs store the stress and strains at the strain step.
-            value_to_store = dict()
-            value_to_store["stress"] = list()
-            value_to_store["strain"] = list()
-
+            # When all directions were run in a single DAMASK_grid run, the increments are split per direction.
             damask_results       = damask.Result(damask_job.runtime.damask_result_file)
 
             stress_tensor_type = problem_definition.general.stress_tensor_type
@@ -101,10 +156,16 @@ def run_post_processing_job(
             (damask_results, stress_averaged_per_increment) = damask_helper.get_averaged_stress_per_increment(damask_results, stress_tensor_type)
             (damask_results, strain_averaged_per_increment) = damask_helper.get_averaged_strain_per_increment(damask_results, strain_tensor_type)
 
-            value_to_store['stress'] = stress_averaged_per_increment[-1].tolist()
-            value_to_store['strain'] = strain_averaged_per_increment[-1].tolist()
+            increments_per_load_step = problem_definition.solver.N_increments
 
-            store_result_to_database(problem_definition, damask_job.simulation_type, damask_job.field_name, value_to_store)
+            for direction, load_step_number in zip(damask_job.directions, damask_job.loaded_load_step_numbers()):
+                loaded_increment = (load_step_number + 1) * increments_per_load_step
+
+                value_to_store = dict()
+                value_to_store['stress'] = stress_averaged_per_increment[loaded_increment].tolist()
+                value_to_store['strain'] = strain_averaged_per_increment[loaded_increment].tolist()
+
+                store_result_to_database(problem_definition, damask_job.simulation_type, direction, value_to_store)
 
             post_process_succeeded = True
         case _: # type: ignore
@@ -0,0 +1,240 @@
+# System packages
+import os
+import time
+import threading
+import traceback
+import numpy as np
+from numpy.typing import NDArray
+from matplotlib.figure import Figure
+from matplotlib.text import Text
+from matplotlib.lines import Line2D
+from matplotlib.ticker import MaxNLocator
+from matplotlib.ticker import ScalarFormatter
+
+# Local packages
+from ...common_classes.problem_definition import ProblemDefinition
+from ...common_classes.damask_job import DamaskJobTypes
+from ...common_classes.figure_style import FigureStyle
+from ..common_classes_damask_monitor.increment_data import IncrementData
+from .plots import offset_line, deformation_energy_curve, normalized_modulus_curve
+
+# The live plots of the damask monitor (stress_strain_curve.png and modulus_degradation.png in the results folder of the job).
+# - The plots are drawn by a background thread, the monitor only hands over the newest stresses and strains.
+# - A job is redrawn at most once every solver.live_plot_interval seconds, increments in between are drawn together.
+# - The figures are created once per job. For a new increment only the data of the lines is replaced.
+# - The figures do not use pyplot (which is not thread safe), they are rendered with the Agg backend directly.
+# - With solver.live_plots: False (i.e. headless batch runs) no live plots are made at all.
+# The plots made in the post-processing (with the interpolated yield point) are not affected.
+
+live_plot_dpi = 100
+Pa_unit   = 1e6
+min_const = 1e6
+
+class LivePlot:
+    # The figures and lines of the live plots of one job, created at the first draw.
+    interval: float
+    figures_created: bool
+
+    def __init__(self, problem_definition: ProblemDefinition, damask_job: DamaskJobTypes):
+        self.problem_definition = problem_definition
+        self.damask_job = damask_job
+        self.interval = getattr(problem_definition.solver, "live_plot_interval", 10.)
+        self.stress_strain_plot_path = os.path.join(damask_job.runtime.results_folder, 'stress_strain_curve.png')
+        self.modulus_degradation_plot_path = os.path.join(damask_job.runtime.results_folder, 'modulus_degradation.png')
+        self.figures_created = False
+
+    def create_stress_strain_figure(self) -> None:
+        style = FigureStyle(linewidth=3,
+                            markersize=12,
+                            markeredgewidth = 2,
+                            fontsize=20)
+        subplot_titles = np.array([
+            ["x-x", "x-y", "x-z"],
+            ["y-x", "y-y", "y-z"],
+            ["z-x", "z-y", "z-z"]
+            ])
+
+        self.stress_strain_figure = Figure(layout='constrained', figsize=(20, 20))
+        subplot = self.stress_strain_figure.subplots(3,3) # type: ignore
+        self.stress_strain_lines: dict[tuple[int, int], tuple[Line2D, Line2D | None]] = dict()
+        for i in range(3):
+            for j in range(3):
+                (stress_line,) = subplot[i][j].plot([], [], '--',
+                                   marker='x',
+                                   linewidth=style.lw,
+                                   markersize=style.ms,
+                                   markeredgewidth = style.mew,
+                                   label='homogonized stress',
+                                   zorder=2)
+
+                formatter = ScalarFormatter(useMathText=True)
+                if self.damask_job.loaded_directions[0][i][j]:
+                    (yield_line,) = subplot[i][j].plot([], [], 'r--', linewidth = style.lw, label='offset', zorder=1)
+                    formatter.set_powerlimits((-2, -2))  # lock exponent to −2
+                    subplot[i][j].xaxis.set_major_formatter(formatter)
+                    subplot[i][j].ticklabel_format(axis='x', style='sci')
+                else:
+                    yield_line = None
+                    subplot[i][j].xaxis.set_major_formatter(formatter)
+                    subplot[i][j].ticklabel_format(axis='x', style='sci', scilimits=(-2, 2))
+
+                subplot[i][j].grid()
+                subplot[i][j].xaxis.set_major_locator(MaxNLocator(nbins=6))
+                subplot[i][j].set_xlabel('strain [-]')
+                subplot[i][j].set_ylabel('stress [MPa]')
+                subplot[i][j].set_title(subplot_titles[i][j])
+                self.stress_strain_lines[(i, j)] = (stress_line, yield_line)
+
+        self.stress_strain_figure.suptitle('Stress strain curves', fontsize='xx-large') # type: ignore
+        for text in self.stress_strain_figure.findobj(match=Text):
+            text.set_fontsize(style.fs) # type: ignore
+
+    def create_modulus_degradation_figure(self) -> None:
+        self.modulus_degradation_figure = Figure(layout='constrained', figsize=(12.4, 6.2))
+        ax = self.modulus_degradation_figure.subplots(1,2) # type: ignore
+
+        (self.energy_line,) = ax[0].plot([], [], '--', marker='x', markersize=8, label='Deformation energy')
+        (self.energy_linear_line,) = ax[0].plot([], [], 'r--', label='Linear deformation energy')
+        ax[0].title.set_text('Linear deformation energy (E =  k * |strain|^2) -> E')
+        ax[0].legend()
+        ax[0].set_xlabel("|strain| [-]")
+        ax[0].set_ylabel("Deformation energy [MPa]")
+        ax[0].grid()
+
+        (self.modulus_line,) = ax[1].plot([], [], '--', marker='x', markersize=8, label="Normalized deformation stiffness")
+        (self.condition_plus_line,) = ax[1].plot([], [], '--r', label="0.2% offset")
+        (self.condition_min_line,) = ax[1].plot([], [], '--r')
+        ax[1].title.set_text('Normalized spring stiffness (E = k * |strain|^2) -> k / k_0')
+        ax[1].legend()
+        ax[1].set_xlabel("|strain| [-]")
+        ax[1].set_ylabel("Normalized linear spring stiffness [-]")
+        ax[1].grid()
+
+        self.modulus_degradation_figure.suptitle('Modulus degradation') # type: ignore
+
+    def draw_stress_strain_curves(self, stress_per_increment: NDArray[np.float64], strain_per_increment: NDArray[np.float64]) -> None:
+        for ((i, j), (stress_line, yield_line)) in self.stress_strain_lines.items():
+            stress_values = stress_per_increment[:, i, j]
+            stress_line.set_data(strain_per_increment[:, i, j], stress_values / Pa_unit)
+
+            # Rescale to the stress strain curve only, the offset line is fitted in afterwards.
+            subplot = stress_line.axes
+            if yield_line is not None:
+                yield_line.set_visible(False)
+            subplot.relim(visible_only=True) # type: ignore
+            subplot.autoscale_view() # type: ignore
+            if np.max(abs(stress_values)) < min_const:
+                subplot.set_ylim(-min_const/Pa_unit, min_const/Pa_unit, auto=None) # type: ignore
+
+            if yield_line is not None:
+                (strains_plot, stress_plot) = offset_line(stress_per_increment/Pa_unit, strain_per_increment, i, j, subplot.get_xlim(), self.problem_definition, self.damask_job, monitor=True) # type: ignore
+                yield_line.set_data(strains_plot, stress_plot)
+                yield_line.set_visible(True)
+
+        self.stress_strain_figure.savefig(self.stress_strain_plot_path, dpi=live_plot_dpi) # type: ignore
+
+    def draw_modulus_degradation(self, stress_per_increment: NDArray[np.float64], strain_per_increment: NDArray[np.float64]) -> None:
+        (abs_deformation, elastic_energy_per_increment) = deformation_energy_curve(stress_per_increment, strain_per_increment)
+        (_, modulus_normalized, energy_linear) = normalized_modulus_curve(stress_per_increment, strain_per_increment)
+        modulus_degradation_percentage = self.problem_definition.yielding_condition.modulus_degradation_percentage
+
+        self.energy_line.set_data(abs_deformation, elastic_energy_per_increment)
+        self.energy_linear_line.set_data(abs_deformation, energy_linear)
+        self.modulus_line.set_data(abs_deformation, modulus_normalized)
+        self.condition_plus_line.set_data(abs_deformation, np.repeat([1+modulus_degradation_percentage], len(abs_deformation)))
+        self.condition_min_line.set_data(abs_deformation, np.repeat([1-modulus_degradation_percentage], len(abs_deformation)))
+
+        for ax in self.modulus_degradation_figure.axes:
+            ax.relim()
+            ax.autoscale_view()
+
+        self.modulus_degradation_figure.savefig(self.modulus_degradation_plot_path, dpi=live_plot_dpi) # type: ignore
+
+    def draw(self, stress_per_increment: NDArray[np.float64], strain_per_increment: NDArray[np.float64]) -> None:
+        if not self.figures_created:
+            self.create_stress_strain_figure()
+            self.create_modulus_degradation_figure()
+            self.figures_created = True
+        self.draw_modulus_degradation(stress_per_increment, strain_per_increment)
+        self.draw_stress_strain_curves(stress_per_increment, strain_per_increment)
+
+class LivePlotWorker:
+    # A single background thread draws the live plots of all jobs, the newest increment of a job replaces older ones.
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.live_plots: dict[int, LivePlot] = dict()
+        self.pending: dict[int, tuple[NDArray[np.float64], NDArray[np.float64]]] = dict()
+        self.last_drawn: dict[int, float] = dict()
+        self.drawing: set[int] = set()
+        self.finishing: set[int] = set()
+        self.thread: threading.Thread | None = None
+
+    def submit(self, problem_definition: ProblemDefinition, damask_job: DamaskJobTypes, increment_data: IncrementData) -> None:
+        job_key = id(damask_job)
+        with self.condition:
+            if not job_key in self.live_plots:
+                self.live_plots[job_key] = LivePlot(problem_definition, damask_job)
+            # increment_data replaces (not modifies) its arrays for a new increment, so these can be drawn later on.
+            self.pending[job_key] = (increment_data.stress_averaged_per_increment, increment_data.strain_averaged_per_increment)
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name='live_plots', daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def next_job_to_draw(self) -> tuple[int | None, float | None]:
+        # Returns the job that is due for a redraw, or the time to wait for the next one.
+        now = time.monotonic()
+        wait_time: float | None = None
+        for job_key in self.pending:
+            time_to_redraw = self.last_drawn.get(job_key, -np.inf) + self.live_plots[job_key].interval - now
+            if time_to_redraw <= 0 or job_key in self.finishing:
+                return job_key, None
+            wait_time = time_to_redraw if wait_time is None else min(wait_time, time_to_redraw)
+        return None, wait_time
+
+    def run(self) -> None:
+        while True:
+            with self.condition:
+                (job_key, wait_time) = self.next_job_to_draw()
+                while job_key is None:
+                    self.condition.wait(wait_time)
+                    (job_key, wait_time) = self.next_job_to_draw()
+                (stress_per_increment, strain_per_increment) = self.pending.pop(job_key)
+                live_plot = self.live_plots[job_key]
+                self.drawing.add(job_key)
+
+            try:
+                live_plot.draw(stress_per_increment, strain_per_increment)
+            except Exception:
+                # The live plots are for information only, never stop the simulation for them.
+                print(f"Updating the live plots of job {live_plot.damask_job.field_name} failed:")
+                print(traceback.format_exc())
+
+            with self.condition:
+                self.last_drawn[job_key] = time.monotonic()
+                self.drawing.discard(job_key)
+                self.condition.notify_all()
+
+    def finish(self, damask_job: DamaskJobTypes) -> None:
+        # Draws the newest increment of the job (if not yet drawn) and releases its figures.
+        job_key = id(damask_job)
+        with self.condition:
+            if not job_key in self.live_plots:
+                return
+            self.finishing.add(job_key)
+            self.condition.notify_all()
+            while job_key in self.pending or job_key in self.drawing:
+                self.condition.wait()
+            self.finishing.discard(job_key)
+            self.live_plots.pop(job_key)
+            self.last_drawn.pop(job_key, None)
+
+live_plot_worker = LivePlotWorker()
+
+def update_live_plots(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes, increment_data: IncrementData) -> None:
+    if not getattr(problem_definition.solver, "live_plots", True):
+        return
+    live_plot_worker.submit(problem_definition, damask_job, increment_data)
+
+def finish_live_plots(damask_job: DamaskJobTypes) -> None:
+    live_plot_worker.finish(damask_job)
@@ -1,5 +1,4 @@
 # System packages
-import damask
 from numpy.typing import NDArray
 import numpy as np
 import os
@@ -12,12 +11,11 @@ from ....common_classes.problem_definition import ProblemDefinition
 from ....common_functions import damask_helper
 from ..plots import plot_modulus_degradation, plot_stress_strain_curves
 from ..interpolate_results import InterpolatedResults
+from ..increment_history import IncrementHistory, read_increment_history
 
 
 class LoadCaseResults:
-    damask_result: damask.Result
-    stress_per_material_point: NDArray[np.float64]
-    strain_per_material_point: NDArray[np.float64]
+    increment_history: IncrementHistory
     stress_homogonized: NDArray[np.float64]
     strain_homogonized: NDArray[np.float64]
     interpolated_yield_value: InterpolatedResults | None
@@ -26,27 +24,18 @@ class LoadCaseResults:
     def __init__(self, problem_definition: ProblemDefinition, damask_job: DamaskJob.LoadPath, results_path : str, interpolated_yield_value: InterpolatedResults | None = None):
         post_process_succeeded = True
 
-        damask_results_file = damask_job.runtime.damask_result_file
-
+        # The homogenized stresses, strains and Wp tracked by the monitor, see increment_history.py
         try: 
-            damask_result: damask.Result = damask.Result(damask_results_file)
+            increment_history = read_increment_history(problem_definition, damask_job)
         except Exception:
             post_process_succeeded = False
             print("[ERROR] Error occurred during reading the damask .hdf5 file for the load path post processing!")
             self.processed_succesfully = post_process_succeeded
             return
 
-        stress_tensor_type = problem_definition.general.stress_tensor_type
-        strain_tensor_type = problem_definition.general.strain_tensor_type
-
-        # Calculate homogonized strain
-        damask_result, strain_per_material_point = damask_helper.get_strain(damask_result, strain_tensor_type)
-        damask_result, strain_homogonized = damask_helper.get_averaged_strain_per_increment(damask_result, strain_tensor_type)
-
-        # Calculate homogonized stress
-        damask_result, stress_per_material_point = damask_helper.get_stress(damask_result, stress_tensor_type)
-        damask_result, stress_homogonized = damask_helper.get_averaged_stress_per_increment(damask_result, stress_tensor_type)
-        damask_result, Wp_per_increment = damask_helper.get_Wp_per_increment(damask_result)
+        strain_homogonized = increment_history.strain_averaged_per_increment
+        stress_homogonized = increment_history.stress_averaged_per_increment
+        Wp_per_increment = increment_history.Wp_per_increment
 
         # find yield and interpolate.
         #interpolated_results = None
@@ -120,13 +109,10 @@ class LoadCaseResults:
             writer.writeheader()
             writer.writerows(increment_list)
                             
-        self.stress_per_material_point = stress_per_material_point
-        self.strain_per_material_point = strain_per_material_point
-
         self.stress_homogonized = stress_homogonized
         self.strain_homogonized = strain_homogonized
 
-        self.damask_result = damask_result
+        self.increment_history = increment_history
 
         self.processed_succesfully = post_process_succeeded
 
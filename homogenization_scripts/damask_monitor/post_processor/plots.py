@@ -142,7 +142,24 @@ def stress_strain_curves_plastic_yield_lines( # type: ignore
 
     if not(direction_is_loaded):
         return subplot  # type: ignore
-    
+
+    strain_lim_plot: NDArray[np.float64] = subplot.get_xlim() # type: ignore
+    (strains_plot, stress_plot) = offset_line(stress_piola_kirchoff_per_increment, strain_green_lagrange_per_increment, i, j, strain_lim_plot, problem_definition, damask_job, monitor)
+
+    subplot.plot(strains_plot, stress_plot, 'r--', scalex=False, scaley=False, linewidth = style.lw, label='offset', zorder=1) # type: ignore
+    subplot.legend() # type: ignore
+
+    return subplot # type: ignore
+
+def offset_line(
+        stress_piola_kirchoff_per_increment: NDArray[np.float64], 
+        strain_green_lagrange_per_increment: NDArray[np.float64], 
+        i: int, j: int, 
+        strain_lim_plot: NDArray[np.float64],
+        problem_definition: ProblemDefinition, 
+        damask_job: DamaskJobTypes,
+        monitor: bool = False) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    # The offset line: the slope of the first (elastic) increment, shifted by the plastic strain at yield.
 
     if getattr(damask_job,"existing_incs",False) and monitor and len(stress_piola_kirchoff_per_increment)>2:
         stress_difference_1st: np.float64 = stress_piola_kirchoff_per_increment[2][i][j] - stress_piola_kirchoff_per_increment[1][i][j]
@@ -156,7 +173,6 @@ def stress_strain_curves_plastic_yield_lines( # type: ignore
     
     slope_stress_strain_1st: np.float64 = stress_difference_1st / strain_difference_1st
 
-    strain_lim_plot: NDArray[np.float64] = subplot.get_xlim() # type: ignore
     strain_max_magnitude: np.float64 = max([strain_lim_plot[0], strain_lim_plot[1]], key=abs) # type: ignore
 
     sign_slope = 1
@@ -174,10 +190,7 @@ def stress_strain_curves_plastic_yield_lines( # type: ignore
 
     stress_plot = stress_line(strains_plot, slope_stress_strain_1st)
 
-    subplot.plot(strains_plot, stress_plot, 'r--', scalex=False, scaley=False, linewidth = style.lw, label='offset', zorder=1) # type: ignore
-    subplot.legend() # type: ignore
-
-    return subplot # type: ignore
+    return strains_plot, stress_plot # type: ignore
 
 
 def plot_stress_strain_curves_monitor(problem_definition: ProblemDefinition,
@@ -211,15 +224,7 @@ def plot_modulus_degradation(
     if plot_title is None:
         plot_title = 'Modulus degradation'
 
-    elastic_energy_per_increment: list[float] = []
-    
-    abs_deformation: list[float] = []
-    for increment in range(np.shape(stress_per_increment)[0]):
-        abs_deformation.append(float(np.linalg.norm(strain_per_increment[increment])))
-        elastic_energy = damask_helper.calculate_linear_deformatation_energy(stress_per_increment[increment], strain_per_increment[increment])
-
-        elastic_energy_per_increment.append(float(np.squeeze(elastic_energy)))    
-
+    (abs_deformation, elastic_energy_per_increment) = deformation_energy_curve(stress_per_increment, strain_per_increment)
 
     fig = plt.figure(layout='constrained', figsize=(12.4, 6.2)) # type: ignore
     ax = fig.subplots(1,2) # type: ignore
@@ -233,16 +238,7 @@ def plot_modulus_degradation(
 
     if np.shape(abs_deformation)[0] > 0:
 
-        modulus_linear = damask_helper.calculate_linear_modulus(stress_per_increment[1], strain_per_increment[1])
-        modulus: list[float] = []
-        modulus_normalized: list[float] = [1]
-        energy_linear: list[float] = [0]
-        for i in range(1, len(abs_deformation)):
-            modulus_i = damask_helper.calculate_linear_modulus(stress_per_increment[i], strain_per_increment[i])
-            modulus.append(modulus_i)
-            modulus_normalized.append(modulus_i / modulus_linear)
-            strain_vector = damask_helper.strain_tensor_to_vector_notation(strain_per_increment[i])
-            energy_linear.append( modulus_linear * float(np.linalg.norm(strain_vector)**2))
+        (modulus_linear, modulus_normalized, energy_linear) = normalized_modulus_curve(stress_per_increment, strain_per_increment)
 
         linear_elastic_deformation_condition_plus = np.repeat([1+problem_definition.yielding_condition.modulus_degradation_percentage], len(abs_deformation))
         linear_elastic_deformation_condition_min = np.repeat([1-problem_definition.yielding_condition.modulus_degradation_percentage], len(abs_deformation))
@@ -274,6 +270,38 @@ def plot_modulus_degradation(
     plt.close(fig)
 
 
+def deformation_energy_curve(
+        stress_per_increment: NDArray[np.float64], 
+        strain_per_increment: NDArray[np.float64]) -> tuple[list[float], list[float]]:
+    # |strain| and the linear deformation energy per increment.
+    elastic_energy_per_increment: list[float] = []
+    
+    abs_deformation: list[float] = []
+    for increment in range(np.shape(stress_per_increment)[0]):
+        abs_deformation.append(float(np.linalg.norm(strain_per_increment[increment])))
+        elastic_energy = damask_helper.calculate_linear_deformatation_energy(stress_per_increment[increment], strain_per_increment[increment])
+
+        elastic_energy_per_increment.append(float(np.squeeze(elastic_energy)))    
+
+    return abs_deformation, elastic_energy_per_increment
+
+def normalized_modulus_curve(
+        stress_per_increment: NDArray[np.float64], 
+        strain_per_increment: NDArray[np.float64]) -> tuple[float, list[float], list[float]]:
+    # The linear spring stiffness of the first increment and, per increment, the stiffness normalized to it 
+    # and the deformation energy if the response had stayed linear.
+    modulus_linear = damask_helper.calculate_linear_modulus(stress_per_increment[1], strain_per_increment[1])
+    modulus: list[float] = []
+    modulus_normalized: list[float] = [1]
+    energy_linear: list[float] = [0]
+    for i in range(1, np.shape(stress_per_increment)[0]):
+        modulus_i = damask_helper.calculate_linear_modulus(stress_per_increment[i], strain_per_increment[i])
+        modulus.append(modulus_i)
+        modulus_normalized.append(modulus_i / modulus_linear)
+        strain_vector = damask_helper.strain_tensor_to_vector_notation(strain_per_increment[i])
+        energy_linear.append( modulus_linear * float(np.linalg.norm(strain_vector)**2))
+    return modulus_linear, modulus_normalized, energy_linear
+
 def plot_modulus_degradation_monitor(problem_definition: ProblemDefinition,
         damask_job: DamaskJobTypes, 
         increment_data: IncrementData, 
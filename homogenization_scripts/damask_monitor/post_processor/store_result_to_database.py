@@ -6,6 +6,7 @@ import numpy as np
 from numpy.typing import NDArray
 # Local packages
 from ...common_classes.problem_definition import ProblemDefinition
+from ...common_functions.input_fingerprint import input_fingerprints
 
 def store_general_settings(
         problem_definition: ProblemDefinition, 
@@ -19,6 +20,8 @@ def store_general_settings(
     # results_database['general_settings']['grain_orientation'] = problem_definition.general.path.grain_orientation
     results_database['general_settings']['stress_tensor_type'] = problem_definition.general.stress_tensor_type.str()
     results_database['general_settings']['strain_tensor_type'] = problem_definition.general.strain_tensor_type.str()
+    # The content of the input files, see input_fingerprint.py
+    results_database['general_settings']['input_fingerprints'] = input_fingerprints(problem_definition)
 
     return results_database
 
@@ -134,3 +137,34 @@ def store_result_to_database(problem_definition: ProblemDefinition, simulation_t
     
     with open(result_database_file, 'w') as results_database_writer:
         yaml.dump(results_database, results_database_writer)
+
+def store_tracked_yield_points_to_database(
+        problem_definition: ProblemDefinition, 
+        simulation_type: str, 
+        field_name: str, 
+        tracked_conditions: dict[str, float], 
+        yield_points: dict[str, NDArray[np.float64] | list[list[str]]]):
+    # With track_all_yield_conditions, the yield point of every yield condition is kept in a separate section:
+    #   yield_points_per_condition: simulation_type: tracked_yield_conditions: {condition: yield value}
+    #                                                yield_points: field_name: {condition: stress}
+    # The yield condition can then be changed without running the simulations again, see tracked_yield_conditions.py
+    result_database_file = problem_definition.general.path.results_database_file
+
+    if os.path.exists(result_database_file):
+        with open(result_database_file, 'r') as results_database_reader:
+            results_database = yaml.safe_load(results_database_reader) or {}
+    else:
+        results_database = {}
+
+    yield_points_per_condition = results_database.setdefault('yield_points_per_condition', dict())
+    tracked_yield_points = yield_points_per_condition.get(simulation_type, dict())
+    # Yield points found with other yield values are no longer valid.
+    if not tracked_yield_points.get('tracked_yield_conditions') == tracked_conditions:
+        tracked_yield_points = {'tracked_yield_conditions': dict(tracked_conditions), 'yield_points': dict()}
+    tracked_yield_points['yield_points'][field_name] = {
+        yield_condition: yield_point.tolist() if isinstance(yield_point, np.ndarray) else yield_point
+        for (yield_condition, yield_point) in yield_points.items()}
+    yield_points_per_condition[simulation_type] = tracked_yield_points
+
+    with open(result_database_file, 'w') as results_database_writer:
+        yaml.dump(results_database, results_database_writer)
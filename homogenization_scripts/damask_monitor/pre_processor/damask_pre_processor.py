@@ -88,7 +88,9 @@ def pre_process_damask_files(
 
     ########
     # damask preporcessing: Prepare and move the simulation files to the right location.
-    if not iteration_mode and not problem_definition.general.path.postprocessing_only:
+    # Jobs that are resumed from the campaign journal keep the files of the interrupted run.
+    keep_damask_files = getattr(damask_job, "keep_damask_files", False)
+    if not iteration_mode and not problem_definition.general.path.postprocessing_only and not keep_damask_files:
         PrepareFile.make_sure_work_folders_are_empty(problem_definition, damask_job) # type: ignore
     (problem_definition, damask_job) = PrepareFile.material_properties_and_orientation_file(problem_definition, damask_job) # type: ignore
     (problem_definition, damask_job) = PrepareFile.grid_and_dimensions_file(problem_definition, damask_job) # type: ignore
@@ -0,0 +1,80 @@
+# System packages
+import os
+import glob
+import shutil
+import hashlib
+import threading
+import damask # type: ignore
+import numpy as np
+from numpy.typing import NDArray
+
+# Local packages
+from ...common_classes.problem_definition import ProblemDefinition
+from ...common_functions.input_fingerprint import file_hash
+
+# A grid from MTEX (.txt, grain IDs) with its dimensions file is converted to a DAMASK grid (.vti) once, not for every job.
+# The converted grid is kept in the grid_cache folder of the damask files folder of the run (general.path.damask_files_folder),
+# named by a hash of the content of the .txt and dimensions files, so an edited grid is converted again:
+#   [damask_files_folder]/grid_cache/GRID_[hash].vti
+# Every job links this grid into its own damask_files folder as GRID.vti (hard link, the cached path when linking fails).
+# Converted grids of an earlier version of the grid are removed when the grid is converted again. With
+# general.remove_damask_files_after_job_completion the grid cache is removed once all jobs have run.
+# The parallel monitor prepares jobs from several threads, conversion_lock makes sure a grid is only converted once.
+
+conversion_lock = threading.Lock()
+
+def grid_cache_folder(problem_definition: ProblemDefinition) -> str:
+    return os.path.join(problem_definition.general.path.damask_files_folder, 'grid_cache')
+
+def remove_stale_grids(cached_grid_file: str) -> None:
+    # Jobs that linked a stale grid keep their own hard link, only the cache entry is removed.
+    for stale_grid_file in glob.glob(os.path.join(os.path.dirname(cached_grid_file), "GRID_*.vti")):
+        if not stale_grid_file == cached_grid_file:
+            os.remove(stale_grid_file)
+
+def remove_grid_cache(problem_definition: ProblemDefinition) -> None:
+    if os.path.isdir(grid_cache_folder(problem_definition)):
+        shutil.rmtree(grid_cache_folder(problem_definition))
+
+def read_mtex_grid(grid_file: str) -> NDArray[np.int64]:
+    # np.loadtxt has a C parser since numpy 1.23, for large grids it is faster than pandas.read_csv and np.fromfile.
+    return np.loadtxt(grid_file, delimiter=',').astype(int)
+
+def convert_mtex_grid(grid_file: str, dimensions_file: str, converted_grid_file: str) -> None:
+    grid = read_mtex_grid(grid_file)
+    grid = grid-1                     # required because of mismatch in MTEX and DAMASK counting convention
+    grid = grid[..., np.newaxis]      #  M x N -> M x N x 1 dimension
+
+    [xmin,xmax,ymin,ymax,dx,_] = np.loadtxt(dimensions_file,delimiter=',')
+    physical_dimensions = 1e-3*np.array([xmax-xmin,ymax-ymin,dx])
+    g = damask.GeomGrid(grid, physical_dimensions)
+
+    # Saved under a temporary name first, so a grid that is half written is never used.
+    temporary_grid_file = f"{os.path.splitext(converted_grid_file)[0]}.{os.getpid()}.tmp.vti"
+    g.save(temporary_grid_file)
+    os.replace(temporary_grid_file, converted_grid_file)
+
+def converted_grid_file(problem_definition: ProblemDefinition) -> str:
+    grid_file = problem_definition.general.path.grid_file
+    dimensions_file = problem_definition.general.path.dimensions_file
+    grid_key = hashlib.sha1(f"{file_hash(grid_file)};{file_hash(dimensions_file)}".encode()).hexdigest()[:16]
+    cached_grid_file = os.path.join(grid_cache_folder(problem_definition), f"GRID_{grid_key}.vti")
+    with conversion_lock:
+        if not os.path.isfile(cached_grid_file):
+            os.makedirs(os.path.dirname(cached_grid_file), exist_ok=True)
+            print(f"Converting the grid {grid_file} to {cached_grid_file}")
+            convert_mtex_grid(grid_file, dimensions_file, cached_grid_file)
+            remove_stale_grids(cached_grid_file)
+    return cached_grid_file
+
+def link_converted_grid(problem_definition: ProblemDefinition, damask_files_folder_job: str) -> str:
+    # Returns the grid file to pass to DAMASK_grid.
+    cached_grid_file = converted_grid_file(problem_definition)
+    job_grid_file = os.path.join(damask_files_folder_job, "GRID.vti")
+    if os.path.exists(job_grid_file):
+        os.remove(job_grid_file)
+    try:
+        os.link(cached_grid_file, job_grid_file)
+    except OSError:
+        return cached_grid_file
+    return job_grid_file
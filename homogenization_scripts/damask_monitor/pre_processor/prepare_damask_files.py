@@ -12,6 +12,7 @@ from pathlib import Path
 from ...common_classes.damask_job import DamaskJob, DamaskJobTypes
 from ...common_classes.problem_definition import ProblemDefinition
 import homogenization_scripts.common_functions.consolelog as consolelog
+from .grid_conversion_cache import link_converted_grid
 
 class PrepareFile:
 
@@ -138,27 +139,12 @@ class PrepareFile:
         # preparing variables
 
         grid_file = problem_definition.general.path.grid_file
-        dimensions_file = problem_definition.general.path.dimensions_file
 
         _, grid_file_extension = os.path.splitext(grid_file)
 
-        ## Read grain IDs from files created in MTEX, save grid as damask object
+        ## Grain IDs from files created in MTEX, converted once to a damask grid (see grid_conversion_cache.py)
         if grid_file_extension == '.txt':
-            grid_pth                    = grid_file
-            dimensions_pth              = dimensions_file
-
-            grid                        = np.loadtxt(grid_pth,delimiter=',').astype(int)
-            grid                        = grid-1                     # required because of mismatch in MTEX and DAMASK counting convention
-            grid                        = grid[..., np.newaxis]      #  M x N -> M x N x 1 dimension
-            cells                       = np.array(np.shape(grid)) # type: ignore
-
-            [xmin,xmax,ymin,ymax,dx,_] = np.loadtxt(dimensions_pth,delimiter=',')
-            physical_dimensions         = 1e-3*np.array([xmax-xmin,ymax-ymin,dx]) 
-            g                           = damask.GeomGrid(grid, physical_dimensions)
-            
-            grid_file_fixed = os.path.join(damask_job.runtime.damask_files, "GRID.vti" )
-
-            g.save(grid_file_fixed)
+            grid_file_fixed = link_converted_grid(problem_definition, damask_job.runtime.damask_files)
         else:
             grid_file_fixed = grid_file
         
@@ -4,26 +4,29 @@ import traceback
 import numpy as np
 import os
 import time
-import shutil
 import damask # type: ignore
 import datetime
 
 # Local packages
 from ..common_classes_damask_monitor.increment_data import IncrementData
+from ..common_classes_damask_monitor.result_file_handshake import ResultFileHandshake
+from ..common_classes_damask_monitor.monitor_profiler import MonitorProfiler
+from ..common_classes_damask_monitor.progress_feed import ProgressFeed
+from ..common_classes_damask_monitor.convergence_telemetry import ConvergenceTelemetry
 from ...common_classes.problem_definition import ProblemDefinition
 from ...common_classes.damask_job import DamaskJobTypes
 from ...common_classes.damask_job import StopCondition
 from ...common_functions import damask_helper
 
 from .error_handling import request_damask_grid_to_stop_or_force_it # type: ignore
+from .launcher import get_launcher, threads_per_rank
 from ...common_classes import messages
 
 from ..common_classes_damask_monitor.stop_conditions.yielding.stress_strain_curve_plasticity import slope_stress_strain_curve_monitor
 from ..common_classes_damask_monitor.stop_conditions.yielding.modulus_degradation import modulus_degradation_monitor
 from ..common_classes_damask_monitor.stop_conditions.yielding.plastic_work import plastic_work_monitor
 
-from ..post_processor.plots import plot_modulus_degradation_monitor
-from ..post_processor.plots import plot_stress_strain_curves_monitor
+from ..post_processor.live_plots import update_live_plots, finish_live_plots
 
 # class SolverSettings:
 #     def __init__(self, problem_definition, damask_job):
@@ -47,7 +50,8 @@ from ..post_processor.plots import plot_stress_strain_curves_monitor
 def create_launch_command(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes) -> tuple[list[str], dict[str, str]]:
 
 
-    executable = [f"DAMASK_grid"]
+    # The launcher can prefix DAMASK_grid, i.e. with an MPI runner.
+    executable = get_launcher(problem_definition).launch_prefix() + [f"DAMASK_grid"]
     grid = [f"--geom", f"{damask_job.runtime.grid_file}"]
     loadcase = [f"--load", f"{damask_job.runtime.loadcase_file}"]
     material = [f"--material", f"{damask_job.runtime.material_properties_file}"]
@@ -61,6 +65,10 @@ def create_launch_command(problem_definition: ProblemDefinition, damask_job: Dam
     if getattr(problem_definition.general.path,"restart_file_path",False):
         restart = [f"--restart", f"{damask_job.runtime.restart_file_incs-1}"]
         arguments = grid + loadcase + material + numerics + jobname + work_directory + restart
+    elif getattr(damask_job, "restart_increment", 0) > 0:
+        # Resume a job that was interrupted, see campaign_journal.py
+        restart = [f"--restart", f"{damask_job.restart_increment}"]
+        arguments = grid + loadcase + material + numerics + jobname + work_directory + restart
 
     # if damask_job.use_restart_file:
     #     restart = [f"--restart", f"{damask_job.use_restart_number}"]
@@ -68,7 +76,7 @@ def create_launch_command(problem_definition: ProblemDefinition, damask_job: Dam
 
     env = os.environ.copy()
     if not problem_definition.solver.cpu_cores == 0:
-        env["OMP_NUM_THREADS"] = f"{problem_definition.solver.cpu_cores}"
+        env["OMP_NUM_THREADS"] = f"{threads_per_rank(problem_definition)}"
 
     return launch_command + arguments, env
 
@@ -79,22 +87,21 @@ def check_if_damask_result_file_exists(damask_job: DamaskJobTypes, sleep_time: f
         normal_end_of_loop_messages_and_wait_untill_next_loop(sleep_time)
     return file_exists
 
-def result_file_is_updated(damask_job: DamaskJobTypes, increment_data: IncrementData) -> bool:
-    time_new_result_file_updated = os.path.getmtime(damask_job.runtime.damask_result_file)
-    time_last_result_file_updated = increment_data.last_file_timestamp
-    file_is_updated = time_new_result_file_updated > time_last_result_file_updated
+def result_file_is_updated(handshake: ResultFileHandshake, increment_data: IncrementData, profiler: MonitorProfiler) -> bool:
+    # The .sta file of DAMASK_grid tells if a new increment converged, see result_file_handshake.py
+    status_file_offset = handshake.status_file_offset
+    with profiler.phase('result_file_check'):
+        file_is_updated = handshake.new_increment_available(increment_data.increment_last_update)
+    profiler.count('status_file_bytes_read', max(handshake.status_file_offset - status_file_offset, 0))
     if not file_is_updated:
         messages.Status.intermediate_results_file_not_yet_updated(increment_data.sleep_time, increment_data.increment_last_update) # type: ignore
         normal_end_of_loop_messages_and_wait_untill_next_loop(increment_data.sleep_time)
-    else:
-        increment_data.last_file_timestamp = time_new_result_file_updated
     return file_is_updated
 
-def check_if_damask_is_writing_to_file(damask_job: DamaskJobTypes, sleep_time: float) -> bool:
-    damask_folder = os.path.dirname(damask_job.runtime.damask_result_file)
-    damask_files_folder_files = os.listdir(damask_folder)
-    is_lock_file = [".lock" in file_name and not "restart" in file_name for file_name in damask_files_folder_files]
-    if any(is_lock_file):
+def check_if_damask_is_writing_to_file(handshake: ResultFileHandshake, sleep_time: float, profiler: MonitorProfiler) -> bool:
+    with profiler.phase('result_file_check'):
+        result_file_is_complete = handshake.result_file_is_complete()
+    if not result_file_is_complete:
         print(f"DAMASK_grid is writing to a file.")
         is_currently_writing = True
         normal_end_of_loop_messages_and_wait_untill_next_loop(sleep_time)
@@ -113,19 +120,27 @@ def ended_loop_with_error_and_wait_untill_next_loop(sleep_time: float):
     messages.Status.end_of_this_loop()
     time.sleep(sleep_time)
 
-def copy_and_read_newest_damask_result_file(
+def read_newest_damask_result_file(
         problem_definition: ProblemDefinition,
         damask_job: DamaskJobTypes, 
         increment_data: IncrementData, 
-        damask_grid_process: subprocess.Popen # type: ignore
+        damask_grid_process: subprocess.Popen, # type: ignore
+        handshake: ResultFileHandshake,
+        profiler: MonitorProfiler
         ) -> tuple[damask.Result, IncrementData]:
     
-    shutil.copy2(damask_job.runtime.damask_result_file, damask_job.runtime.damask_temporary_result_file)
+    # The handshake guarantees the newest increment is completely written, the result file is copied and the copy is read.
     try:
-        damask_result_update = damask.Result(damask_job.runtime.damask_temporary_result_file)
+        with profiler.phase('result_file_copy'):
+            temporary_result_file = handshake.copy_result_file(damask_job.runtime.damask_temporary_result_file)
+        with profiler.phase('hdf5_open'):
+            damask_result_update = damask.Result(temporary_result_file)
+        handshake.mark_result_file_read()
+        profiler.count('result_file_bytes', os.path.getsize(damask_job.runtime.damask_result_file))
         increment_data.subsequent_parsing_errors = 0
     except Exception:
         damask_result_update = None
+        profiler.count('parse_errors')
         if increment_data.increment_last_update == -1:
             print("Damask is still in initial starting phase.")
             normal_end_of_loop_messages_and_wait_untill_next_loop(sleep_time=increment_data.sleep_time)
@@ -213,6 +228,7 @@ def calculate_domain_averaged_stress_and_strain(
     increment_data.add_increment_stress_tensor(stress_domain_averaged)
     increment_data.add_increment_strain_tensor(strain_domain_averaged)
     increment_data.add_increment_plastic_strain_tensor(plastic_strain_domain_averaged)
+    increment_data.analysed_increments.append(int(current_iteration))
 
     return increment_data
 
@@ -220,28 +236,18 @@ def calculate_slip_system_xi_gamma(
         updated_damask_results: damask.Result, 
         increment_data: IncrementData) -> IncrementData:
     
-    # This function calculates the homogonized stress and strain for the last iteration
+    # This function calculates the plastic work Wp up to the last iteration.
+    # Wp accumulates over the increments: only the increments since the previously analysed increment are read,
+    # their plastic work is added to the Wp of that increment.
 
     current_iteration = updated_damask_results.increments_in_range()[-1]
-
-    #damask_result_intermediate_pruned = updated_damask_results.view(increments=current_iteration)
-
-    # stress_tensor_type = increment_data.stress_tensor_type
-    # strain_tensor_type = increment_data.strain_tensor_type
+    previous_iteration = increment_data.analysed_increments[-2] if len(increment_data.analysed_increments) > 1 else 0
+    damask_results_since_previous = updated_damask_results.view(increments=updated_damask_results.increments_in_range(previous_iteration, current_iteration))
 
     display_prefix = "  "
 
-    (updated_damask_results, xi) = damask_helper.get_slip_system_xi(updated_damask_results, display_prefix=display_prefix)
-    (updated_damask_results, gamma) = damask_helper.get_slip_system_gamma(updated_damask_results, display_prefix=display_prefix)
-
-    N_matpoints = np.shape(gamma[0])[0]
-    #t = updated_damask_results.times
-    gamma_delta = np.zeros_like(gamma)
-    for e,inc in enumerate(updated_damask_results.increments):
-        if e>0:
-            gamma_delta[e,:,:] = (gamma[e,:,:]-gamma[e-1,:,:]) 
-            
-    Wp_sum = np.sum(gamma_delta * xi) / N_matpoints
+    (_, Wp_since_previous) = damask_helper.get_Wp_per_increment(damask_results_since_previous, display_prefix=display_prefix, xi_averaging=increment_data.xi_averaging)
+    Wp_sum = increment_data.Wp_per_increment[-1] + Wp_since_previous[-1]
     
     increment_data.add_increment_Wp(Wp_sum)
     return increment_data
@@ -263,6 +269,21 @@ def check_for_stop_conditions(
 
     return increment_data
 
+def yield_condition_monitor(
+        yield_condition: str,
+        damask_job: DamaskJobTypes, 
+        increment_data: IncrementData,
+        yield_value_condition: float | None = None) -> tuple[bool, float]:
+    match yield_condition:
+        case 'stress_strain_curve':
+            return slope_stress_strain_curve_monitor(damask_job, increment_data, yield_value_condition)
+        case 'modulus_degradation':
+            return modulus_degradation_monitor(damask_job, increment_data, yield_value_condition)
+        case 'plastic_work':
+            return plastic_work_monitor(damask_job, increment_data, yield_value_condition)
+        case _: 
+            raise Exception(f"The {damask_job.stop_condition} has not yet been implemented in the damask monitor")
+
 def yielding_conditions(
         damask_job: DamaskJobTypes, 
         increment_data: IncrementData) -> bool:
@@ -271,16 +292,20 @@ def yielding_conditions(
     yield_detected = False
     messages.Actions.starting_analysis()
     timer = datetime.datetime.now()
-    match damask_job.stop_condition.yield_condition:
-        case 'stress_strain_curve':
-            yield_detected, yield_value = slope_stress_strain_curve_monitor(damask_job, increment_data)
-        case 'modulus_degradation':
-            yield_detected, yield_value = modulus_degradation_monitor(damask_job, increment_data)
-        case 'plastic_work':
-            yield_detected, yield_value = plastic_work_monitor(damask_job, increment_data)
-        case _: 
-            raise Exception(f"The {damask_job.stop_condition} has not yet been implemented in the damask monitor")
-    
+    tracked_conditions = getattr(damask_job.stop_condition, "tracked_conditions", {damask_job.stop_condition.yield_condition: damask_job.stop_condition.yield_value})
+    if len(tracked_conditions) > 1:
+        # All yield conditions are tracked (track_all_yield_conditions): the job stops once the last of these detected yielding,
+        # so the result file contains the yield point of every condition.
+        for (yield_condition, yield_value_condition) in tracked_conditions.items():
+            if yield_condition in increment_data.yielded_conditions:
+                continue
+            (condition_yield_detected, yield_value) = yield_condition_monitor(yield_condition, damask_job, increment_data, yield_value_condition)
+            if condition_yield_detected:
+                increment_data.yielded_conditions[yield_condition] = increment_data.increment_last_update
+        yield_detected = len(increment_data.yielded_conditions) == len(tracked_conditions)
+        yield_value = f"{len(increment_data.yielded_conditions)} of {len(tracked_conditions)} yield conditions detected yielding ({', '.join(increment_data.yielded_conditions)})"
+    else:
+        (yield_detected, yield_value) = yield_condition_monitor(damask_job.stop_condition.yield_condition, damask_job, increment_data)
 
     runtime = datetime.datetime.now() - timer
     messages.Status.completed_duration(runtime)  # type: ignore
@@ -288,10 +313,41 @@ def yielding_conditions(
 
     return yield_detected
 
+def restore_increment_data_from_result_file(
+        damask_job: DamaskJobTypes,
+        increment_data: IncrementData,
+        restart_increment: int) -> IncrementData:
+    # When an interrupted job is resumed, the increments before the restart are not seen by the monitor.
+    # Rebuild the tracked stresses, strains and plastic work from the result file so the yield detection has the full history.
+    damask_results = damask.Result(damask_job.runtime.damask_result_file)
+    damask_results = damask_results.view(increments=damask_results.increments_in_range(0, restart_increment))
+
+    stress_tensor_type = increment_data.stress_tensor_type
+    strain_tensor_type = increment_data.strain_tensor_type
+
+    (damask_results, plastic_strain_per_increment) = damask_helper.get_averaged_plastic_strain_per_increment(damask_results, strain_tensor_type)
+    (damask_results, strain_per_increment) = damask_helper.get_averaged_strain_per_increment(damask_results, strain_tensor_type)
+    (damask_results, stress_per_increment) = damask_helper.get_averaged_stress_per_increment(damask_results, stress_tensor_type)
+    (damask_results, Wp_per_increment) = damask_helper.get_Wp_per_increment(damask_results, xi_averaging=increment_data.xi_averaging)
+
+    # The first visible increment is the initial (0) state, which is already present in increment_data.
+    for index, increment in enumerate(damask_results.increments_in_range(0, restart_increment)):
+        if index == 0:
+            continue
+        increment_data.add_increment_stress_tensor(stress_per_increment[index])
+        increment_data.add_increment_strain_tensor(strain_per_increment[index])
+        increment_data.add_increment_plastic_strain_tensor(plastic_strain_per_increment[index])
+        increment_data.add_increment_Wp(Wp_per_increment[index])
+        increment_data.tracked_increments.append(increment)
+        increment_data.analysed_increments.append(int(increment))
+
+    increment_data.increment_last_update = restart_increment
+    return increment_data
+
 def make_plots(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes, increment_data: IncrementData):
+    # The plots are drawn in the background (throttled), see live_plots.py
     if not increment_data.increment_last_update < 2:
-        plot_modulus_degradation_monitor(problem_definition, damask_job, increment_data)
-        plot_stress_strain_curves_monitor(problem_definition, damask_job, increment_data)
+        update_live_plots(problem_definition, damask_job, increment_data)
 
 def run_and_monitor_damask(
         problem_definition: ProblemDefinition, 
@@ -304,12 +360,22 @@ def run_and_monitor_damask(
     else: 
         increment_data = IncrementData(problem_definition)
         #increment_data.increment_last_update = damask_job.runtime.restart_file_incs-1
+        if getattr(damask_job, "restart_increment", 0) > 0:
+            increment_data = restore_increment_data_from_result_file(damask_job, increment_data, damask_job.restart_increment)
+
+    # Times the stages of the monitor loop (solver.monitor_profiling), see monitor_profiler.py
+    profiler = MonitorProfiler(problem_definition, damask_job)
+    # Compact progress of the job (results/progress), see progress_feed.py
+    progress_feed = ProgressFeed(problem_definition, damask_job)
+    progress_feed.job_started(damask_job)
+    # Iterations, cutbacks and residuals per increment from the log and .sta file, see convergence_telemetry.py
+    convergence_telemetry = ConvergenceTelemetry(problem_definition, damask_job.runtime.log_file, damask_job.runtime.damask_result_file)
     
     # print(launch_command)
-    with open(damask_job.runtime.log_file, 'a') as f:
-        # Run the command and redirect both stdout and stderr (console messages and errors) to the log file
-        damask_grid_process = subprocess.Popen(args=launch_command, env=env, text=True,
-                                shell=False, stdout=f, stderr=subprocess.STDOUT)
+    start_time = time.time()
+    # Start DAMASK_grid locally, with MPI or in a batch queue, see launcher.py
+    launcher = get_launcher(problem_definition)
+    damask_grid_process = launcher.start(launch_command, env, damask_job.runtime.log_file, damask_job.runtime.damask_files)
 
     # From this point on DAMASK_grid runs independantly from the python process.
     # If DAMASK_grid needs to be closed, this should be done explicitly, even when python encounters a problem.
@@ -334,6 +400,8 @@ def run_and_monitor_damask(
     #     total_iterations = total_iterations - 1 + problem_definition.solver.N_increments    
  
 
+    handshake = ResultFileHandshake(damask_job.runtime.damask_result_file)
+
     try:
         sleep_time = increment_data.sleep_time
 
@@ -342,6 +410,15 @@ def run_and_monitor_damask(
             iteration_number = increment_data.increment_last_update
             messages.Status.start_of_this_loop(job_number, total_jobs, iteration_number, total_iterations) # type: ignore
 
+            # Stop early when DAMASK_grid keeps cutting back (solver.stop_after_subsequent_cutbacks).
+            convergence_telemetry.update()
+            if convergence_telemetry.cutback_limit_reached():
+                messages.Warnings.repeated_cutbacks(convergence_telemetry.subsequent_cutbacks, convergence_telemetry.stop_after_subsequent_cutbacks) # type: ignore
+                request_damask_grid_to_stop_or_force_it(damask_grid_process, try_quick_shutdown=True, result_file=damask_job.runtime.damask_result_file)
+                increment_data.stop_condition_reached = True
+                increment_data.run_ended_succesfully = False
+                break
+
             # Check for the existance of the results .hdf5 file.
             damask_result_file_exists = check_if_damask_result_file_exists(damask_job, sleep_time)
             if not damask_result_file_exists:
@@ -349,26 +426,23 @@ def run_and_monitor_damask(
             
             messages.Status.intermediate_results_file_found()
 
-            # Check if the results file is altered by investigating the modification time indicated by the OS.
-            result_file_is_updated_since_last_check = result_file_is_updated(damask_job, increment_data)
+            # Check if DAMASK_grid reported a new converged increment (.sta file).
+            result_file_is_updated_since_last_check = result_file_is_updated(handshake, increment_data, profiler)
             if not result_file_is_updated_since_last_check:
                 continue
             
-            # DAMASK_grid presents a .lock file when the process is currently writing data to a file.
-            # Respecting this .lock to prevent reading a unfinished state which causes reading errors.
-            damask_is_writing_to_file = check_if_damask_is_writing_to_file(damask_job, sleep_time)
+            # Wait until the results of the increment are completely saved to the result file.
+            damask_is_writing_to_file = check_if_damask_is_writing_to_file(handshake, sleep_time, profiler)
             if damask_is_writing_to_file:
                 continue
 
             messages.Actions.starting_analysis_of_current_iteration()
 
-            # Copy the result file to a temporary file where alterations can be made and no new data will be 
-            # written to. 
-            # This process can fail if in the time between checking for the .lock file and now damask has 
-            # started writing to file. Stopping simulation if this happens too often in subsequent monitoring loops.
-            updated_results, increment_data = copy_and_read_newest_damask_result_file(
+            # Read the result file in place. Reading errors are not expected any more, but stop the simulation 
+            # if they happen too often in subsequent monitoring loops.
+            updated_results, increment_data = read_newest_damask_result_file(
                 problem_definition, damask_job,
-                increment_data, damask_grid_process)
+                increment_data, damask_grid_process, handshake, profiler)
             if not increment_data.run_ended_succesfully:
                 break
             elif updated_results == None: # type: ignore
@@ -388,13 +462,21 @@ def run_and_monitor_damask(
             messages.Status.tracking_stress_strain()
             
             # Calcuate the stress and strain values and track it in increment_data
-            increment_data = calculate_domain_averaged_stress_and_strain(updated_results, increment_data)
-            increment_data = calculate_slip_system_xi_gamma(updated_results, increment_data)
+            with profiler.phase('averaging'):
+                increment_data = calculate_domain_averaged_stress_and_strain(updated_results, increment_data)
+            with profiler.phase('plastic_work'):
+                increment_data = calculate_slip_system_xi_gamma(updated_results, increment_data)
             # Check if stopping conditions (yielding criteria) are met 
-            increment_data = check_for_stop_conditions(damask_job, increment_data)
+            with profiler.phase('stop_conditions'):
+                increment_data = check_for_stop_conditions(damask_job, increment_data)
 
             # Make plots so a live image of the simulation can be seen.
-            make_plots(problem_definition, damask_job, increment_data)
+            with profiler.phase('plotting'):
+                make_plots(problem_definition, damask_job, increment_data)
+
+            profiler.count('increments_analysed')
+            profiler.end_of_increment(increment_data.increment_last_update)
+            progress_feed.increment_analysed(increment_data, convergence_telemetry.new_increments())
 
             # Stop if stopping conditions are met
             if increment_data.stop_condition_reached:
@@ -467,5 +549,14 @@ def run_and_monitor_damask(
     if damask_grid_process.returncode == 1:
         increment_data.run_ended_succesfully = False
 
+    # Make sure the live plots show the last analysed increment.
+    finish_live_plots(damask_job)
+    convergence_telemetry.update()
+    convergence_telemetry.print_summary()
+    damask_job.convergence_summary = convergence_telemetry.summary()
+    progress_feed.job_ended(increment_data.run_ended_succesfully, increment_data, damask_job.convergence_summary)
+
     damask_job.increment_data = increment_data
+    damask_job.wall_time = time.time() - start_time
+    damask_job.monitor_profile = profiler.summary()
     return increment_data.run_ended_succesfully, damask_job    
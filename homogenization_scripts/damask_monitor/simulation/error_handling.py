@@ -1,6 +1,7 @@
 import subprocess
 import click
-import os
+
+from ..common_classes_damask_monitor.result_file_handshake import damask_is_writing_results
 
 def ask_to_continue_or_stop() -> bool:
     stop_program = not click.confirm("Forcefully stopped Damask. Want to continue with the other jobs? (default = No)", default=False)
@@ -66,10 +67,7 @@ def request_damask_grid_to_stop_or_force_it(
 
 
 def quick_shutdown(damask_grid_process: subprocess.Popen, result_file: str) -> bool: # type: ignore
-    damask_folder = os.path.dirname(result_file)
-    damask_files_folder_files = os.listdir(damask_folder)
-    is_lock_file = [".lock" in file_name for file_name in damask_files_folder_files]
-    if any(is_lock_file):
+    if damask_is_writing_results(result_file):
         can_shutdown_quickly = False
         print("DAMASK_grid is updating files, requesting DAMASK_grid to stop after to prevent file corruption.")
         return can_shutdown_quickly
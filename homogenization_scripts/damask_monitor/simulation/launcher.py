@@ -0,0 +1,199 @@
+# System packages
+import os
+import time
+import shlex
+import signal
+import subprocess
+
+# Local packages
+from ...common_classes.problem_definition import ProblemDefinition
+
+# The launcher decides where and how DAMASK_grid is run:
+# - local: DAMASK_grid on this machine, parallelized with OpenMP (OMP_NUM_THREADS = cpu_cores).
+# - mpi:   DAMASK_grid started by an MPI runner (mpirun -np mpi_ranks) for the PETSc domain decomposition of DAMASK.
+#          Each MPI rank uses mpi_threads_per_rank OpenMP threads.
+# - batch: DAMASK_grid submitted as a job script to a batch queue (i.e. SLURM), so jobs can be spread over a cluster.
+#          With batch_submit_command 'local' the job script is run on this machine instead (stand-in for testing).
+# Every launcher returns a process-like object (poll, wait, send_signal, returncode) that is used by the damask monitor.
+# The batch launcher expects the project folder to be on a file system shared with the compute nodes, the monitor
+# reads the result files in place.
+
+class BatchJob:
+    # Process-like handle of a job in the batch queue.
+    # The job script writes the exit code of DAMASK_grid to a file, which signals that the job has ended.
+    job_id: str
+    exit_code_file: str
+    status_command: str
+    cancel_command: str
+    returncode: int | None
+
+    def __init__(self, job_id: str, exit_code_file: str, status_command: str, cancel_command: str, local_process: subprocess.Popen | None = None): # type: ignore
+        self.job_id = job_id
+        self.exit_code_file = exit_code_file
+        self.status_command = status_command
+        self.cancel_command = cancel_command
+        self.local_process = local_process
+        self.returncode = None
+
+    def read_exit_code(self) -> int | None:
+        if not os.path.isfile(self.exit_code_file):
+            return None
+        with open(self.exit_code_file, 'r') as exit_code_reader:
+            exit_code_text = exit_code_reader.read().strip()
+        if exit_code_text == '':
+            return None
+        exit_code = int(exit_code_text)
+        # The shell reports a process stopped by a signal as 128 + signal, Popen as -signal.
+        if exit_code > 128:
+            exit_code = -(exit_code - 128)
+        return exit_code
+
+    def job_is_in_queue(self) -> bool:
+        if self.local_process is not None:
+            return self.local_process.poll() is None
+        status = subprocess.run(self.status_command.format(job_id=self.job_id), shell=True, capture_output=True, text=True)
+        return status.returncode == 0 and not status.stdout.strip() == ''
+
+    def poll(self) -> int | None:
+        if self.returncode is not None:
+            return self.returncode
+
+        self.returncode = self.read_exit_code()
+        if self.returncode is None and not self.job_is_in_queue():
+            # The job left the queue, check once more for the exit code as it might have been written just now.
+            self.returncode = self.read_exit_code()
+            if self.returncode is None and self.local_process is not None:
+                # The job script itself was stopped (i.e. by a signal to the process group).
+                self.returncode = self.local_process.returncode
+            elif self.returncode is None:
+                print(f"Batch job {self.job_id} left the queue without reporting an exit code, it was likely cancelled by the scheduler.")
+                self.returncode = 1
+        return self.returncode
+
+    def wait(self) -> int:
+        while self.poll() is None:
+            time.sleep(1)
+        return self.returncode # type: ignore
+
+    def send_signal(self, signal_number: int) -> None:
+        if self.local_process is not None:
+            # The job script runs in its own process group, signal DAMASK_grid as well as the shell.
+            try:
+                os.killpg(os.getpgid(self.local_process.pid), signal_number)
+            except ProcessLookupError:
+                pass
+            return
+        subprocess.run(self.cancel_command.format(job_id=self.job_id, signal=signal.Signals(signal_number).name.removeprefix('SIG')), shell=True)
+
+class Launcher:
+    class Process:
+        # DAMASK_grid started as a child process of this script, the subclasses only supply the command prefix.
+        def launch_prefix(self) -> list[str]:
+            return []
+
+        def start(self, launch_command: list[str], env: dict[str, str], log_file: str, working_directory: str) -> subprocess.Popen: # type: ignore
+            with open(log_file, 'a') as f:
+                # Run the command and redirect both stdout and stderr (console messages and errors) to the log file
+                damask_grid_process = subprocess.Popen(args=launch_command, env=env, text=True,
+                                        shell=False, stdout=f, stderr=subprocess.STDOUT)
+            return damask_grid_process
+
+    class Local(Process):
+        def __init__(self, problem_definition: ProblemDefinition):
+            self.name = 'local'
+
+    class MPI(Process):
+        def __init__(self, problem_definition: ProblemDefinition):
+            self.name = 'mpi'
+            self.mpi_runner = getattr(problem_definition.solver, "mpi_runner", "mpirun")
+            self.mpi_runner_arguments = getattr(problem_definition.solver, "mpi_runner_arguments", "-np {ranks}")
+            self.mpi_ranks = getattr(problem_definition.solver, "mpi_ranks", 1)
+            self.mpi_threads_per_rank = threads_per_rank(problem_definition)
+
+        def launch_prefix(self) -> list[str]:
+            # i.e. mpi_runner_arguments: "-np {ranks} --map-by slot:PE={threads}"
+            runner_arguments = self.mpi_runner_arguments.format(ranks=self.mpi_ranks, threads=self.mpi_threads_per_rank)
+            return [self.mpi_runner] + shlex.split(runner_arguments)
+
+    class BatchQueue:
+        def __init__(self, problem_definition: ProblemDefinition):
+            self.name = 'batch'
+            self.submit_command = getattr(problem_definition.solver, "batch_submit_command", "local")
+            self.status_command = getattr(problem_definition.solver, "batch_status_command", "squeue -h -j {job_id}")
+            self.cancel_command = getattr(problem_definition.solver, "batch_cancel_command", "scancel --signal={signal} {job_id}")
+            # DAMASK_grid can be run with MPI inside the batch job as well.
+            mpi_ranks = getattr(problem_definition.solver, "mpi_ranks", 1)
+            if mpi_ranks > 1:
+                self.prefix = Launcher.MPI(problem_definition).launch_prefix()
+            else:
+                self.prefix = []
+
+        def launch_prefix(self) -> list[str]:
+            return self.prefix
+
+        def write_job_script(self, launch_command: list[str], env: dict[str, str], log_file: str, working_directory: str) -> tuple[str, str]:
+            job_script = os.path.join(working_directory, 'damask_job.sh')
+            exit_code_file = os.path.join(working_directory, 'damask_job.exitcode')
+            if os.path.exists(exit_code_file):
+                os.remove(exit_code_file)
+
+            # Only the environment variables set for this job are exported, the rest is provided by the scheduler.
+            exported_variables = [f"export {key}={shlex.quote(value)}" for key, value in env.items() if not os.environ.get(key) == value]
+
+            job_script_lines = [
+                "#!/bin/sh",
+                f"cd {shlex.quote(working_directory)}",
+                *exported_variables,
+                f"{shlex.join(launch_command)} >> {shlex.quote(log_file)} 2>&1",
+                f"echo $? > {shlex.quote(exit_code_file)}",
+            ]
+            with open(job_script, 'w') as job_script_writer:
+                job_script_writer.write("\n".join(job_script_lines) + "\n")
+            os.chmod(job_script, 0o755)
+
+            return job_script, exit_code_file
+
+        def start(self, launch_command: list[str], env: dict[str, str], log_file: str, working_directory: str) -> BatchJob:
+            (job_script, exit_code_file) = self.write_job_script(launch_command, env, log_file, working_directory)
+
+            if self.submit_command == 'local':
+                local_process = subprocess.Popen(args=["sh", job_script], env=env, start_new_session=True,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                job_id = f"{local_process.pid}"
+                print(f"Started job script {job_script} locally (process {job_id}).")
+                return BatchJob(job_id, exit_code_file, self.status_command, self.cancel_command, local_process)
+
+            submission = subprocess.run(f"{self.submit_command} {shlex.quote(job_script)}", shell=True, capture_output=True, text=True, cwd=working_directory)
+            if not submission.returncode == 0:
+                raise Exception(f"Submitting {job_script} with '{self.submit_command}' failed: {submission.stderr.strip()}")
+
+            # i.e. 'Submitted batch job 1234' or '1234;cluster' (sbatch --parsable)
+            job_id = submission.stdout.strip().split()[-1].split(';')[0]
+            print(f"Submitted job script {job_script} to the batch queue (job {job_id}).")
+            return BatchJob(job_id, exit_code_file, self.status_command, self.cancel_command)
+
+LauncherTypes = Launcher.Local | Launcher.MPI | Launcher.BatchQueue
+
+def uses_mpi(problem_definition: ProblemDefinition) -> bool:
+    launcher = getattr(problem_definition.solver, "launcher", "local")
+    mpi_ranks = getattr(problem_definition.solver, "mpi_ranks", 1)
+    return launcher == 'mpi' or (launcher == 'batch' and mpi_ranks > 1)
+
+def threads_per_rank(problem_definition: ProblemDefinition) -> int:
+    # Number of OpenMP threads per DAMASK_grid process. Without MPI, all cpu_cores are used by a single process.
+    cpu_cores = problem_definition.solver.cpu_cores
+    if not uses_mpi(problem_definition):
+        return cpu_cores
+    mpi_ranks = getattr(problem_definition.solver, "mpi_ranks", 1)
+    return getattr(problem_definition.solver, "mpi_threads_per_rank", max(cpu_cores // mpi_ranks, 1))
+
+def get_launcher(problem_definition: ProblemDefinition) -> LauncherTypes:
+    match getattr(problem_definition.solver, "launcher", "local"):
+        case 'local':
+            return Launcher.Local(problem_definition)
+        case 'mpi':
+            return Launcher.MPI(problem_definition)
+        case 'batch':
+            return Launcher.BatchQueue(problem_definition)
+        case launcher: # type: ignore
+            raise Exception(f"Launcher {launcher} is not yet implemented.")
@@ -0,0 +1,173 @@
+# System packages
+import os
+import copy
+import time
+import yaml
+import shutil
+import subprocess
+import damask # type: ignore
+
+# Local packages
+from ...common_classes.problem_definition import ProblemDefinition
+from ...common_classes.damask_job import RunTime, create_elastic_strain_step
+from ...common_functions.job_cost_model import get_grid_cells
+from ..pre_processor.prepare_damask_files import PrepareFile
+from .damask_monitor import create_launch_command
+
+# The MPI tuner picks the split of the cpu_cores into MPI ranks x OpenMP threads that runs DAMASK_grid the fastest.
+# Every split is timed with a short elastic calibration run on the grid of the project.
+# DAMASK_grid decomposes the grid in z-direction, so the number of ranks can not exceed the number of cells in z.
+# The fastest split is cached per grid size in results/mpi_tuning.yaml, so the calibration only runs once (again when
+# cpu_cores, mpi_runner or mpi_runner_arguments change, i.e. other binding or mapping flags).
+
+calibration_increments = 3
+calibration_strain_step = 1E-4
+calibration_timeout = 3600.     # [s] per calibration run
+
+class CalibrationJob:
+    # Minimal job to prepare the DAMASK_grid files with PrepareFile.
+    runtime: RunTime
+
+    def __init__(self, calibration_folder: str):
+        self.runtime = RunTime()
+        self.runtime.set_damask_files(calibration_folder)
+
+def mpi_tuning_file(problem_definition: ProblemDefinition) -> str:
+    return os.path.join(problem_definition.general.path.results_folder, 'mpi_tuning.yaml')
+
+def grid_size_key(problem_definition: ProblemDefinition) -> str:
+    return "x".join(f"{cells}" for cells in get_grid_cells(problem_definition))
+
+def candidate_splits(cpu_cores: int, cells_z: int) -> list[tuple[int, int]]:
+    # All (ranks, threads) with ranks * threads = cpu_cores.
+    splits: list[tuple[int, int]] = []
+    for mpi_ranks in range(1, max(cpu_cores, 1) + 1):
+        if cpu_cores % mpi_ranks == 0 and mpi_ranks <= cells_z:
+            splits.append((mpi_ranks, cpu_cores // mpi_ranks))
+    return splits
+
+def read_mpi_tuning(problem_definition: ProblemDefinition) -> dict[str, dict[str, str | int | dict[str, float]]]:
+    tuning_file = mpi_tuning_file(problem_definition)
+    if not os.path.exists(tuning_file):
+        return dict()
+    with open(tuning_file, 'r') as tuning_reader:
+        mpi_tuning: dict[str, dict[str, str | int | dict[str, float]]] = yaml.safe_load(tuning_reader) or dict()
+    return mpi_tuning
+
+def prepare_calibration_files(problem_definition: ProblemDefinition, calibration_folder: str) -> CalibrationJob:
+    os.makedirs(calibration_folder, exist_ok=True)
+    calibration_job = CalibrationJob(calibration_folder)
+    PrepareFile.material_properties_and_orientation_file(problem_definition, calibration_job) # type: ignore
+    PrepareFile.grid_and_dimensions_file(problem_definition, calibration_job) # type: ignore
+    PrepareFile.numerics_file(problem_definition, calibration_job) # type: ignore
+
+    # A small elastic strain step: cheap, but it contains the same FFT and constitutive work per increment as a real job.
+    (deformation_gradient_tensor, _) = create_elastic_strain_step('strain_xx', calibration_strain_step)
+    loadstep = {
+        'boundary_conditions': {
+            'mechanical': {
+                'F': deformation_gradient_tensor,
+                'P': [['x', 'x', 'x'], ['x', 'x', 'x'], ['x', 'x', 'x']]
+            }
+        },
+        'discretization': {
+            't': problem_definition.solver.simulation_time,
+            'N': calibration_increments
+        },
+        'f_out': calibration_increments
+    }
+    load_case = damask.LoadcaseGrid(solver={'mechanical': problem_definition.solver.solver_type}, loadstep=[loadstep]) # type: ignore
+    load_case_path = os.path.join(calibration_folder, 'LOADCASE.yaml')
+    load_case.save(load_case_path) # type: ignore
+    calibration_job.runtime.set_loadcase_file(load_case_path)
+
+    return calibration_job
+
+def time_calibration_run(problem_definition: ProblemDefinition, calibration_job: CalibrationJob, mpi_ranks: int, mpi_threads_per_rank: int) -> float:
+    # Returns the wall time of the calibration run, or infinity if DAMASK_grid failed.
+    problem_definition_split = copy.deepcopy(problem_definition)
+    problem_definition_split.solver.launcher = 'mpi'
+    problem_definition_split.solver.mpi_ranks = mpi_ranks
+    problem_definition_split.solver.mpi_threads_per_rank = mpi_threads_per_rank
+    # The calibration always starts from the undeformed state.
+    if getattr(problem_definition_split.general.path, "restart_file_path", False):
+        problem_definition_split.general.path.restart_file_path = False
+
+    calibration_folder = calibration_job.runtime.damask_files
+    for file_name in os.listdir(calibration_folder):
+        if file_name.startswith(problem_definition.general.project_name):
+            os.remove(os.path.join(calibration_folder, file_name))
+
+    (launch_command, env) = create_launch_command(problem_definition_split, calibration_job) # type: ignore
+    log_file = os.path.join(calibration_folder, f"DAMASK_grid_{mpi_ranks}x{mpi_threads_per_rank}.log")
+
+    start_time = time.time()
+    try:
+        with open(log_file, 'w') as log_writer:
+            calibration_run = subprocess.run(launch_command, env=env, stdout=log_writer, stderr=subprocess.STDOUT, timeout=calibration_timeout)
+    except (subprocess.TimeoutExpired, OSError):
+        return float('inf')
+    wall_time = time.time() - start_time
+
+    if not calibration_run.returncode == 0:
+        return float('inf')
+    return wall_time
+
+def tune_mpi_split(problem_definition: ProblemDefinition) -> ProblemDefinition:
+    # Sets solver.mpi_ranks and solver.mpi_threads_per_rank to the fastest split for the grid of this project.
+    if not getattr(problem_definition.solver, "mpi_auto_tune", False):
+        return problem_definition
+    if not getattr(problem_definition.solver, "launcher", "local") == 'mpi':
+        # Calibration runs are started on this machine, which is not where the jobs of a batch queue run.
+        print("The automatic MPI tuning is only available for the mpi launcher, using mpi_ranks and mpi_threads_per_rank as given.")
+        return problem_definition
+
+    cpu_cores = problem_definition.solver.cpu_cores
+    mpi_runner = getattr(problem_definition.solver, "mpi_runner", "mpirun")
+    mpi_runner_arguments = getattr(problem_definition.solver, "mpi_runner_arguments", "-np {ranks}")
+    grid_key = grid_size_key(problem_definition)
+
+    mpi_tuning = read_mpi_tuning(problem_definition)
+    cached_tuning = mpi_tuning.get(grid_key, dict())
+    if cached_tuning.get('cpu_cores') == cpu_cores and cached_tuning.get('mpi_runner') == mpi_runner and cached_tuning.get('mpi_runner_arguments') == mpi_runner_arguments:
+        problem_definition.solver.mpi_ranks = cached_tuning['mpi_ranks'] # type: ignore
+        problem_definition.solver.mpi_threads_per_rank = cached_tuning['mpi_threads_per_rank'] # type: ignore
+        print(f"Using the tuned MPI split for grid {grid_key}: {problem_definition.solver.mpi_ranks} rank(s) x {problem_definition.solver.mpi_threads_per_rank} thread(s).")
+        return problem_definition
+
+    splits = candidate_splits(cpu_cores, get_grid_cells(problem_definition)[2])
+    print(f"Tuning the MPI rank/thread split for grid {grid_key} on {cpu_cores} cpu core(s), testing {len(splits)} split(s)...")
+
+    calibration_folder = os.path.join(problem_definition.general.path.damask_files_folder, 'mpi_tuning')
+    calibration_job = prepare_calibration_files(problem_definition, calibration_folder)
+
+    timings: dict[str, float] = dict()
+    for (mpi_ranks, mpi_threads_per_rank) in splits:
+        wall_time = time_calibration_run(problem_definition, calibration_job, mpi_ranks, mpi_threads_per_rank)
+        timings[f"{mpi_ranks}x{mpi_threads_per_rank}"] = wall_time
+        print(f"  {mpi_ranks} rank(s) x {mpi_threads_per_rank} thread(s): {wall_time:.1f} s")
+
+    shutil.rmtree(calibration_folder, ignore_errors=True)
+
+    if len(timings) == 0 or min(timings.values()) == float('inf'):
+        print("None of the MPI calibration runs succeeded, using the mpi_ranks and mpi_threads_per_rank settings as given.")
+        return problem_definition
+
+    (mpi_ranks, mpi_threads_per_rank) = splits[list(timings.values()).index(min(timings.values()))]
+    problem_definition.solver.mpi_ranks = mpi_ranks
+    problem_definition.solver.mpi_threads_per_rank = mpi_threads_per_rank
+    print(f"Fastest split for grid {grid_key}: {mpi_ranks} rank(s) x {mpi_threads_per_rank} thread(s).")
+
+    mpi_tuning[grid_key] = {
+        'cpu_cores': cpu_cores,
+        'mpi_runner': mpi_runner,
+        'mpi_runner_arguments': mpi_runner_arguments,
+        'mpi_ranks': mpi_ranks,
+        'mpi_threads_per_rank': mpi_threads_per_rank,
+        'timings': {split: float(wall_time) for split, wall_time in timings.items()},
+    }
+    os.makedirs(os.path.dirname(mpi_tuning_file(problem_definition)), exist_ok=True)
+    with open(mpi_tuning_file(problem_definition), 'w') as tuning_writer:
+        yaml.dump(mpi_tuning, tuning_writer)
+
+    return problem_definition
@@ -0,0 +1,285 @@
+# System packages
+import os
+import copy
+import yaml
+import shutil
+import hashlib
+import datetime
+import numpy as np
+
+# Local packages
+from ...common_classes.problem_definition import ProblemDefinition
+from ...common_classes.damask_job import DamaskJob, DamaskJobTypes
+from ...common_functions.job_cost_model import get_grid_cells
+from ..pre_processor.damask_pre_processor import pre_process_damask_files
+from ..post_processor.job_post_processing import yield_point_post_processing, run_post_processing_job
+from .damask_monitor import run_and_monitor_damask
+
+# The numerics tuner looks for the cheapest DAMASK_grid tolerances that keep the yield stress within
+# solver.numerics_yield_tolerance (relative) of the yield stress with the numerics of the problem definition (the reference).
+# - The tolerances eps_* are loosened step-wise by the factors in loosen_factors, the first yield job of the campaign is run
+#   for every step (calibration run). Loosening stops at the first step that is off by more than the tolerance.
+# - The cheapest step (least iterations of DAMASK_grid) within the tolerance is selected. N_iter_max is lowered to twice the
+#   most iterations an increment needed with the selected tolerances, this only changes when DAMASK_grid cuts back.
+# - Every yield job that finishes is recorded with its numerics, convergence and yield stress in results/numerics_history.yaml.
+#   Calibration runs that are already in the history (same grid, material, load and numerics) are not run again.
+# - The selected numerics are cached per grid and material in results/numerics_tuning.yaml.
+# - The calibration run with the numerics the jobs run with (the selected numerics, or the reference for suggest) is the
+#   result of its job: it is post-processed for the project and the job is not run again.
+# With solver.numerics_tuning: suggest the tuned numerics are only printed, with apply these are used for the jobs.
+
+loosen_factors = [1., 4., 16., 64.]
+loosened_numerics = ['eps_abs_div_P', 'eps_rel_div_P', 'eps_abs_P', 'eps_rel_P', 'eps_abs_curl_F', 'eps_rel_curl_F']
+tuned_numerics = ['N_iter_min', 'N_iter_max'] + loosened_numerics
+N_iter_max_margin = 2
+N_iter_max_lowest = 10
+
+def numerics_tuning_file(problem_definition: ProblemDefinition) -> str:
+    return os.path.join(problem_definition.general.path.results_folder, 'numerics_tuning.yaml')
+
+def calibration_folder_of(problem_definition: ProblemDefinition) -> str:
+    return os.path.join(problem_definition.general.path.damask_files_folder, 'numerics_tuning')
+
+def numerics_history_file(problem_definition: ProblemDefinition) -> str:
+    return os.path.join(problem_definition.general.path.results_folder, 'numerics_history.yaml')
+
+def numerics_of(problem_definition: ProblemDefinition) -> dict[str, int | float]:
+    return {setting: getattr(problem_definition.solver, setting) for setting in tuned_numerics}
+
+def same_numerics(numerics: dict[str, int | float], other_numerics: dict[str, int | float]) -> bool:
+    return all(setting in other_numerics and bool(np.isclose(numerics[setting], other_numerics[setting], rtol=1E-9, atol=0.)) for setting in numerics)
+
+def grid_and_material_key(problem_definition: ProblemDefinition) -> str:
+    # Grid size and a hash of the grid and material files: tuned numerics only apply to the same microstructure.
+    material_key = getattr(problem_definition.general, "grid_and_material_key", None)
+    if material_key is not None:
+        return material_key
+    file_hash = hashlib.sha1()
+    for file_path in [problem_definition.general.path.grid_file, problem_definition.general.path.material_properties]:
+        with open(file_path, 'rb') as file_reader:
+            for block in iter(lambda: file_reader.read(1 << 20), b''):
+                file_hash.update(block)
+    grid_key = "x".join(f"{cells}" for cells in get_grid_cells(problem_definition))
+    problem_definition.general.grid_and_material_key = f"{grid_key}_{file_hash.hexdigest()[:12]}"
+    return problem_definition.general.grid_and_material_key
+
+def read_yaml_file(file_path: str, default: dict | list) -> dict | list: # type: ignore
+    if not os.path.exists(file_path):
+        return default
+    with open(file_path, 'r') as file_reader:
+        content = yaml.safe_load(file_reader)
+    return default if content is None else content
+
+def append_numerics_history(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes, recorded_run: dict) -> None: # type: ignore
+    numerics_history: list[dict] = read_yaml_file(numerics_history_file(problem_definition), []) # type: ignore
+    numerics_history.append({
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'grid_and_material': grid_and_material_key(problem_definition),
+        'simulation_type': damask_job.simulation_type,
+        'field_name': damask_job.field_name,
+    } | recorded_run)
+    os.makedirs(os.path.dirname(numerics_history_file(problem_definition)), exist_ok=True)
+    with open(numerics_history_file(problem_definition), 'w') as history_writer:
+        yaml.dump(numerics_history, history_writer)
+
+def record_numerics_run(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes) -> None:
+    # Appends a finished yield job to the numerics history of the project.
+    if not getattr(problem_definition.solver, "numerics_tuning", "off") in ["suggest", "apply"]:
+        return
+    yield_stress = getattr(damask_job, "yield_stress", None)
+    if yield_stress is None:
+        return
+    append_numerics_history(problem_definition, damask_job, {
+        'numerics': numerics_of(problem_definition),
+        'convergence': getattr(damask_job, "convergence_summary", dict()),
+        'wall_time': float(getattr(damask_job, "wall_time", 0.)),
+        'yield_stress': np.array(yield_stress, dtype=float).tolist(),
+    })
+
+def find_recorded_run(problem_definition: ProblemDefinition, material_key: str, damask_job: DamaskJobTypes, numerics: dict[str, int | float]) -> dict | None: # type: ignore
+    numerics_history: list[dict] = read_yaml_file(numerics_history_file(problem_definition), []) # type: ignore
+    for recorded_run in reversed(numerics_history):
+        if recorded_run.get('grid_and_material') == material_key \
+                and recorded_run.get('simulation_type') == damask_job.simulation_type \
+                and recorded_run.get('field_name') == damask_job.field_name \
+                and same_numerics(numerics, recorded_run.get('numerics', dict())):
+            return recorded_run
+    return None
+
+def run_calibration(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes, numerics: dict[str, int | float], calibration_folder: str) -> tuple[dict | None, DamaskJobTypes]: # type: ignore
+    # Runs the job with the given numerics in the calibration folder, returns the run as it is recorded in the history and the job.
+    problem_definition_calibration = copy.deepcopy(problem_definition)
+    for (setting, value) in numerics.items():
+        setattr(problem_definition_calibration.solver, setting, value)
+    problem_definition_calibration.solver.live_plots = False
+    # The calibration always starts from the undeformed state.
+    if getattr(problem_definition_calibration.general.path, "restart_file_path", False):
+        problem_definition_calibration.general.path.restart_file_path = False
+    problem_definition_calibration.general.path.damask_files_folder = os.path.join(calibration_folder, 'damask_files')
+    problem_definition_calibration.general.path.results_folder = os.path.join(calibration_folder, 'results')
+    problem_definition_calibration.general.path.backup_results_folder = os.path.join(calibration_folder, 'backup')
+
+    calibration_job = copy.deepcopy(damask_job)
+    calibration_job.keep_damask_files = False
+    calibration_job.restart_increment = 0
+    (problem_definition_calibration, calibration_job) = pre_process_damask_files(problem_definition_calibration, calibration_job)
+    (run_ended_succesfully, calibration_job) = run_and_monitor_damask(problem_definition_calibration, calibration_job)
+    if not run_ended_succesfully:
+        return None, calibration_job
+    interpolated_result = yield_point_post_processing(problem_definition_calibration, calibration_job) # type: ignore
+    if interpolated_result is None:
+        return None, calibration_job
+
+    return {
+        'numerics': numerics,
+        'convergence': getattr(calibration_job, "convergence_summary", dict()),
+        'wall_time': float(getattr(calibration_job, "wall_time", 0.)),
+        'yield_stress': np.array(interpolated_result.stress, dtype=float).tolist(),
+    }, calibration_job
+
+def calibrate_numerics(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes, material_key: str) -> tuple[list[dict[str, str | float | dict]], list[tuple[dict[str, int | float], DamaskJobTypes]]]: # type: ignore
+    # Returns the steps, and the numerics and job of every calibration run that was run (not taken from the history).
+    reference_numerics = numerics_of(problem_definition)
+    yield_tolerance = getattr(problem_definition.solver, "numerics_yield_tolerance", 0.01)
+    calibration_folder = calibration_folder_of(problem_definition)
+
+    steps: list[dict[str, str | float | dict]] = [] # type: ignore
+    calibration_runs: list[tuple[dict[str, int | float], DamaskJobTypes]] = []
+    reference_stress = None
+    for loosen_factor in loosen_factors:
+        numerics = reference_numerics | {setting: float(reference_numerics[setting] * loosen_factor) for setting in loosened_numerics}
+        recorded_run = find_recorded_run(problem_definition, material_key, damask_job, numerics)
+        if recorded_run is None:
+            print(f"  Calibration run of job {damask_job.field_name} with the tolerances eps_* x {loosen_factor:g}...")
+            (recorded_run, calibration_job) = run_calibration(problem_definition, damask_job, numerics, os.path.join(calibration_folder, f"eps_x{loosen_factor:g}"))
+            if recorded_run is not None:
+                append_numerics_history(problem_definition, damask_job, recorded_run)
+                calibration_runs.append((numerics, calibration_job))
+        else:
+            print(f"  Job {damask_job.field_name} with the tolerances eps_* x {loosen_factor:g} was run before (see {numerics_history_file(problem_definition)}).")
+
+        if recorded_run is None:
+            print(f"  No yield point found with the tolerances eps_* x {loosen_factor:g}.")
+            break
+
+        yield_stress = np.array(recorded_run['yield_stress'], dtype=float)
+        if reference_stress is None:
+            reference_stress = yield_stress
+        deviation = float(np.linalg.norm(yield_stress - reference_stress) / max(float(np.linalg.norm(reference_stress)), 1E-12))
+        iterations = recorded_run.get('convergence', dict()).get('iterations')
+        steps.append({
+            'loosen_factor': float(loosen_factor),
+            'numerics': numerics,
+            'yield_stress_deviation': deviation,
+            'iterations': int(iterations) if iterations is not None else None,
+            'max_iterations': recorded_run.get('convergence', dict()).get('max_iterations'),
+            'wall_time': float(recorded_run.get('wall_time', 0.)),
+        }) # type: ignore
+        print(f"  Tolerances eps_* x {loosen_factor:g}: yield stress deviation {100 * deviation:.3f} %, {iterations} iteration(s), {recorded_run.get('wall_time', 0.):.0f} s.")
+
+        if deviation > yield_tolerance:
+            break
+
+    return steps, calibration_runs
+
+def reuse_calibration_run(
+        problem_definition: ProblemDefinition,
+        damask_jobs: list[DamaskJobTypes],
+        calibration_runs: list[tuple[dict[str, int | float], DamaskJobTypes]]) -> list[DamaskJobTypes]:
+    # Post-processes the calibration run with the numerics of the problem definition as the result of its job, returns the jobs left to run.
+    # The calibration starts from the undeformed state, it is not the result of a job that continues from a restart file.
+    if getattr(problem_definition.general.path, "restart_file_path", False):
+        return damask_jobs
+    # N_iter_max is lowered to at least twice the iterations an increment of the calibration run needed, it did not change the run.
+    numerics = {setting: value for (setting, value) in numerics_of(problem_definition).items() if not setting == 'N_iter_max'}
+    for (calibration_numerics, calibration_job) in calibration_runs:
+        if not same_numerics(numerics, calibration_numerics):
+            continue
+        for damask_job in damask_jobs:
+            if damask_job.simulation_type == calibration_job.simulation_type and damask_job.field_name == calibration_job.field_name:
+                print(f"Job {damask_job.field_name} was run with these numerics in the calibration, its result is used instead of running it again.")
+                os.makedirs(problem_definition.general.path.results_folder, exist_ok=True)
+                run_post_processing_job(problem_definition, calibration_job)
+                return [job for job in damask_jobs if not job is damask_job]
+    return damask_jobs
+
+def select_numerics(problem_definition: ProblemDefinition, steps: list[dict]) -> dict[str, int | float] | None: # type: ignore
+    # The cheapest step within the tolerance, with N_iter_max lowered to what the increments needed.
+    yield_tolerance = getattr(problem_definition.solver, "numerics_yield_tolerance", 0.01)
+    valid_steps = [step for step in steps if step['yield_stress_deviation'] <= yield_tolerance]
+    if len(valid_steps) == 0:
+        return None
+    selected_step = min(valid_steps, key=lambda step: (step['iterations'] if step['iterations'] is not None else np.inf, step['wall_time']))
+    numerics = dict(selected_step['numerics'])
+    if selected_step.get('max_iterations') is not None:
+        N_iter_max = max(N_iter_max_margin * int(selected_step['max_iterations']), N_iter_max_lowest, int(numerics['N_iter_min']) + 1)
+        numerics['N_iter_max'] = min(int(numerics['N_iter_max']), N_iter_max)
+    return numerics
+
+def tune_numerics(problem_definition: ProblemDefinition, damask_jobs: list[DamaskJobTypes]) -> tuple[ProblemDefinition, list[DamaskJobTypes]]:
+    # Suggests or sets the tolerances and iteration limits of DAMASK_grid (only when solver.numerics_tuning is set).
+    # Returns the jobs left to run, see reuse_calibration_run.
+    numerics_tuning = getattr(problem_definition.solver, "numerics_tuning", "off")
+    if not numerics_tuning in ["suggest", "apply"]:
+        return problem_definition, damask_jobs
+
+    yield_jobs = [damask_job for damask_job in damask_jobs if isinstance(damask_job, DamaskJob.YieldPointMultiaxial)]
+    if len(yield_jobs) == 0:
+        print("The numerics tuning compares yield stresses, it is only available for yield_point and yield_surface, using the numerics as given.")
+        return problem_definition, damask_jobs
+
+    material_key = grid_and_material_key(problem_definition)
+    reference_numerics = numerics_of(problem_definition)
+    yield_tolerance = getattr(problem_definition.solver, "numerics_yield_tolerance", 0.01)
+
+    calibration_runs: list[tuple[dict[str, int | float], DamaskJobTypes]] = []
+    numerics_tuning_cache: dict[str, dict] = read_yaml_file(numerics_tuning_file(problem_definition), dict()) # type: ignore
+    cached_tuning = numerics_tuning_cache.get(material_key, dict())
+    if same_numerics(reference_numerics, cached_tuning.get('reference_numerics', dict())) and cached_tuning.get('yield_tolerance') == yield_tolerance:
+        numerics = cached_tuning.get('tuned_numerics')
+        print(f"Using the tuned numerics for grid and material {material_key} (see {numerics_tuning_file(problem_definition)}).")
+    else:
+        calibration_job = yield_jobs[0]
+        print(f"Tuning the numerics for grid and material {material_key} with job {calibration_job.field_name}, yield stress tolerance {100 * yield_tolerance:g} %...")
+        (steps, calibration_runs) = calibrate_numerics(problem_definition, calibration_job, material_key)
+        numerics = select_numerics(problem_definition, steps)
+        if numerics is None:
+            print("The numerics could not be tuned, the calibration run with the numerics as given did not find a yield point.")
+            shutil.rmtree(calibration_folder_of(problem_definition), ignore_errors=True)
+            return problem_definition, damask_jobs
+
+        numerics_tuning_cache[material_key] = {
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'field_name': calibration_job.field_name,
+            'yield_tolerance': yield_tolerance,
+            'reference_numerics': reference_numerics,
+            'tuned_numerics': numerics,
+            'steps': steps,
+        }
+        os.makedirs(os.path.dirname(numerics_tuning_file(problem_definition)), exist_ok=True)
+        with open(numerics_tuning_file(problem_definition), 'w') as tuning_writer:
+            yaml.dump(numerics_tuning_cache, tuning_writer)
+
+    if numerics is None:
+        return problem_definition, damask_jobs
+
+    changed_numerics = {setting: value for setting, value in numerics.items() if not same_numerics({setting: value}, reference_numerics)}
+    if len(changed_numerics) == 0:
+        print("The numerics as given are already the cheapest within the yield stress tolerance.")
+    else:
+        match numerics_tuning:
+            case "suggest":
+                print("Suggested numerics (solver.numerics_tuning: apply to use these):")
+                for (setting, value) in changed_numerics.items():
+                    print(f"  {setting}: {value:g} (now {reference_numerics[setting]:g})")
+            case _:
+                # The result cache keys on the numerics as configured, its lookup in create_jobs runs before the tuning.
+                problem_definition.solver.configured_numerics = reference_numerics
+                print("Using the tuned numerics:")
+                for (setting, value) in changed_numerics.items():
+                    print(f"  {setting}: {value:g} (instead of {reference_numerics[setting]:g})")
+                    setattr(problem_definition.solver, setting, value)
+
+    damask_jobs = reuse_calibration_run(problem_definition, damask_jobs, calibration_runs)
+    shutil.rmtree(calibration_folder_of(problem_definition), ignore_errors=True)
+    return problem_definition, damask_jobs
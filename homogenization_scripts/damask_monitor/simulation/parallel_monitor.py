@@ -0,0 +1,248 @@
+# System packages
+import os
+import time
+import signal
+import asyncio
+import traceback
+import damask # type: ignore
+from typing import Callable
+
+# Local packages
+from ..common_classes_damask_monitor.increment_data import IncrementData
+from ..common_classes_damask_monitor.result_file_handshake import ResultFileHandshake, damask_is_writing_results
+from ..common_classes_damask_monitor.monitor_profiler import MonitorProfiler
+from ..common_classes_damask_monitor.progress_feed import ProgressFeed
+from ..common_classes_damask_monitor.convergence_telemetry import ConvergenceTelemetry
+from ...common_classes.problem_definition import ProblemDefinition
+from ...common_classes.damask_job import DamaskJobTypes
+from ...common_functions.campaign_journal import update_job_state
+from .launcher import get_launcher, Launcher, BatchJob
+from ..post_processor.live_plots import finish_live_plots
+from .damask_monitor import (
+    create_launch_command,
+    restore_increment_data_from_result_file,
+    calculate_domain_averaged_stress_and_strain,
+    calculate_slip_system_xi_gamma,
+    check_for_stop_conditions,
+    make_plots
+)
+
+# The parallel monitor supervises several DAMASK_grid processes from a single python process (solver.parallel_jobs).
+# Every job has its own IncrementData, so the stop conditions are tracked per job. The event loop only waits:
+# - DAMASK_grid processes are started and awaited as asyncio subprocesses (batch jobs are polled in a thread).
+# - New increments are detected from the .sta file with non-blocking calls (see result_file_handshake.py).
+# - Reading the HDF5 result file and analysing an increment is done in a worker thread.
+# When a job ends, job_finished is called (one job at a time) to store and post-process its results.
+
+class DamaskProcess:
+    # Gives asyncio subprocesses and batch jobs the same (async) interface.
+    def __init__(self, process: asyncio.subprocess.Process | BatchJob):
+        self.process = process
+
+    async def poll(self) -> int | None:
+        if isinstance(self.process, BatchJob):
+            return await asyncio.to_thread(self.process.poll)
+        return self.process.returncode
+
+    async def wait(self) -> int:
+        if isinstance(self.process, BatchJob):
+            return await asyncio.to_thread(self.process.wait)
+        return await self.process.wait()
+
+    def send_signal(self, signal_number: int) -> None:
+        try:
+            self.process.send_signal(signal_number)
+        except ProcessLookupError:
+            pass
+
+def job_prefix(damask_job: DamaskJobTypes) -> str:
+    return f"[job {damask_job.job_number}/{damask_job.total_jobs} {damask_job.field_name}]"
+
+async def start_damask_process(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes) -> DamaskProcess:
+    (launch_command, env) = create_launch_command(problem_definition, damask_job)
+    launcher = get_launcher(problem_definition)
+
+    if isinstance(launcher, Launcher.BatchQueue):
+        batch_job = await asyncio.to_thread(launcher.start, launch_command, env, damask_job.runtime.log_file, damask_job.runtime.damask_files)
+        return DamaskProcess(batch_job)
+
+    with open(damask_job.runtime.log_file, 'a') as f:
+        # Run the command and redirect both stdout and stderr (console messages and errors) to the log file
+        damask_grid_process = await asyncio.create_subprocess_exec(*launch_command, env=env, stdout=f, stderr=asyncio.subprocess.STDOUT)
+    return DamaskProcess(damask_grid_process)
+
+async def stop_damask_process(damask_process: DamaskProcess, damask_job: DamaskJobTypes) -> None:
+    # Quick shutdown (SIGTERM) when DAMASK_grid is not writing, otherwise request it to stop after the increment (SIGINT).
+    if damask_is_writing_results(damask_job.runtime.damask_result_file):
+        damask_process.send_signal(signal.SIGINT)
+    else:
+        damask_process.send_signal(signal.SIGTERM)
+    await damask_process.wait()
+
+async def wait_for_complete_increment(
+        damask_process: DamaskProcess,
+        handshake: ResultFileHandshake,
+        convergence_telemetry: ConvergenceTelemetry,
+        increment_data: IncrementData,
+        profiler: MonitorProfiler) -> bool:
+    # Returns True when a new increment is completely written to the result file (or DAMASK_grid keeps cutting back),
+    # False when DAMASK_grid ended.
+    check_interval = min(1., increment_data.sleep_time)
+    while await damask_process.poll() is None:
+        convergence_telemetry.update()
+        if convergence_telemetry.cutback_limit_reached():
+            return True
+        status_file_offset = handshake.status_file_offset
+        with profiler.phase('result_file_check'):
+            increment_is_complete = handshake.new_increment_available(increment_data.increment_last_update) and handshake.result_file_is_complete()
+        profiler.count('status_file_bytes_read', max(handshake.status_file_offset - status_file_offset, 0))
+        if increment_is_complete:
+            return True
+        await asyncio.sleep(check_interval)
+    return False
+
+def analyse_newest_increment(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes, increment_data: IncrementData, handshake: ResultFileHandshake, profiler: MonitorProfiler) -> bool:
+    # Runs in a worker thread. Returns True when a new increment was analysed.
+    try:
+        with profiler.phase('result_file_copy'):
+            temporary_result_file = handshake.copy_result_file(damask_job.runtime.damask_temporary_result_file)
+        with profiler.phase('hdf5_open'):
+            updated_results = damask.Result(temporary_result_file)
+        handshake.mark_result_file_read()
+        profiler.count('result_file_bytes', os.path.getsize(damask_job.runtime.damask_result_file))
+        increment_data.subsequent_parsing_errors = 0
+    except Exception:
+        profiler.count('parse_errors')
+        # The file could not be read (i.e. DAMASK_grid was restarted), retry at the next update.
+        if not increment_data.increment_last_update == -1:
+            increment_data.subsequent_parsing_errors += 1
+        if increment_data.subsequent_parsing_errors > problem_definition.solver.stop_after_subsequent_parsing_errors:
+            print(f"{job_prefix(damask_job)} Too many subsequent reading errors detected! Stopping.")
+            increment_data.stop_condition_reached = True
+            increment_data.run_ended_succesfully = False
+        return False
+
+    newest_increment = updated_results.increments_in_range()[-1]
+    if not newest_increment > increment_data.increment_last_update:
+        return False
+    increment_data.tracked_increments.append(newest_increment)
+    increment_data.increment_last_update = newest_increment
+
+    # The first increment is always the 0 state.
+    if not newest_increment > 0:
+        return False
+
+    with profiler.phase('averaging'):
+        increment_data = calculate_domain_averaged_stress_and_strain(updated_results, increment_data)
+    with profiler.phase('plastic_work'):
+        increment_data = calculate_slip_system_xi_gamma(updated_results, increment_data)
+    with profiler.phase('stop_conditions'):
+        increment_data = check_for_stop_conditions(damask_job, increment_data)
+
+    with profiler.phase('plotting'):
+        make_plots(problem_definition, damask_job, increment_data)
+
+    profiler.count('increments_analysed')
+    return True
+
+async def supervise_damask_job(
+        problem_definition: ProblemDefinition,
+        damask_job: DamaskJobTypes,
+        slots: asyncio.Semaphore,
+        job_finished: Callable[[DamaskJobTypes, bool], None],
+        job_finished_lock: asyncio.Lock) -> bool:
+
+    async with slots:
+        increment_data = IncrementData(problem_definition)
+        if getattr(damask_job, "restart_increment", 0) > 0:
+            increment_data = await asyncio.to_thread(restore_increment_data_from_result_file, damask_job, increment_data, damask_job.restart_increment)
+
+        update_job_state(problem_definition, damask_job, 'running')
+        print(f"{job_prefix(damask_job)} Starting DAMASK_grid.")
+        start_time = time.time()
+        damask_process = await start_damask_process(problem_definition, damask_job)
+        handshake = ResultFileHandshake(damask_job.runtime.damask_result_file)
+        profiler = MonitorProfiler(problem_definition, damask_job)
+        progress_feed = ProgressFeed(problem_definition, damask_job)
+        progress_feed.job_started(damask_job)
+        convergence_telemetry = ConvergenceTelemetry(problem_definition, damask_job.runtime.log_file, damask_job.runtime.damask_result_file)
+
+        # From this point on DAMASK_grid runs independently, make sure it is stopped when anything goes wrong.
+        try:
+            while await wait_for_complete_increment(damask_process, handshake, convergence_telemetry, increment_data, profiler):
+                if convergence_telemetry.cutback_limit_reached():
+                    print(f"{job_prefix(damask_job)} DAMASK_grid cut back {convergence_telemetry.subsequent_cutbacks} times since the last full step increment, stopping DAMASK_grid.")
+                    increment_data.stop_condition_reached = True
+                    increment_data.run_ended_succesfully = False
+                    await stop_damask_process(damask_process, damask_job)
+                    break
+
+                new_increment_analysed = await asyncio.to_thread(analyse_newest_increment, problem_definition, damask_job, increment_data, handshake, profiler)
+                if new_increment_analysed:
+                    print(f"{job_prefix(damask_job)} Analysed increment {increment_data.increment_last_update}.")
+                    profiler.end_of_increment(increment_data.increment_last_update)
+                    progress_feed.increment_analysed(increment_data, convergence_telemetry.new_increments())
+
+                if increment_data.stop_condition_reached:
+                    if increment_data.run_ended_succesfully:
+                        print(f"{job_prefix(damask_job)} Stop condition reached, stopping DAMASK_grid.")
+                    await stop_damask_process(damask_process, damask_job)
+                    break
+
+        except asyncio.CancelledError:
+            # Ctrl+c or another job failed unexpectedly: stop this DAMASK_grid process as well.
+            print(f"{job_prefix(damask_job)} Stopping DAMASK_grid.")
+            await stop_damask_process(damask_process, damask_job)
+            raise
+        except Exception:
+            print(f"{job_prefix(damask_job)} Error while monitoring:")
+            print(traceback.format_exc())
+            await stop_damask_process(damask_process, damask_job)
+            increment_data.run_ended_succesfully = False
+
+        returncode = await damask_process.wait()
+        print(f"{job_prefix(damask_job)} DAMASK_grid exited with code {returncode}.")
+        if returncode == 1:
+            print(f"{job_prefix(damask_job)} DAMASK_grid reported an error, see the log file: {damask_job.runtime.log_file}")
+            increment_data.run_ended_succesfully = False
+
+        await asyncio.to_thread(finish_live_plots, damask_job)
+        convergence_telemetry.update()
+        damask_job.convergence_summary = convergence_telemetry.summary()
+        progress_feed.job_ended(increment_data.run_ended_succesfully, increment_data, damask_job.convergence_summary)
+        damask_job.increment_data = increment_data
+        damask_job.wall_time = time.time() - start_time
+        damask_job.monitor_profile = profiler.summary()
+
+    # Storing and post-processing of results is done for one job at a time.
+    async with job_finished_lock:
+        await asyncio.to_thread(job_finished, damask_job, increment_data.run_ended_succesfully)
+
+    return increment_data.run_ended_succesfully
+
+async def supervise_damask_jobs(
+        problem_definition: ProblemDefinition,
+        damask_jobs: list[DamaskJobTypes],
+        parallel_jobs: int,
+        job_finished: Callable[[DamaskJobTypes, bool], None]) -> list[bool]:
+    slots = asyncio.Semaphore(parallel_jobs)
+    job_finished_lock = asyncio.Lock()
+    # The jobs are started in the given order (see solver.job_ordering), at most parallel_jobs at the same time.
+    job_tasks = [supervise_damask_job(problem_definition, damask_job, slots, job_finished, job_finished_lock) for damask_job in damask_jobs]
+    return await asyncio.gather(*job_tasks)
+
+def run_and_monitor_damask_jobs_in_parallel(
+        problem_definition: ProblemDefinition,
+        damask_jobs: list[DamaskJobTypes],
+        parallel_jobs: int,
+        job_finished: Callable[[DamaskJobTypes, bool], None]) -> bool:
+    # Returns if all jobs ended successfully.
+    if len(damask_jobs) == 0:
+        return True
+    try:
+        runs_ended_succesfully = asyncio.run(supervise_damask_jobs(problem_definition, damask_jobs, parallel_jobs, job_finished))
+    except KeyboardInterrupt:
+        print("")
+        print("Ctrl+c pressed, stopped all running DAMASK_grid processes.")
+        return False
+    return all(runs_ended_succesfully)
@@ -13,9 +13,17 @@ from .pre_processor.summarize_tasks import summarize_tasks
 from .post_processor.yield_surfaces import general_functions
 from .damask_monitor.pre_processor.damask_pre_processor import pre_process_damask_files
 from .damask_monitor.simulation.damask_monitor import run_and_monitor_damask
+from .damask_monitor.simulation.mpi_tuner import tune_mpi_split
+from .damask_monitor.simulation.numerics_tuner import tune_numerics, record_numerics_run
+from .damask_monitor.simulation.parallel_monitor import run_and_monitor_damask_jobs_in_parallel
 from .damask_monitor.post_processor.job_post_processing import run_post_processing_job
+from .damask_monitor.pre_processor.grid_conversion_cache import remove_grid_cache
 from .post_processor.fit_yield_surface import fit_yield_surface_problem_definition
 from .post_processor.elastic_tensor_fitting import calculate_elastic_tensor_main
+from .pre_processor.adaptive_yield_surface_sampling import adaptive_sampling_is_used, create_adaptive_yield_surface_jobs
+from .common_functions.job_cost_model import record_job_timing
+from .damask_monitor.common_classes_damask_monitor.monitor_profiler import report_monitor_profile
+from .common_functions.campaign_journal import journal_queued_jobs, interrupted_job_state, update_job_state
 from .messages.messages import Messages
 
 def remove_damask_files(damask_job: DamaskJobTypes):
@@ -25,6 +33,110 @@ def remove_damask_files(damask_job: DamaskJobTypes):
         print(f"Error: {e}")
         print("Failed to clean damask_files folder, see above reason why!")
 
+def prepare_job(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes) -> tuple[ProblemDefinition, DamaskJobTypes, str]:
+    # Jobs of an earlier, interrupted run of the project are resumed or only post-processed.
+    (interrupted_state, last_increment) = interrupted_job_state(problem_definition, damask_job)
+    damask_job.keep_damask_files = not interrupted_state == 'new'
+
+    # Pre-process files needed to run DAMASK_grid per job
+    (problem_definition, damask_job) = pre_process_damask_files(problem_definition, damask_job)
+
+    match interrupted_state:
+        case 'finished':
+            Messages.Main.job_finished_in_earlier_run(damask_job.field_name)
+        case 'resume':
+            Messages.Main.resuming_interrupted_job(damask_job.field_name, last_increment)
+            damask_job.restart_increment = last_increment
+        case _:
+            pass
+
+    return problem_definition, damask_job, interrupted_state
+
+def finish_job(problem_definition: ProblemDefinition, damask_job: DamaskJobTypes, run_ended_succesfully: bool, interrupted_state: str) -> bool:
+    # Stores the state of a job that was run and post-processes it. Returns if the run succeeded.
+    if not problem_definition.general.path.postprocessing_only:
+        # Keep track of the run times, these are used to estimate the run time of future jobs.
+        if run_ended_succesfully and interrupted_state == 'new':
+            record_job_timing(problem_definition, damask_job)
+        update_job_state(problem_definition, damask_job, 'finished' if run_ended_succesfully else 'failed')
+
+    if not run_ended_succesfully:
+        print("There seems to have been an error while running damask, skipping post process!")
+        return run_ended_succesfully
+
+    # Do nesscecary post procssing steps for this job.
+    post_process_completed = run_post_processing_job(problem_definition, damask_job)
+    if not problem_definition.general.path.postprocessing_only:
+        update_job_state(problem_definition, damask_job, 'post_processed')
+        # The convergence and yield stress of the numerics used, for the numerics tuning (only when solver.numerics_tuning is set).
+        if interrupted_state == 'new':
+            record_numerics_run(problem_definition, damask_job)
+
+    # Clear the damask simulation files if needed.
+    if problem_definition.general.remove_damask_files_after_job_completion:
+        remove_damask_files(damask_job)
+        print("Cleaned up the damask_files folder.")
+
+    print("")
+    print(f"Job was completed succesfully: {post_process_completed}")
+    print("")
+
+    return run_ended_succesfully
+
+def run_jobs_in_parallel(problem_definition: ProblemDefinition, jobs: list[DamaskJobTypes], parallel_jobs: int) -> bool:
+    # Runs up to parallel_jobs DAMASK_grid processes at the same time, supervised by a single (asyncio) monitor.
+    all_jobs_succeseeded = True
+    interrupted_states: dict[int, str] = dict()
+    jobs_to_run: list[DamaskJobTypes] = []
+    for damask_job in jobs:
+        (problem_definition, damask_job, interrupted_state) = prepare_job(problem_definition, damask_job)
+        if interrupted_state == 'finished':
+            all_jobs_succeseeded = finish_job(problem_definition, damask_job, True, interrupted_state) and all_jobs_succeseeded
+        else:
+            interrupted_states[id(damask_job)] = interrupted_state
+            jobs_to_run.append(damask_job)
+
+    def job_finished(damask_job: DamaskJobTypes, run_ended_succesfully: bool) -> None:
+        finish_job(problem_definition, damask_job, run_ended_succesfully, interrupted_states[id(damask_job)])
+
+    runs_succeeded = run_and_monitor_damask_jobs_in_parallel(problem_definition, jobs_to_run, parallel_jobs, job_finished)
+    return runs_succeeded and all_jobs_succeseeded
+
+def run_jobs(problem_definition: ProblemDefinition, jobs: list[DamaskJobTypes]) -> bool:
+    # Runs (or only post-processes) the jobs. Returns if all jobs succeeded.
+    all_jobs_succeseeded = True
+    if not problem_definition.general.path.postprocessing_only:
+        journal_queued_jobs(problem_definition, jobs)
+
+        parallel_jobs = getattr(problem_definition.solver, "parallel_jobs", 1)
+        if parallel_jobs > 1:
+            return run_jobs_in_parallel(problem_definition, jobs, parallel_jobs)
+
+    for damask_job in jobs:
+
+        # Run either the normal procedure or run the postprocessing mode.
+        if problem_definition.general.path.postprocessing_only:
+            (problem_definition, damask_job) = pre_process_damask_files(problem_definition, damask_job)
+            print(f"Skip execution of job {damask_job.job_number} of {damask_job.total_jobs}: postprocessing_only flag is on")
+            run_ended_succesfully = True
+            interrupted_state = 'new'
+
+        else:
+            (problem_definition, damask_job, interrupted_state) = prepare_job(problem_definition, damask_job)
+
+            if interrupted_state == 'finished':
+                run_ended_succesfully = True
+            else:
+                update_job_state(problem_definition, damask_job, 'running')
+
+                # Run the job
+                run_ended_succesfully, damask_job = run_and_monitor_damask(problem_definition, damask_job)
+
+        if not finish_job(problem_definition, damask_job, run_ended_succesfully, interrupted_state):
+            all_jobs_succeseeded = False
+
+    return all_jobs_succeseeded
+
 def main_loop(project_name_input: str, scripts_folder: str, skip_checks: bool = False):
     Messages.Main.Banners.start_pre_process()
 
@@ -66,44 +178,37 @@ def main_loop(project_name_input: str, scripts_folder: str, skip_checks: bool =
 
     Messages.Main.Banners.start_simulations()
 
-    all_jobs_succeseeded = True
-    for damask_job in jobs:
+    # Pick the fastest MPI rank/thread split for this grid (only when solver.mpi_auto_tune is set).
+    if not problem_definition.general.path.postprocessing_only:
+        problem_definition = tune_mpi_split(problem_definition)
+        # Pick the cheapest tolerances that keep the yield stress within solver.numerics_yield_tolerance (only when solver.numerics_tuning is set).
+        # The calibration run with the numerics that are used is the result of its job, this job is not run again.
+        (problem_definition, jobs) = tune_numerics(problem_definition, jobs)
 
-        # Run either the normal procedure or run the postprocessing mode.
-        if problem_definition.general.path.postprocessing_only:
-            (problem_definition, damask_job) = pre_process_damask_files(problem_definition, damask_job)
-            print(f"Skip execution of job {damask_job.job_number} of {damask_job.total_jobs}: postprocessing_only flag is on")
-            run_ended_succesfully = True
-            all_jobs_succeseeded = True
+    all_jobs_succeseeded = run_jobs(problem_definition, jobs)
+    jobs_run = list(jobs)
 
-        else:
-            # Pre-process files needed to run DAMASK_grid per job
-            (problem_definition, damask_job) = pre_process_damask_files(problem_definition, damask_job)
-
-            # Run the job
-            run_ended_succesfully, damask_job = run_and_monitor_damask(problem_definition, damask_job)
-        if not run_ended_succesfully:
-            all_jobs_succeseeded = False
-            print("There seems to have been an error while running damask, skipping post process!")
-            continue
+    # In adaptive sampling of the yield surface, keep adding batches of jobs until the provisional surface converged.
+    while all_jobs_succeseeded and adaptive_sampling_is_used(problem_definition):
+        (problem_definition, jobs) = create_adaptive_yield_surface_jobs(problem_definition)
+        if len(jobs) == 0:
+            break
+        all_jobs_succeseeded = run_jobs(problem_definition, jobs)
+        jobs_run += jobs
 
-        # Do nesscecary post procssing steps for this job.
-        post_process_completed = run_post_processing_job(problem_definition, damask_job)
+    # Where the time of the damask monitor went (only with solver.monitor_profiling).
+    report_monitor_profile(problem_definition, jobs_run)
+    number_of_jobs_run = len(jobs_run)
 
-        # Clear the damask simulation files if needed.
-        if problem_definition.general.remove_damask_files_after_job_completion:
-            remove_damask_files(damask_job)
-            print("Cleaned up the damask_files folder.")
+    # The converted grid is only needed while jobs are prepared.
+    if problem_definition.general.remove_damask_files_after_job_completion:
+        remove_grid_cache(problem_definition)
 
-        print("")
-        print(f"Job was completed succesfully: {post_process_completed}")
-        print("")
-        
     # run jobs and store results
     
     match all_jobs_succeseeded:
         case True:
-            print(f"All {len(jobs)} job(s) succeeded!")
+            print(f"All {number_of_jobs_run} job(s) succeeded!")
         case False:
             print("Not all simulations ended succesfully. Review the logs for the possible cause.")
             Messages.Main.Banners.simulations_completed()
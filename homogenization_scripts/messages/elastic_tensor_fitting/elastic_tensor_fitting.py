@@ -26,6 +26,14 @@ class ElasticTensor:
         print(textwrap.fill(error_string,width=80))
         print("")
 
+    def synthesized_combined_directions(self, synthesized_fields: list[str]) -> None:
+        print("")
+        print(textwrap.fill(f"Superposition: {len(synthesized_fields)} combined direction(s) synthesized from the uni-axial strain steps: {', '.join(synthesized_fields)}", width=80))
+
+    def missing_uniaxial_directions_for_superposition(self, missing_fields: list[str]) -> None:
+        print("")
+        print(textwrap.fill(f"Superposition: combined directions could not be synthesized, uni-axial strain step(s) missing: {', '.join(missing_fields)}", width=80))
+
     def fitting_type_to_dataset(self, elastic_tensor_name: str) -> None:
         print("")
         print(textwrap.fill(f"Fitting components of the {elastic_tensor_name} elastic tensor to dataset.", width=80))
@@ -44,4 +44,10 @@ vvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvv
 """)
 
     def user_did_not_run_queued_jobs(self) -> None:
-        print("Stopping...")
\ No newline at end of file
+        print("Stopping...")
+
+    def resuming_interrupted_job(self, field_name: str, restart_increment: int) -> None:
+        print(f"Job {field_name} was interrupted in an earlier run, resuming DAMASK_grid from increment {restart_increment}.")
+
+    def job_finished_in_earlier_run(self, field_name: str) -> None:
+        print(f"DAMASK_grid already finished job {field_name} in an earlier run, only post-processing the results.")
@@ -18,6 +18,26 @@ class YieldSurface:
     def reading_dataset_from(self, dataset_path: str) -> None:
         print(f"Reading dataset from .csv file: {dataset_path}")
 
+    def adaptive_sampling_change(self, max_relative_change: float, tolerance: float) -> None:
+        print(f"Adaptive sampling: largest change of predicted yield stress since last batch: {max_relative_change*100:.2f}% (tolerance: {tolerance*100:.2f}%)")
+
+    def adaptive_sampling_next_batch(self, field_names: list[str], number_simulated: int, number_candidates: int) -> None:
+        print("")
+        print(f"Adaptive sampling: {number_simulated} of {number_candidates} candidate stress states simulated.")
+        print(f"Next batch of stress states: {', '.join(field_names)}")
+        print("")
+
+    def adaptive_sampling_finished(self, number_simulated: int, number_candidates: int, reason: str) -> None:
+        print("")
+        print(f"Adaptive sampling finished ({reason}): {number_simulated} of {number_candidates} candidate stress states simulated.")
+        print("")
+
+    def pruned_equivalent_jobs(self, number_of_pruned_jobs: int, number_of_jobs: int, material_symmetry: str) -> None:
+        if number_of_pruned_jobs == 0:
+            return
+        print(f"{number_of_pruned_jobs} of {number_of_jobs} yield_surface jobs are equivalent to another job (material symmetry: {material_symmetry}).")
+        print("These results are derived from the equivalent job and are not simulated.")
+
     def creating_plot_at(self, display_name: str, plot_path: str) -> None:
         print(f"Creating a plot of {display_name} fit at {plot_path}")
 
@@ -20,6 +20,39 @@ from .elastic_tensor.types.anisotropic import elastic_tensor_anisotropic, initia
 from .elastic_tensor.algebraic_fitting import algebraic_fit_components
 from ..messages.messages import Messages
 
+uniaxial_directions = ["xx", "yy", "zz", "xy", "xz", "yz"]
+
+def synthesize_combined_directions(elastic_tensor_results: dict[str, dict[str, list[list[float]]]]) -> dict[str, dict[str, list[list[float]]]]:
+    # In the linear (elastic) regime, the response to a combined strain step equals the superposition of
+    # the responses to the uni-axial strain steps. Combined directions are loaded with 1/2*sqrt(2)*strain_step
+    # per direction (see create_elastic_strain_step), hence: result_a_b = 1/2*sqrt(2)*(result_a + result_b).
+    # Combined directions that have been simulated are kept as is.
+    missing_fields = [f"strain_{direction}" for direction in uniaxial_directions if not f"strain_{direction}" in elastic_tensor_results]
+    if len(missing_fields) > 0:
+        Messages.ElasticTensor.missing_uniaxial_directions_for_superposition(missing_fields)
+        return elastic_tensor_results
+
+    synthesized_fields: list[str] = []
+    for index_a, direction_a in enumerate(uniaxial_directions):
+        for direction_b in uniaxial_directions[index_a+1:]:
+            combined_name = f"strain_{direction_a}_{direction_b}"
+            if combined_name in elastic_tensor_results:
+                continue
+
+            result_a = elastic_tensor_results[f"strain_{direction_a}"]
+            result_b = elastic_tensor_results[f"strain_{direction_b}"]
+
+            combined_result: dict[str, list[list[float]]] = dict()
+            for field in ["stress", "strain"]:
+                combined_result[field] = (1/2*np.sqrt(2)*(np.array(result_a[field]) + np.array(result_b[field]))).tolist()
+
+            elastic_tensor_results[combined_name] = combined_result
+            synthesized_fields.append(combined_name)
+
+    Messages.ElasticTensor.synthesized_combined_directions(synthesized_fields)
+
+    return elastic_tensor_results
+
 def write_dataset(problem_definition: ProblemDefinition) -> ProblemDefinition:
     results_database = read_results_data(problem_definition)
 
@@ -27,14 +60,20 @@ def write_dataset(problem_definition: ProblemDefinition) -> ProblemDefinition:
     data_set_strain: list[list[list[float]]] = []
     result_names: list[Literal["strain_xx", "strain_yy", "strain_zz", "strain_xy", "strain_xz", "strain_yz"]] = []
     setting_field_names = ["strain_step"]
-    
+
+    elastic_tensor_results: dict[str, dict[str, list[list[float]]]] = dict()
     for keyname in results_database['elastic_tensor']:
         is_setting_field = keyname in setting_field_names
         if is_setting_field:
             continue
+        elastic_tensor_results[keyname] = results_database['elastic_tensor'][keyname] # type: ignore
 
-        data_point_stress: list[list[float]] = results_database['elastic_tensor'][keyname]['stress'] # type: ignore
-        data_point_strain: list[list[float]] = results_database['elastic_tensor'][keyname]['strain'] # type: ignore
+    if problem_definition.elastic_tensor.number_of_load_cases == "superposition":
+        elastic_tensor_results = synthesize_combined_directions(elastic_tensor_results)
+    
+    for keyname in elastic_tensor_results:
+        data_point_stress: list[list[float]] = elastic_tensor_results[keyname]['stress']
+        data_point_strain: list[list[float]] = elastic_tensor_results[keyname]['strain']
 
         result_names.append(keyname) # type: ignore
         data_set_stress.append(data_point_stress)
@@ -0,0 +1,203 @@
+# System packages
+import os
+import concurrent.futures
+import damask # type: ignore
+import numpy as np
+from numpy.typing import NDArray
+from pandas import DataFrame
+
+# Local packages
+from ..common_classes.problem_definition import Tensor
+from ..damask_monitor.post_processor.increment_history import IncrementHistory, averaged_values
+from ..damask_monitor.post_processor.interpolate_results import InterpolatedResults
+from ..damask_monitor.common_classes_damask_monitor.stop_conditions.yielding.modulus_degradation import modulus_degradation_yield_point
+from ..damask_monitor.common_classes_damask_monitor.stop_conditions.yielding.plastic_work import plastic_work_yield_point
+from ..damask_monitor.common_classes_damask_monitor.stop_conditions.yielding.stress_strain_curve_plasticity import slope_stress_strain_curve_yield_point
+
+# Batch extraction of yield points from DAMASK_grid result files (.hdf5), without a project, jobs or plots:
+#   yield_points = extract_yield_points(result_files, "stress_strain_curve", [0.001, 0.002, 0.005])
+# Every result file is read once (in parallel, one process per file), the homogenized curves of a file are used for all
+# yield definitions. A yield definition is a yield condition with its yield value, as in the problem definition:
+# - modulus_degradation: the relative change of the linear modulus
+# - plastic_work: the plastic work [J/m3]
+# - stress_strain_curve: the plastic strain offset in the loaded direction
+# condition and value can both be a list (pairwise), or one of them a single value that is used for all of the other.
+# The result is a structured array with one row per result file and yield definition, see yield_point_fields.
+# The stress_strain_curve condition needs the loaded direction, this is the largest strain component of the last increment
+# (as in the uniaxial load cases of the yield point and yield surface jobs).
+# A result file that can not be read or post-processed gives rows with the error, the other files are still extracted.
+
+yield_conditions = ["modulus_degradation", "plastic_work", "stress_strain_curve"]
+
+# The tensor types by name, as in the problem definition (see set_tensors in read_input_file.py)
+stress_tensor_types = {'PK1': Tensor.Stress.PK1, 'PK2': Tensor.Stress.PK2, 'Cauchy': Tensor.Stress.Cauchy}
+strain_tensor_types = {'true_strain': Tensor.Strain.TrueStrain, 'Green_Lagrange': Tensor.Strain.GreenLagrange}
+
+yield_point_fields = np.dtype([
+    ('result_file', 'U256'),
+    ('condition', 'U32'),
+    ('value', 'f8'),
+    ('yield_found', '?'),
+    ('increment_before', 'i8'),
+    ('increment_after', 'i8'),
+    ('fraction', 'f8'),
+    ('stress', 'f8', (3, 3)),
+    ('strain', 'f8', (3, 3)),
+    ('plastic_strain', 'f8', (3, 3)),
+    ('Wp', 'f8'),
+    ('error', 'U256'),
+])
+
+def yield_definitions(condition: str | list[str], value: float | list[float]) -> list[tuple[str, float]]:
+    conditions = condition if isinstance(condition, list) else None
+    values = value if isinstance(value, list) else None
+    if conditions is None and values is None:
+        definitions = [(str(condition), float(value))] # type: ignore
+    elif conditions is None:
+        definitions = [(str(condition), float(value_i)) for value_i in values] # type: ignore
+    elif values is None:
+        definitions = [(str(condition_i), float(value)) for condition_i in conditions] # type: ignore
+    elif len(conditions) == len(values):
+        definitions = [(str(condition_i), float(value_i)) for (condition_i, value_i) in zip(conditions, values)]
+    else:
+        raise ValueError(f"Got {len(conditions)} yield conditions and {len(values)} yield values, these should be pairs.")
+    for (condition_i, _) in definitions:
+        if not condition_i in yield_conditions:
+            raise ValueError(f"Unknown yield condition {condition_i}, use one of {yield_conditions}")
+    return definitions
+
+def loaded_direction_of(strain: NDArray[np.float64]) -> list[list[bool]]:
+    (i, j) = np.unravel_index(np.argmax(np.abs(strain)), (3, 3))
+    return [[(k, l) == (i, j) for l in range(3)] for k in range(3)]
+
+def read_increment_history_of_file(
+        result_file: str,
+        stress_tensor_type: str,
+        strain_tensor_type: str,
+        xi_averaging: str,
+        include_Wp: bool) -> IncrementHistory:
+    damask_results = damask.Result(result_file)
+    increment_history = IncrementHistory([int(increment) for increment in damask_results.increments_in_range()], 'result file')
+    (increment_history.stress_averaged_per_increment,
+     increment_history.strain_averaged_per_increment,
+     increment_history.plastic_strain_averaged_per_increment,
+     increment_history.Wp_per_increment) = averaged_values(damask_results, stress_tensor_types[stress_tensor_type](), strain_tensor_types[strain_tensor_type](), xi_averaging, include_Wp)
+    increment_history.increments_read = len(increment_history.increments)
+    return increment_history
+
+def yield_point_of_history(
+        increment_history: IncrementHistory,
+        condition: str,
+        value: float,
+        interpolation_method: str) -> InterpolatedResults | None:
+    match condition:
+        case 'modulus_degradation':
+            return modulus_degradation_yield_point(value, increment_history, interpolation_method)
+        case 'plastic_work':
+            return plastic_work_yield_point(value, increment_history, interpolation_method)
+        case 'stress_strain_curve':
+            loaded_directions = loaded_direction_of(increment_history.strain_averaged_per_increment[-1])
+            return slope_stress_strain_curve_yield_point(value, loaded_directions, increment_history, interpolation_method)
+        case _:
+            raise ValueError(f"Unknown yield condition {condition}, use one of {yield_conditions}")
+
+def yield_point_row(result_file: str, condition: str, value: float, interpolated_results: InterpolatedResults | None, error: str = '') -> tuple: # type: ignore
+    if interpolated_results is None:
+        not_found = np.full((3, 3), np.nan)
+        return (result_file, condition, value, False, -1, -1, np.nan, not_found, not_found, not_found, np.nan, error)
+    return (result_file, condition, value, True,
+            interpolated_results.iteration_1, interpolated_results.iteration_2, interpolated_results.interpolation_fraction,
+            interpolated_results.stress, interpolated_results.strain, interpolated_results.plastic_strain, float(interpolated_results.wp), error)
+
+def error_rows(result_file: str, definitions: list[tuple[str, float]], error: Exception) -> list[tuple]: # type: ignore
+    print(f"Could not extract the yield points of {result_file}: {error}")
+    return [yield_point_row(result_file, condition, value, None, f"{type(error).__name__}: {error}") for (condition, value) in definitions]
+
+def extract_yield_points_of_file(
+        result_file: str,
+        definitions: list[tuple[str, float]],
+        stress_tensor_type: str,
+        strain_tensor_type: str,
+        xi_averaging: str,
+        interpolation_method: str) -> list[tuple]: # type: ignore
+    # Runs in a worker process: one read of the result file, all yield definitions.
+    include_Wp = any(condition == 'plastic_work' for (condition, _) in definitions)
+    try:
+        increment_history = read_increment_history_of_file(result_file, stress_tensor_type, strain_tensor_type, xi_averaging, include_Wp)
+    except Exception as error:
+        return error_rows(result_file, definitions, error)
+
+    rows = []
+    for (condition, value) in definitions:
+        if len(increment_history.increments) < 3:
+            interpolated_results = None
+        else:
+            try:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    interpolated_results = yield_point_of_history(increment_history, condition, value, interpolation_method)
+            except Exception as error:
+                rows += error_rows(result_file, [(condition, value)], error)
+                continue
+        rows.append(yield_point_row(result_file, condition, value, interpolated_results))
+    return rows
+
+def extract_yield_points(
+        result_files: list[str],
+        condition: str | list[str],
+        value: float | list[float],
+        stress_tensor_type: str = "Cauchy",
+        strain_tensor_type: str = "true_strain",
+        xi_averaging: str = "endpoint",
+        interpolation_method: str = "linear",
+        processes: int | None = None) -> NDArray: # type: ignore
+    definitions = yield_definitions(condition, value)
+    if not stress_tensor_type in stress_tensor_types:
+        raise ValueError(f"Unknown stress tensor type {stress_tensor_type}, use one of {list(stress_tensor_types)}")
+    if not strain_tensor_type in strain_tensor_types:
+        raise ValueError(f"Unknown strain tensor type {strain_tensor_type}, use one of {list(strain_tensor_types)}")
+    result_files = [os.path.abspath(result_file) for result_file in result_files]
+    if processes is None:
+        processes = min(len(result_files), os.cpu_count() or 1)
+
+    rows_per_file: list[list[tuple]] = [] # type: ignore
+    if processes <= 1:
+        for result_file in result_files:
+            rows_per_file.append(extract_yield_points_of_file(result_file, definitions, stress_tensor_type, strain_tensor_type, xi_averaging, interpolation_method))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [executor.submit(extract_yield_points_of_file, result_file, definitions, stress_tensor_type, strain_tensor_type, xi_averaging, interpolation_method)
+                       for result_file in result_files]
+            for (result_file, future) in zip(result_files, futures):
+                # i.e. a worker process that crashed, only the rows of its result file are lost.
+                try:
+                    rows_per_file.append(future.result())
+                except Exception as error:
+                    rows_per_file.append(error_rows(result_file, definitions, error))
+
+    return np.array([row for rows in rows_per_file for row in rows], dtype=yield_point_fields)
+
+def find_result_files(paths: list[str]) -> list[str]:
+    # Result files given directly, or all .hdf5 files in the given folders (i.e. the damask_files folder of a project).
+    # The restart files of DAMASK_grid and the temporary copies of the monitor in these folders are not result files.
+    result_files: list[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            for (folder, _, file_names) in os.walk(path):
+                result_files += [os.path.join(folder, file_name) for file_name in sorted(file_names)
+                                 if file_name.endswith('.hdf5') and not file_name.endswith('_restart.hdf5') and not file_name.endswith('_temporary.hdf5')]
+        else:
+            result_files.append(path)
+    return result_files
+
+def write_yield_points_to_file(yield_points: NDArray, output_path: str) -> None: # type: ignore
+    # One row per result file and yield definition, tensors in (Voigt ordered) components as in the results database.
+    components = [('xx', 0, 0), ('yy', 1, 1), ('zz', 2, 2), ('yz', 1, 2), ('xz', 0, 2), ('xy', 0, 1)]
+    columns: dict[str, NDArray] = {} # type: ignore
+    for field in ['result_file', 'condition', 'value', 'yield_found', 'increment_before', 'increment_after', 'fraction']:
+        columns[field] = yield_points[field]
+    for tensor in ['stress', 'strain', 'plastic_strain']:
+        for (name, i, j) in components:
+            columns[f"{tensor}_{name}"] = yield_points[tensor][:, i, j]
+    columns['Wp'] = yield_points['Wp']
+    columns['error'] = yield_points['error']
+    DataFrame(columns).to_csv(output_path, index=False)
@@ -0,0 +1,260 @@
+# System packages
+import os
+import numpy as np
+from numpy.typing import NDArray
+import pandas as pd
+from pandas import DataFrame
+import scipy # type: ignore
+import scipy.optimize # type: ignore
+
+# Local packages
+from ..common_classes.damask_job import DamaskJob, DamaskJobTypes, create_multiaxial_yield_points_set_names, create_multiaxial_yield_point_for_yield_locus
+from ..common_classes.problem_definition import ProblemDefinition
+from ..common_functions.read_results_database_file import read_results_data
+from ..common_functions.consolelog import suppress_console_logging, restore_console_logging
+from ..post_processor.yield_surfaces.general_functions import fit_surface
+from ..post_processor.yield_surfaces.hill48 import Hill
+from ..post_processor.yield_surfaces.cazacu_plunkett_barlat import CazacuPlunkettBarlat
+from ..post_processor.yield_surfaces.yield_surface_template import YieldSurfaces
+from ..messages.messages import Messages
+from .yield_surface_job_planner import prune_equivalent_yield_surface_jobs, target_stress_as_array
+
+# Adaptive sampling of the yield surface (yield_surface.adaptive_sampling = True).
+# The candidate stress states are the ones of automatic stress state creation (load_points_per_quadrant).
+# Only the axes of each plane are simulated first. After every batch of jobs, a provisional yield surface
+# is fitted and the next batch is taken at the candidates with the highest score:
+#   score = (angle to the closest simulated stress state) * (1 + curvature of the provisional yield locus)
+# Sampling stops when the predicted yield stresses of all candidates change less than adaptive_tolerance
+# between batches, when all candidates are simulated or when adaptive_max_jobs is reached.
+
+Voigt_notation = ['stress_xx', 'stress_yy', 'stress_zz', 'stress_yz', 'stress_xz', 'stress_xy']
+
+def adaptive_sampling_is_used(problem_definition: ProblemDefinition) -> bool:
+    if not problem_definition.general.simulation_type == 'yield_surface':
+        return False
+    if not problem_definition.yield_surface.stress_state_creation == 'automatic':
+        return False
+    return getattr(problem_definition.yield_surface, "adaptive_sampling", False)
+
+def candidate_field_names(problem_definition: ProblemDefinition) -> list[str]:
+    if not problem_definition.general.dimensions == '3D':
+        raise Exception(f"Adaptive sampling of the yield surface is not yet implemented for dimensions = {problem_definition.general.dimensions}")
+
+    field_names: list[str] = []
+    for plane in ['x_y', 'x_z', 'y_z']:
+        field_names = field_names + create_multiaxial_yield_points_set_names(problem_definition, plane)
+    return field_names
+
+def initial_required_results(problem_definition: ProblemDefinition) -> dict[str, dict[str, bool]]:
+    # The first batch consists of the axes of every plane (point 0 of each quadrant, independent of load_points_per_quadrant).
+    required_results: dict[str, dict[str, bool]] = dict()
+    required_results['yield_surface'] = dict()
+
+    for field_name in candidate_field_names(problem_definition):
+        if field_name.endswith("_0"):
+            required_results['yield_surface'][field_name] = True
+
+    return required_results
+
+def create_candidate_jobs(problem_definition: ProblemDefinition) -> dict[str, DamaskJob.YieldPointMultiaxial]:
+    field_names = candidate_field_names(problem_definition)
+    candidate_jobs: dict[str, DamaskJob.YieldPointMultiaxial] = dict()
+    for field_name in field_names:
+        candidate_jobs[field_name] = create_multiaxial_yield_point_for_yield_locus(problem_definition, field_name, field_names)[0]
+    return candidate_jobs
+
+def stress_direction(damask_job: DamaskJob.YieldPointMultiaxial) -> NDArray[np.float64]:
+    # Unit vector of the target stress (Voigt notation).
+    stress = target_stress_as_array(damask_job)
+    stress_Voigt = np.array([stress[0][0], stress[1][1], stress[2][2], stress[1][2], stress[0][2], stress[0][1]])
+    return stress_Voigt / np.linalg.norm(stress_Voigt)
+
+def read_simulated_yield_points(problem_definition: ProblemDefinition, field_names: list[str]) -> tuple[list[str], DataFrame]:
+    # Returns the candidates present in the results_database and a data set of the ones that show yielding.
+    results_database_exists = os.path.exists(problem_definition.general.path.results_database_file)
+    results_yield_surface = read_results_data(problem_definition).get('yield_surface', {}) if results_database_exists else {}
+
+    simulated_field_names: list[str] = []
+    data_set_rows: list[dict[str, float | str]] = []
+    for field_name in field_names:
+        yield_point = results_yield_surface.get(field_name)
+        if yield_point is None:
+            continue
+        simulated_field_names.append(field_name)
+
+        if yield_point[0][0] == "NO_YIELD_DETECTED": # type: ignore
+            continue
+
+        data_set_rows.append({
+            'field_name': field_name,
+            'stress_xx': yield_point[0][0], # type: ignore
+            'stress_yy': yield_point[1][1], # type: ignore
+            'stress_zz': yield_point[2][2], # type: ignore
+            'stress_yz': yield_point[1][2], # type: ignore
+            'stress_xz': yield_point[0][2], # type: ignore
+            'stress_xy': yield_point[0][1], # type: ignore
+        })
+
+    data_set = DataFrame(data_set_rows, columns=['field_name'] + Voigt_notation)
+
+    # Mirror the data in case of tensile/compressive symmetry, same as read_yield_points
+    if problem_definition.yield_surface.assume_tensile_compressive_symmetry and len(data_set) > 0:
+        data_set_symmetric = data_set.copy()
+        data_set_symmetric[Voigt_notation] = -data_set_symmetric[Voigt_notation]
+        data_set_symmetric['field_name'] = data_set['field_name'] + '_sym'
+        data_set = pd.concat([data_set, data_set_symmetric], ignore_index=True)
+
+    return simulated_field_names, data_set
+
+def fit_provisional_yield_surface(problem_definition: ProblemDefinition, data_set: DataFrame) -> YieldSurfaces:
+    yield_stress_ref = problem_definition.yield_surface.yield_stress_ref
+    adaptive_fit_criterion = getattr(problem_definition.yield_surface, "adaptive_fit_criterion", "Hill")
+
+    # The fit is repeated for every batch, keep the console clean.
+    suppress_console_logging()
+    try:
+        match adaptive_fit_criterion:
+            case 'Hill':
+                yield_surface = fit_surface(Hill(), data_set, yield_stress_ref)
+            case 'Cazacu-Plunkett-Barlat':
+                number_optimization_coefficients = CazacuPlunkettBarlat().number_optimization_coefficients()
+                initial_guess: list[float] = np.ones(number_optimization_coefficients).tolist()
+                initial_guess[-1] = 4
+                bounds = [(0, 1)] + [(0, None)] * 9 + [(1.5, None)]
+                yield_surface = fit_surface(CazacuPlunkettBarlat(), data_set, yield_stress_ref, initial_guess, bounds)
+            case _:
+                raise Exception(f"Adaptive sampling with a provisional {adaptive_fit_criterion} yield surface is not yet implemented!")
+    finally:
+        restore_console_logging()
+
+    return yield_surface
+
+def predicted_yield_stress(yield_surface: YieldSurfaces, direction: NDArray[np.float64], estimated_yield: float) -> float:
+    # Magnitude (in Pa) of the yield stress in direction as predicted by the yield surface (root of evaluate along the direction).
+    unit_conversion = yield_surface.unit_conversion()
+    def yield_function(magnitude: float) -> float:
+        return yield_surface.evaluate(direction * magnitude * unit_conversion) # type: ignore
+
+    upper_bound = estimated_yield
+    for _ in range(60):
+        if yield_function(upper_bound) > 0:
+            break
+        upper_bound = 2 * upper_bound
+    else:
+        return np.nan
+
+    if yield_function(0.) >= 0:
+        return np.nan
+
+    return float(scipy.optimize.brentq(yield_function, 0., upper_bound, xtol=1e-6*estimated_yield)) # type: ignore
+
+def curvature_per_candidate(candidate_jobs: dict[str, DamaskJob.YieldPointMultiaxial], predictions: dict[str, float], period: float) -> dict[str, float]:
+    # Relative second difference of the predicted yield stress along the angle in each plane.
+    groups: dict[str, list[str]] = dict()
+    for field_name in candidate_jobs:
+        group_name = field_name.rsplit("_q", 1)[0]
+        groups.setdefault(group_name, []).append(field_name)
+
+    curvature: dict[str, float] = dict()
+    for group_field_names in groups.values():
+        group_field_names = sorted(group_field_names, key=lambda name: candidate_jobs[name].angle_in_plane % period)
+        number_in_group = len(group_field_names)
+        for index, field_name in enumerate(group_field_names):
+            if number_in_group < 3:
+                curvature[field_name] = 0.
+                continue
+            previous_value = predictions[group_field_names[index - 1]]
+            next_value = predictions[group_field_names[(index + 1) % number_in_group]]
+            value = predictions[field_name]
+            curvature[field_name] = abs(previous_value - 2*value + next_value) / value if value > 0 else 0.
+            if np.isnan(curvature[field_name]):
+                curvature[field_name] = 0.
+
+    return curvature
+
+def select_next_batch(candidate_jobs: dict[str, DamaskJob.YieldPointMultiaxial],
+                      simulated_field_names: list[str],
+                      curvature: dict[str, float],
+                      batch_size: int,
+                      symmetry: bool) -> list[str]:
+    # Greedy selection, a selected candidate counts as simulated for the remaining selection of this batch.
+    # With tensile/compressive symmetry, the opposite direction of a simulated stress state counts as simulated as well.
+    directions = {field_name: stress_direction(job) for field_name, job in candidate_jobs.items()}
+    sampled_directions = [directions[field_name] for field_name in simulated_field_names]
+
+    remaining_field_names = [field_name for field_name in candidate_jobs if not field_name in simulated_field_names]
+    selected_field_names: list[str] = []
+
+    for _ in range(min(batch_size, len(remaining_field_names))):
+        scores: list[float] = []
+        for field_name in remaining_field_names:
+            if len(sampled_directions) == 0:
+                angular_gap = np.pi
+            else:
+                cosines = np.clip(np.array(sampled_directions) @ directions[field_name], -1., 1.)
+                if symmetry:
+                    cosines = np.abs(cosines)
+                angular_gap = float(np.min(np.arccos(cosines)))
+            scores.append(angular_gap * (1 + curvature.get(field_name, 0.)))
+
+        best_field_name = remaining_field_names[int(np.argmax(scores))]
+        selected_field_names.append(best_field_name)
+        sampled_directions.append(directions[best_field_name])
+        remaining_field_names.remove(best_field_name)
+
+    return selected_field_names
+
+def create_adaptive_yield_surface_jobs(problem_definition: ProblemDefinition) -> tuple[ProblemDefinition, list[DamaskJobTypes]]:
+    # Fits a provisional yield surface to the results so far and returns the next batch of jobs.
+    # An empty list is returned when sampling has converged.
+    batch_size = getattr(problem_definition.yield_surface, "adaptive_batch_size", 4)
+    tolerance = getattr(problem_definition.yield_surface, "adaptive_tolerance", 0.02)
+
+    candidate_jobs = create_candidate_jobs(problem_definition)
+    max_jobs = getattr(problem_definition.yield_surface, "adaptive_max_jobs", len(candidate_jobs))
+
+    (simulated_field_names, data_set) = read_simulated_yield_points(problem_definition, list(candidate_jobs.keys()))
+
+    remaining_candidates = len(candidate_jobs) - len(simulated_field_names)
+    if remaining_candidates == 0 or len(simulated_field_names) >= max_jobs:
+        Messages.YieldSurface.adaptive_sampling_finished(len(simulated_field_names), len(candidate_jobs), "all candidates or adaptive_max_jobs reached")
+        return problem_definition, []
+
+    yield_surface = fit_provisional_yield_surface(problem_definition, data_set)
+
+    predictions: dict[str, float] = dict()
+    for field_name, job in candidate_jobs.items():
+        if 'tensile' in field_name:
+            estimated_yield = problem_definition.yielding_condition.estimated_tensile_yield
+        else:
+            estimated_yield = problem_definition.yielding_condition.estimated_shear_yield
+        predictions[field_name] = predicted_yield_stress(yield_surface, stress_direction(job), estimated_yield)
+
+    # Convergence: the provisional surface does not change anymore at any of the candidates.
+    previous_predictions: dict[str, float] | None = getattr(problem_definition.yield_surface, "adaptive_previous_predictions", None)
+    problem_definition.yield_surface.adaptive_previous_predictions = predictions
+    if previous_predictions is not None:
+        relative_changes = [abs(predictions[name] - previous_predictions[name]) / previous_predictions[name] for name in predictions]
+        max_relative_change = float(np.nanmax(relative_changes))
+        Messages.YieldSurface.adaptive_sampling_change(max_relative_change, tolerance)
+        if max_relative_change < tolerance:
+            Messages.YieldSurface.adaptive_sampling_finished(len(simulated_field_names), len(candidate_jobs), "provisional yield surface converged")
+            return problem_definition, []
+
+    period = 180. if problem_definition.yield_surface.assume_tensile_compressive_symmetry else 360.
+    curvature = curvature_per_candidate(candidate_jobs, predictions, period)
+
+    batch_size = min(batch_size, max_jobs - len(simulated_field_names))
+    symmetry = problem_definition.yield_surface.assume_tensile_compressive_symmetry
+    next_field_names = select_next_batch(candidate_jobs, simulated_field_names, curvature, batch_size, symmetry)
+    Messages.YieldSurface.adaptive_sampling_next_batch(next_field_names, len(simulated_field_names), len(candidate_jobs))
+
+    damask_jobs: list[DamaskJobTypes] = [candidate_jobs[field_name] for field_name in next_field_names]
+    damask_jobs = prune_equivalent_yield_surface_jobs(problem_definition, damask_jobs)
+
+    total_number_damask_jobs = len(damask_jobs)
+    for damask_job_index in range(total_number_damask_jobs):
+        damask_jobs[damask_job_index].job_number = damask_job_index + 1
+        damask_jobs[damask_job_index].total_jobs = total_number_damask_jobs
+
+    return problem_definition, damask_jobs
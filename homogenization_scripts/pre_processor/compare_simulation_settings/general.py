@@ -3,6 +3,7 @@ from typing import Union
 
 # Local packages
 from ...common_classes.problem_definition import ProblemDefinition
+from ...common_functions.input_fingerprint import input_files, fingerprint_matches
 
 def compare_general_settings(
         problem_definition: ProblemDefinition, 
@@ -12,17 +13,32 @@ def compare_general_settings(
     reasons: list[str] = []
 
     existing_general_settings = existing_results['general_settings']
-    if not existing_general_settings['material_properties'] == problem_definition.general.path.material_properties:
-        differences_detected = True
-        reasons.append("material_properties path changed")
+    stored_fingerprints = existing_general_settings.get('input_fingerprints')
+    if isinstance(stored_fingerprints, dict):
+        # The content of the input files is compared, not their path (see input_fingerprint.py)
+        current_input_files = input_files(problem_definition)
+        for (name, file_path) in current_input_files.items():
+            stored_fingerprint = stored_fingerprints.get(name)
+            if not isinstance(stored_fingerprint, dict) or not fingerprint_matches(file_path, stored_fingerprint):
+                differences_detected = True
+                reasons.append(f"content of {name} changed")
+        for name in stored_fingerprints:
+            if not name in current_input_files:
+                differences_detected = True
+                reasons.append(f"{name} is no longer used")
+    else:
+        # Results databases without fingerprints (older versions) compare the paths.
+        if not existing_general_settings['material_properties'] == problem_definition.general.path.material_properties:
+            differences_detected = True
+            reasons.append("material_properties path changed")
 
-    # if not existing_general_settings['grain_orientation'] == problem_definition.general.path.grain_orientation:
-    #     differences_detected = True
-    #     reasons.append("grain_orientation path changed")
+        # if not existing_general_settings['grain_orientation'] == problem_definition.general.path.grain_orientation:
+        #     differences_detected = True
+        #     reasons.append("grain_orientation path changed")
 
-    if not existing_general_settings['grid_file'] == problem_definition.general.path.grid_file:
-        differences_detected = True
-        reasons.append("grid_file path changed")
+        if not existing_general_settings['grid_file'] == problem_definition.general.path.grid_file:
+            differences_detected = True
+            reasons.append("grid_file path changed")
 
     if not existing_general_settings['stress_tensor_type'] == problem_definition.general.stress_tensor_type.str():
         differences_detected = True
@@ -0,0 +1,122 @@
+# System packages
+import os
+import copy
+import yaml
+import shutil
+from typing import Union
+
+# Local packages
+from ...common_classes.problem_definition import ProblemDefinition
+from ...common_classes.damask_job import yield_condition_values
+from ...damask_monitor.post_processor.curve_store import rederive_yield_point
+from ...messages.messages import Messages
+from .general import compare_general_settings
+from .yield_point import compare_yield_point_settings
+from .yield_surface import compare_yield_surface_settings
+from .tracked_yield_conditions import setting_field_names, yield_condition_is_tracked
+
+# The homogenized curve of every yield point job is stored (see curve_store.py). When only the yield condition or the
+# yield value changed, the yield points are found again from the stored curves instead of running the jobs again.
+# A yield point is only re-derived when the curve passed the new yield value (or the job applied the full load).
+# Results that can not be re-derived are removed, these are simulated again.
+# The re-derived results are only offered to the user, the results database is rewritten once the user reused them
+# (see store_rederived_yield_points in create_jobs.py). The original database and the results folders of the removed
+# fields are then moved to the backup folder:
+#   [backup_results_folder]/results_database.yaml
+#   [backup_results_folder]/[simulation_type]/[field_name]/
+
+def only_yield_definition_changed(
+        problem_definition: ProblemDefinition,
+        existing_results: dict[str, dict[str, Union[str, bool, float]]],
+        simulation_type: str) -> bool:
+    # The settings are compared as if the existing results used the yield condition of the problem definition.
+    settings = existing_results[simulation_type]
+    yield_condition = problem_definition.yielding_condition.yield_condition
+    yield_value = yield_condition_values(problem_definition)[yield_condition]
+    if settings.get('yield_condition') == yield_condition and settings.get('yield_condition_value') == yield_value:
+        return False
+
+    substituted_results = copy.deepcopy(existing_results)
+    substituted_results[simulation_type]['yield_condition'] = yield_condition
+    substituted_results[simulation_type]['yield_condition_value'] = yield_value
+    try:
+        match simulation_type:
+            case 'yield_point':
+                (differences_detected, _) = compare_yield_point_settings(problem_definition, substituted_results)
+            case 'yield_surface':
+                (differences_detected, _) = compare_yield_surface_settings(problem_definition, substituted_results) # type: ignore
+            case _:
+                return False
+    except KeyError:
+        return False
+    return not differences_detected
+
+def backup_results_before_rederiving(
+        problem_definition: ProblemDefinition,
+        original_results: dict[str, dict[str, Union[str, bool, float]]],
+        simulation_type: str,
+        removed_field_names: list[str]) -> None:
+    backup_folder_path = problem_definition.general.path.backup_results_folder
+    os.makedirs(backup_folder_path, exist_ok=True)
+    backup_results_database = os.path.join(backup_folder_path, 'results_database.yaml')
+    if not os.path.exists(backup_results_database):
+        with open(backup_results_database, 'w') as backup_results_database_writer:
+            yaml.dump(original_results, backup_results_database_writer)
+
+    for field_name in removed_field_names:
+        results_folder_field = os.path.join(problem_definition.general.path.results_folder, simulation_type, field_name)
+        backup_folder_field = os.path.join(backup_folder_path, simulation_type, field_name)
+        if os.path.exists(results_folder_field):
+            os.makedirs(os.path.dirname(backup_folder_field), exist_ok=True)
+            shutil.move(results_folder_field, backup_folder_field)
+    Messages.Reuse.moved_results_to_backup_folder(backup_folder_path)
+
+def rederive_yield_points(
+        problem_definition: ProblemDefinition,
+        existing_results: dict[str, dict[str, Union[str, bool, float]]]) -> tuple[dict[str, dict[str, Union[str, bool, float]]], list[str]]:
+    # Returns a copy of the results database with the re-derived yield points, and the simulation types that were re-derived.
+    # The existing results and the results folder are left as they are.
+    existing_results = copy.deepcopy(existing_results)
+    rederived_simulation_types: list[str] = []
+    if existing_results.get('general_settings') is None:
+        return existing_results, rederived_simulation_types
+    (differences_in_general_settings, _) = compare_general_settings(problem_definition, existing_results)
+    if differences_in_general_settings:
+        return existing_results, rederived_simulation_types
+
+    yield_condition = problem_definition.yielding_condition.yield_condition
+    yield_value = yield_condition_values(problem_definition)[yield_condition]
+    no_yield_detected = [["NO_YIELD_DETECTED"] * 3 for _ in range(3)]
+
+    for simulation_type in ['yield_point', 'yield_surface']:
+        if existing_results.get(simulation_type) is None:
+            continue
+        # Tracked yield points are exact, these are used instead (see tracked_yield_conditions.py)
+        if yield_condition_is_tracked(problem_definition, existing_results, simulation_type):
+            continue
+        if not only_yield_definition_changed(problem_definition, existing_results, simulation_type):
+            continue
+
+        settings = existing_results[simulation_type]
+        field_names = [field_name for field_name in settings if not field_name in setting_field_names]
+        rederived_fields: dict[str, object] = dict()
+        for field_name in field_names:
+            (rederived, stress) = rederive_yield_point(problem_definition, simulation_type, field_name, yield_condition, yield_value)
+            if rederived:
+                rederived_fields[field_name] = no_yield_detected if stress is None else stress.tolist()
+
+        # Without any curve to re-derive from, the results are handled as changed settings (moved to the backup folder).
+        if len(rederived_fields) == 0:
+            continue
+
+        for field_name in field_names:
+            if field_name in rederived_fields:
+                settings[field_name] = rederived_fields[field_name] # type: ignore
+            else:
+                del settings[field_name]
+        settings['yield_condition'] = yield_condition
+        settings['yield_condition_value'] = yield_value
+        rederived_simulation_types.append(simulation_type)
+        print(f"Re-derived {len(rederived_fields)} of {len(field_names)} {simulation_type} result(s) from the stored curves for the {yield_condition} yield condition (value {yield_value}).")
+
+    return existing_results, rederived_simulation_types
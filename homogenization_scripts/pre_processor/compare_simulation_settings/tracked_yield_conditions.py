@@ -0,0 +1,51 @@
+# System packages
+from typing import Union
+
+# Local packages
+from ...common_classes.problem_definition import ProblemDefinition
+from ...common_classes.damask_job import yield_condition_values
+
+# With track_all_yield_conditions the results database also holds the yield point of every yield condition, see
+# store_tracked_yield_points_to_database. When the yield condition is changed to one of the tracked yield conditions
+# (at the tracked yield value), the results are still compatible: the stored yield points of that yield condition
+# replace the results, no simulation has to run again.
+
+setting_field_names = ["N_increments", "assume_tensile_compressive_symmetry", "estimated_shear_yield", "estimated_tensile_yield", "points_per_quadrant", "yield_condition", "yield_condition_value", "stress_state_creation", "results"]
+
+def tracked_yield_points_of(existing_results: dict[str, dict[str, Union[str, bool, float]]], simulation_type: str) -> dict: # type: ignore
+    return existing_results.get('yield_points_per_condition', dict()).get(simulation_type, dict()) # type: ignore
+
+def yield_condition_is_tracked(
+        problem_definition: ProblemDefinition, 
+        existing_results: dict[str, dict[str, Union[str, bool, float]]], 
+        simulation_type: str) -> bool:
+    tracked_conditions = tracked_yield_points_of(existing_results, simulation_type).get('tracked_yield_conditions', dict())
+    yield_condition = problem_definition.yielding_condition.yield_condition
+    return yield_condition in tracked_conditions and tracked_conditions[yield_condition] == yield_condition_values(problem_definition)[yield_condition]
+
+def switch_to_tracked_yield_condition(
+        problem_definition: ProblemDefinition, 
+        existing_results: dict[str, dict[str, Union[str, bool, float]]], 
+        simulation_type: str) -> tuple[dict[str, dict[str, Union[str, bool, float]]], bool]:
+    # Replaces the results of simulation_type by the tracked yield points of the yield condition of the problem definition.
+    # Results without a tracked yield point are removed (these will be simulated again).
+    settings = existing_results[simulation_type]
+    yield_condition = problem_definition.yielding_condition.yield_condition
+    yield_value = yield_condition_values(problem_definition)[yield_condition]
+    if settings.get('yield_condition') == yield_condition and settings.get('yield_condition_value') == yield_value:
+        return existing_results, False
+    if not yield_condition_is_tracked(problem_definition, existing_results, simulation_type):
+        return existing_results, False
+
+    yield_points = tracked_yield_points_of(existing_results, simulation_type).get('yield_points', dict())
+    for field_name in list(settings.keys()):
+        if field_name in setting_field_names:
+            continue
+        if field_name in yield_points and yield_condition in yield_points[field_name]:
+            settings[field_name] = yield_points[field_name][yield_condition]
+        else:
+            del settings[field_name]
+    settings['yield_condition'] = yield_condition
+    settings['yield_condition_value'] = yield_value
+    print(f"The {simulation_type} results are switched to the tracked yield points of the {yield_condition} yield condition (value {yield_value}).")
+    return existing_results, True
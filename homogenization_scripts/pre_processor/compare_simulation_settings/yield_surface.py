@@ -2,6 +2,7 @@
 
 # Local packages
 from ...common_classes.problem_definition import ProblemDefinition
+from .tracked_yield_conditions import yield_condition_is_tracked
 
 def compare_yield_surface_settings(
         problem_definition: ProblemDefinition, 
@@ -15,7 +16,11 @@ def compare_yield_surface_settings(
         differences_detected = True
         reasons.append("number of increments (N_increments) changed")
 
-    if not existing_settings['yield_condition'] == problem_definition.yielding_condition.yield_condition:
+    # A yield condition that was tracked in the existing results does not need new simulations, see tracked_yield_conditions.py
+    yield_condition_is_tracked_in_results = yield_condition_is_tracked(problem_definition, existing_results, 'yield_surface') # type: ignore
+    if yield_condition_is_tracked_in_results:
+        pass
+    elif not existing_settings['yield_condition'] == problem_definition.yielding_condition.yield_condition:
         differences_detected = True
         reasons.append("condition for yield detection changed")
     else:
@@ -9,11 +9,16 @@ import copy
 # Local packages
 from .required_results.general import find_required_results
 from .compare_simulation_settings.compare_settings import compare_simulation_settings
+from .compare_simulation_settings.tracked_yield_conditions import switch_to_tracked_yield_condition
+from .compare_simulation_settings.rederive_yield_points import rederive_yield_points, backup_results_before_rederiving
 from ..common_classes.damask_job import DamaskJob, DamaskJobTypes, create_multiaxial_yield_point_for_yield_locus, create_uniaxial_yield_point
 from .valid_results_database import valid_results_database_file_scheme # type: ignore
 from ..common_classes.problem_definition import ProblemDefinition
 from .common_classes_pre_processor.reused_results import ReusedResults
 from ..messages.messages import Messages
+from .yield_surface_job_planner import prune_equivalent_yield_surface_jobs
+from ..common_functions.job_cost_model import order_jobs_longest_first
+from ..common_functions.result_cache import reuse_cached_results
 
 
 def reduce_required_results_list(
@@ -32,6 +37,48 @@ def reduce_required_results_list(
 
             fields_removed = True
     return required_results_simulation_type, fields_removed, removed_fields_list
+def store_tracked_yield_condition(
+        problem_definition: ProblemDefinition,
+        existing_results: dict[str, dict[str, str | float]],
+        simulation_type: str,
+        results_database: str,
+        original_full_results_database: dict[str, dict[str, str | float]]) -> dict[str, dict[str, str | float]]:
+    # Results with tracked yield points are switched to the yield condition of the problem definition, see tracked_yield_conditions.py
+    # The results database as it was is kept in the backup folder.
+    (existing_results, yield_condition_switched) = switch_to_tracked_yield_condition(problem_definition, existing_results, simulation_type) # type: ignore
+    if yield_condition_switched:
+        full_backup_results_database_path = os.path.join(problem_definition.general.path.backup_results_folder, 'results_database.yaml')
+        if not os.path.exists(full_backup_results_database_path):
+            os.makedirs(problem_definition.general.path.backup_results_folder, exist_ok=True)
+            with open(full_backup_results_database_path, 'w') as backup_results_database:
+                yaml.dump(original_full_results_database, backup_results_database)
+        with open(results_database, 'w') as existing_results_database:
+            yaml.dump(existing_results, existing_results_database)
+    return existing_results
+
+def store_rederived_yield_points(
+        problem_definition: ProblemDefinition,
+        existing_results: dict[str, dict[str, str | float]],
+        rederived_results: dict[str, dict[str, str | float]],
+        rederived_simulation_types: list[str],
+        simulation_type: str,
+        results_database: str,
+        original_full_results_database: dict[str, dict[str, str | float]]) -> dict[str, dict[str, str | float]]:
+    # The re-derived yield points replace the stored ones once the user reused them, see rederive_yield_points.py
+    # Results that could not be re-derived are moved to the backup folder, results the user moved already stay removed.
+    if not simulation_type in rederived_simulation_types or not simulation_type in existing_results:
+        return existing_results
+    removed_field_names = [field_name for field_name in existing_results[simulation_type] if not field_name in rederived_results[simulation_type]]
+    backup_results_before_rederiving(problem_definition, original_full_results_database, simulation_type, removed_field_names) # type: ignore
+    existing_results[simulation_type] = {key: value for key, value in rederived_results[simulation_type].items() if key in existing_results[simulation_type]}
+    with open(results_database, 'w') as existing_results_database:
+        yaml.dump(existing_results, existing_results_database)
+    return existing_results
+
+def stored_simulation_types(existing_results: dict[str, dict[str, str | float]]) -> list[str]:
+    # The tracked yield points (yield_points_per_condition) belong to the simulation types, these are not a simulation type themselves.
+    return [key for key in existing_results.keys() if not key == 'yield_points_per_condition']
+
 
 def define_required_results(problem_definition: ProblemDefinition):
     # This function makes a list of simulations that needs to be run. This list takes into account if results 
@@ -113,10 +160,15 @@ def define_required_results(problem_definition: ProblemDefinition):
 
         Messages.Reuse.Banners.start_resuse_section()
 
+        original_full_results_database = copy.deepcopy(existing_results)
+
+        # Yield points for a changed yield condition or yield value are found from the stored curves when possible, see rederive_yield_points.py
+        # The settings are compared with the re-derived results, the results database is only switched to these after the user answered.
+        (rederived_results, rederived_simulation_types) = rederive_yield_points(problem_definition, existing_results)
+
         # This function compares all the settings in the problem_definition with those in the results_database and flags 
         # wether the results are compatible with the existing results
-        (general_settings_match, reasons_general_mismatch, compatible_fields, incompatible_fields, compatible_settings) = compare_simulation_settings(problem_definition, required_results, existing_results)
-        original_full_results_database = copy.deepcopy(existing_results)
+        (general_settings_match, reasons_general_mismatch, compatible_fields, incompatible_fields, compatible_settings) = compare_simulation_settings(problem_definition, required_results, rederived_results)
 
         # If the general settings do not match, move results to backup folder.
         if not general_settings_match:
@@ -153,6 +205,8 @@ def define_required_results(problem_definition: ProblemDefinition):
             with open(backup_folder_simulation_type_results_database, 'w') as backup_results_database:
                 yaml.dump(existing_results[incompatible_field], backup_results_database)
             del existing_results[incompatible_field]
+            # The tracked yield points of these results are no longer valid either.
+            existing_results.get('yield_points_per_condition', dict()).pop(incompatible_field, None) # type: ignore
             with open(results_database, 'w') as existing_results_database:
                 yaml.dump(existing_results, existing_results_database)
             reused_results.add_reevaluated_simulation_type(incompatible_field, compatible_settings[incompatible_field]["detected_mismatches"])  # type: ignore (compatible_settings[incompatible_field]["detected_mismatches"] is always string list)
@@ -161,14 +215,25 @@ def define_required_results(problem_definition: ProblemDefinition):
         # Deal with the results that can be reused from earlier simulations.
         # The user is asked if the results should actually be used again or not.
         for compatible_field in compatible_fields:
-            reduced_required_results_simulation_type, fields_removed, removed_fields_list = reduce_required_results_list(required_results[compatible_field], existing_results[compatible_field])
+            # Results with tracked yield points are offered with the yield points of the yield condition of the problem definition,
+            # the results database is only switched to these after the user answered (see store_tracked_yield_condition).
+            reusable_results = existing_results
+            if compatible_field in rederived_simulation_types:
+                reusable_results = rederived_results
+            elif compatible_field in ['yield_point', 'yield_surface']:
+                (reusable_results, _) = switch_to_tracked_yield_condition(problem_definition, copy.deepcopy(existing_results), compatible_field) # type: ignore
+            reduced_required_results_simulation_type, fields_removed, removed_fields_list = reduce_required_results_list(required_results[compatible_field], reusable_results[compatible_field])
             if not fields_removed:
+                existing_results = store_tracked_yield_condition(problem_definition, existing_results, compatible_field, results_database, original_full_results_database)
+                existing_results = store_rederived_yield_points(problem_definition, existing_results, rederived_results, rederived_simulation_types, compatible_field, results_database, original_full_results_database)
                 continue
             if not problem_definition.general.automatic_reevaluate:
                 reuse_simulation_results = Messages.Reuse.ask_to_reuse_existing_results(compatible_field, removed_fields_list)
             else:
                 reuse_simulation_results = False
             if reuse_simulation_results:
+                existing_results = store_tracked_yield_condition(problem_definition, existing_results, compatible_field, results_database, original_full_results_database)
+                existing_results = store_rederived_yield_points(problem_definition, existing_results, rederived_results, rederived_simulation_types, compatible_field, results_database, original_full_results_database)
                 required_results[compatible_field] = reduced_required_results_simulation_type
                 for skipped_field in removed_fields_list:
                     reused_results.add_reused_value(compatible_field, skipped_field)
@@ -201,12 +266,23 @@ def define_required_results(problem_definition: ProblemDefinition):
                                 shutil.move(os.path.join(results_folder_field, f), os.path.join(backup_folder_field,f))
                         shutil.rmtree(results_folder_field)
                     del existing_results[compatible_field][field_name]
+                    # The tracked yield points of the moved results are no longer valid either.
+                    tracked_yield_points = existing_results.get('yield_points_per_condition', dict()).get(compatible_field, dict()) # type: ignore
+                    tracked_yield_points.get('yield_points', dict()).pop(field_name, None) # type: ignore
                     if len(list(existing_results[compatible_field].keys())) == 0:
                         del existing_results[compatible_field]
+                        existing_results.get('yield_points_per_condition', dict()).pop(compatible_field, None) # type: ignore
+                        if existing_results.get('yield_points_per_condition') == dict():
+                            del existing_results['yield_points_per_condition']
                     with open(results_database, 'w') as existing_results_database:
                         yaml.dump(existing_results, existing_results_database)
-                    
-                if len(list(existing_results.keys())) == 1:
+
+                # The results that were not moved are kept with the yield condition of the problem definition.
+                if compatible_field in existing_results:
+                    existing_results = store_tracked_yield_condition(problem_definition, existing_results, compatible_field, results_database, original_full_results_database)
+                    existing_results = store_rederived_yield_points(problem_definition, existing_results, rederived_results, rederived_simulation_types, compatible_field, results_database, original_full_results_database)
+
+                if len(stored_simulation_types(existing_results)) == 1:
                     os.remove(results_database)
                 
                 full_backup_results_database_path = os.path.join(backup_folder_path, 'results_database.yaml')
@@ -232,6 +308,13 @@ def create_jobs(problem_definition: ProblemDefinition) -> tuple[ProblemDefinitio
 
     # From the list of result names that are needed, create a DamaskJob with all the specifics. 
     for simulation_type in required_results:
+        # All elastic tensor directions can be run as subsequent load steps in a single DAMASK_grid run.
+        single_damask_run = getattr(problem_definition.elastic_tensor, "single_damask_run", False) if simulation_type == 'elastic_tensor' else False
+        if single_damask_run and len(required_results[simulation_type]) > 0:
+            damask_job: DamaskJobTypes = DamaskJob.ElasticTensor(problem_definition, list(required_results[simulation_type].keys()))
+            damask_jobs.append(damask_job)
+            continue
+
         for load_case in required_results[simulation_type]:
             if simulation_type == 'yield_point':
                 damask_job: DamaskJobTypes = create_uniaxial_yield_point(problem_definition, load_case)
@@ -247,6 +330,13 @@ def create_jobs(problem_definition: ProblemDefinition) -> tuple[ProblemDefinitio
                 damask_jobs.append(damask_job)
             else:
                 raise Exception(f"Job queing of {simulation_type} Jobs not yet implemented!")
+
+    # Remove yield_surface jobs of which the result follows from another job (identical or symmetry equivalent stress state).
+    if problem_definition.general.simulation_type == 'yield_surface':
+        damask_jobs = prune_equivalent_yield_surface_jobs(problem_definition, damask_jobs)
+
+    # Jobs of which the result is already in the result cache (i.e. from another project) are not run, see result_cache.py
+    damask_jobs = reuse_cached_results(problem_definition, damask_jobs)
             
     # Track the number of jobs that have been sheduled and label the jobs with a number.
     total_number_damask_jobs = len(damask_jobs)    
@@ -254,5 +344,9 @@ def create_jobs(problem_definition: ProblemDefinition) -> tuple[ProblemDefinitio
         damask_jobs[damask_job_index].job_number = damask_job_index + 1
         damask_jobs[damask_job_index].total_jobs = total_number_damask_jobs
 
+    # Optionally run the longest jobs first (based on the estimated run time of each job).
+    if getattr(problem_definition.solver, "job_ordering", "creation") == "longest_first":
+        damask_jobs = order_jobs_longest_first(problem_definition, damask_jobs)
+
     return problem_definition, damask_jobs
 
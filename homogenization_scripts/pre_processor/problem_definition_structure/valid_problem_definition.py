@@ -59,6 +59,19 @@ valid_problem_definition_file_scheme = {  # type: ignore
                 'required': False,
                 'type': 'string',
             },
+            'result_cache': {
+                'required': False,
+                'type': 'boolean',
+            },
+            'result_cache_folder': {
+                'required': False,
+                'type': 'string',
+            },
+            'result_cache_quota': {
+                'required': False,
+                'type': 'number',
+                'min': 0,
+            },
         },
     },
 
@@ -83,6 +96,20 @@ valid_problem_definition_file_scheme = {  # type: ignore
                 'required': True,
                 'type': 'number',
             },
+            'plastic_work_xi_averaging': {
+                'required': False,
+                'type': 'string',
+                'allowed': ["endpoint", "trapezoidal"],
+            },
+            'yield_interpolation': {
+                'required': False,
+                'type': 'string',
+                'allowed': ["linear", "cubic_hermite"],
+            },
+            'track_all_yield_conditions': {
+                'required': False,
+                'type': 'boolean',
+            },
             'estimated_tensile_yield': {
                 'required': True,
                 'type': 'number',
@@ -110,6 +137,11 @@ valid_problem_definition_file_scheme = {  # type: ignore
                 'required': True,
                 'type': 'integer',
             },
+            'stop_after_subsequent_cutbacks': {
+                'required': False,
+                'type': 'integer',
+                'min': 1,
+            },
             'solver_type': {
                 'required': True,
                 'type': 'string',
@@ -163,6 +195,78 @@ valid_problem_definition_file_scheme = {  # type: ignore
                 'required': True,
                 'type': 'float',
             },
+            'job_ordering': {
+                'required': False,
+                'type': 'string',
+                'allowed': ["creation", "longest_first"],
+            },
+            'live_plots': {
+                'required': False,
+                'type': 'boolean',
+            },
+            'live_plot_interval': {
+                'required': False,
+                'type': 'float',
+                'min': 0,
+            },
+            'monitor_profiling': {
+                'required': False,
+                'type': 'boolean',
+            },
+            'parallel_jobs': {
+                'required': False,
+                'type': 'integer',
+                'min': 1,
+            },
+            'launcher': {
+                'required': False,
+                'type': 'string',
+                'allowed': ["local", "mpi", "batch"],
+            },
+            'mpi_runner': {
+                'required': False,
+                'type': 'string',
+            },
+            'mpi_runner_arguments': {
+                'required': False,
+                'type': 'string',
+            },
+            'mpi_ranks': {
+                'required': False,
+                'type': 'integer',
+                'min': 1,
+            },
+            'mpi_threads_per_rank': {
+                'required': False,
+                'type': 'integer',
+                'min': 1,
+            },
+            'mpi_auto_tune': {
+                'required': False,
+                'type': 'boolean',
+            },
+            'numerics_tuning': {
+                'required': False,
+                'type': 'string',
+                'allowed': ["off", "suggest", "apply"],
+            },
+            'numerics_yield_tolerance': {
+                'required': False,
+                'type': 'number',
+                'min': 0,
+            },
+            'batch_submit_command': {
+                'required': False,
+                'type': 'string',
+            },
+            'batch_status_command': {
+                'required': False,
+                'type': 'string',
+            },
+            'batch_cancel_command': {
+                'required': False,
+                'type': 'string',
+            },
 
         }
     },
@@ -196,6 +300,34 @@ valid_problem_definition_file_scheme = {  # type: ignore
                 'required': True,
                 'type': 'boolean',
             },
+            'adaptive_sampling': {
+                'required': False,
+                'type': 'boolean',
+            },
+            'adaptive_batch_size': {
+                'required': False,
+                'type': 'integer',
+                'min': 1,
+            },
+            'adaptive_tolerance': {
+                'required': False,
+                'type': 'number',
+            },
+            'adaptive_max_jobs': {
+                'required': False,
+                'type': 'integer',
+                'min': 1,
+            },
+            'adaptive_fit_criterion': {
+                'required': False,
+                'type': 'string',
+                'allowed': ["Hill", "Cazacu-Plunkett-Barlat"],
+            },
+            'material_symmetry': {
+                'required': False,
+                'type': 'string',
+                'allowed': ["none", "orthotropic", "cubic"],
+            },
             'stress_x_x': {
                 'required': True,
                 'type': ['number', 'list'],
@@ -246,12 +378,16 @@ valid_problem_definition_file_scheme = {  # type: ignore
             'number_of_load_cases': {
                 'required': True,
                 'type': 'string',
-                'allowed': ["minimum",  "all_directions", "combined_directions"],
+                'allowed': ["minimum",  "all_directions", "combined_directions", "superposition"],
             },
             'strain_step': {
                 'required': True,
                 'type': 'number',
             },
+            'single_damask_run': {
+                'required': False,
+                'type': 'boolean',
+            },
         },
     },
 
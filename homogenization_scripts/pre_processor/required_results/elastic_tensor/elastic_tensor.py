@@ -29,7 +29,10 @@ def required_results_elastic_tensor(problem_definition: ProblemDefinition) -> di
     #                                        '6-6']
 
     component_fitting = problem_definition.elastic_tensor.component_fitting
-    if component_fitting == "algebraic":
+    if component_fitting == "algebraic" and problem_definition.elastic_tensor.number_of_load_cases == "superposition":
+        # The six uni-axial strain steps contain the minimum set, the combined directions are synthesized afterwards.
+        number_of_load_cases = "superposition"
+    elif component_fitting == "algebraic":
         number_of_load_cases = "minimum"
         problem_definition.elastic_tensor.number_of_load_cases = "minimum"
     else:
@@ -68,7 +71,7 @@ def required_results_elastic_tensor(problem_definition: ProblemDefinition) -> di
             ]
             case _: # type: ignore
                 raise Exception(f"Error while defining jobs for elasticity tensor: material_type = {problem_definition.general.dimensions} not yet implemented.")
-    elif number_of_load_cases == 'all_directions':
+    elif number_of_load_cases in ['all_directions', 'superposition']:
         required_fields = [
             "strain_xx", "strain_yy", "strain_zz", "strain_xy", "strain_xz", "strain_yz"
             ]
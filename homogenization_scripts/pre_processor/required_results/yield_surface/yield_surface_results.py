@@ -3,10 +3,14 @@
 from ....common_classes.damask_job import create_multiaxial_yield_points_set_names
 from ....common_classes.problem_definition import ProblemDefinition
 from .manual_stress_state_creation import read_manual_stress_states
+from ...adaptive_yield_surface_sampling import adaptive_sampling_is_used, initial_required_results
 
 def required_results_yield_surface(problem_definition: ProblemDefinition) -> dict[str, dict[str, bool]]:
    
-    if problem_definition.yield_surface.stress_state_creation == "automatic":
+    if adaptive_sampling_is_used(problem_definition):
+        # Further stress states are added during the simulations, see adaptive_yield_surface_sampling.py
+        required_fields = initial_required_results(problem_definition)
+    elif problem_definition.yield_surface.stress_state_creation == "automatic":
         required_fields = compile_required_results(problem_definition)
     else:
         required_fields = read_manual_stress_states(problem_definition)
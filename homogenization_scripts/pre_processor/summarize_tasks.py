@@ -4,11 +4,13 @@ import click
 from itertools import chain
 import numpy as np
 import textwrap
+import datetime
 
 # Local packages
 from ..common_classes.problem_definition import ProblemDefinition
 from ..common_classes.damask_job import DamaskJob, DamaskJobTypes
 from ..damask_monitor.common_classes_damask_monitor.stop_conditions.stop_conditions import StopCondition
+from ..common_functions.job_cost_model import estimate_job_costs, projected_wall_time
 
 def summarize_plastic_strain_yield(yield_value: float):
     pass
@@ -69,6 +71,11 @@ def summarize_elastic_tensor_job(job: DamaskJob.ElasticTensor):
     print("    Job type: elastic tensor")
     print(f"    Strain applied: {job.field_name}")
 
+    if len(job.directions) > 1:
+        print(f"    Directions in single DAMASK_grid run: {', '.join(job.directions)}")
+        print(f"    Number of load steps: {job.load_steps} (returning to F = I in between directions)")
+        return
+
     F = job.deformation_gradient_tensor[0]
     print("")
     print(f"""    Displacement gradient tensor:
@@ -96,6 +103,9 @@ def summarize_yield_surface_job(job: DamaskJob.YieldPointMultiaxial):
     [{target_stress_step[1][0]}, {target_stress_step[1][1]}, {target_stress_step[1][2]}],
     [{target_stress_step[2][0]}, {target_stress_step[2][1]}, {target_stress_step[2][2]}]]""")
     print(f"    Angle in plane: {job.angle_in_plane}°")
+    if len(job.equivalent_results) > 0:
+        equivalent_field_names = [field_name for (field_name, _) in job.equivalent_results]
+        print(textwrap.fill(f"    Also gives the results of (equivalent) load case(s): {', '.join(equivalent_field_names)}", width=80))
     print(textwrap.fill(f"    {job.stop_condition}",width=80))
 
 
@@ -142,6 +152,20 @@ def summarize_load_path_job(job: DamaskJob.LoadPath):
     
     #     print(textwrap.fill(f"    {job.stop_condition}",width=80))
 
+def summarize_projected_run_time(problem_definition: ProblemDefinition, job_costs: list[float], calibrated: bool):
+    if len(job_costs) == 0:
+        print("No jobs to run.")
+        return
+
+    parallel_jobs = getattr(problem_definition.solver, "parallel_jobs", 1)
+    wall_time = projected_wall_time(job_costs, parallel_jobs)
+    print(f"Projected wall time of the queued job(s) with {parallel_jobs} job(s) in parallel: {datetime.timedelta(seconds=round(wall_time))}")
+    print(f"Longest job: {datetime.timedelta(seconds=round(max(job_costs)))}, shortest job: {datetime.timedelta(seconds=round(min(job_costs)))}")
+    if calibrated:
+        print("Estimate is based on the run times of earlier jobs of this project (results/job_timings.yaml).")
+    else:
+        print(textwrap.fill("No run times of earlier jobs with these cpu_cores are known yet, estimate is a rough default. The estimate improves once jobs have been run.", width=80))
+
 def summarize_tasks(problem_definition: ProblemDefinition, jobs_list: list[DamaskJobTypes]):
     print("")
     print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
@@ -176,10 +200,14 @@ def summarize_tasks(problem_definition: ProblemDefinition, jobs_list: list[Damas
     print("--------------------------------")
     print(f"A queue of {len(jobs_list)} job(s) has been created.")
     print(f"Listing the queued job(s)...")
+    # Also sets job.estimated_run_time, the costs are reused for the projected run time below.
+    (job_costs, calibrated) = estimate_job_costs(problem_definition, jobs_list)
     job_counter = 1
     for job in jobs_list:
         print("")
         print(f"    ~~~~~~~~~ Job {job_counter} of {len(jobs_list)} ~~~~~~~~~")
+        if hasattr(job, "estimated_run_time"):
+            print(f"    Estimated run time: {datetime.timedelta(seconds=round(job.estimated_run_time))}")
         match job.simulation_type:
             case 'yield_point':
                 summarize_yield_point_job(job) # type: ignore
@@ -202,6 +230,11 @@ def summarize_tasks(problem_definition: ProblemDefinition, jobs_list: list[Damas
         print(f"With history loadcase: {problem_definition.general.path.history_loadcase_path}")
         print("")
     print("--------------------------------")
+    print("|      Projected run time      |")
+    print("--------------------------------")
+    summarize_projected_run_time(problem_definition, job_costs, calibrated)
+    print("")
+    print("--------------------------------")
     print("|       Reuse of results       |")
     print("--------------------------------")
     summarize_reuse_of_results(problem_definition)
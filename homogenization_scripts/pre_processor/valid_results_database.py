@@ -25,6 +25,10 @@ valid_results_database_file_scheme = { # type: ignore
             'strain_tensor_type':{
                 'required': True,
                 'type': 'string',
+            },
+            'input_fingerprints':{
+                'required': False,
+                'type': 'dict',
             }
         },
     },
@@ -0,0 +1,91 @@
+# System packages
+import itertools
+import numpy as np
+from numpy.typing import NDArray
+
+# Local packages
+from ..common_classes.damask_job import DamaskJob, DamaskJobTypes
+from ..common_classes.problem_definition import ProblemDefinition
+from ..messages.messages import Messages
+
+# The yield_surface job planner removes jobs of which the result can be derived from another job:
+# - Jobs with an identical target stress (i.e. the uniaxial axes shared between planes).
+# - Jobs that are equivalent under the material symmetry (i.e. the x_y, x_z and y_z planes of a cubic material).
+# The job that is run stores its result for the removed jobs as well: stress_removed = Q * stress_run * Q^T,
+# where Q is the symmetry operation that maps the target stress of the job that is run onto the removed one.
+
+def symmetry_operations(material_symmetry: str) -> list[NDArray[np.float64]]:
+    # Returns the (orthogonal) symmetry operations Q of the material, given in the simulation axes.
+    match material_symmetry:
+        case 'none':
+            operations = [np.eye(3)]
+        case 'orthotropic':
+            # Reflections in the x, y and z planes.
+            operations = [np.diag(signs) for signs in itertools.product([1., -1.], repeat=3)]
+        case 'cubic':
+            # All permutations of the axes combined with reflections.
+            operations = []
+            for permutation in itertools.permutations(range(3)):
+                permutation_matrix = np.eye(3)[list(permutation)]
+                for signs in itertools.product([1., -1.], repeat=3):
+                    operations.append(np.diag(signs) @ permutation_matrix)
+        case _:
+            raise Exception(f"Material symmetry {material_symmetry} not yet implemented for pruning of yield_surface jobs!")
+
+    return operations
+
+def get_material_symmetry(problem_definition: ProblemDefinition) -> str:
+    # Only a symmetry declared by the user is used. The elastic tensor is not a reliable measure of the plastic symmetry
+    # (i.e. a cubic elastic tensor with an orthotropic texture), so the symmetry is never detected from it.
+    return getattr(problem_definition.yield_surface, "material_symmetry", "none")
+
+def target_stress_as_array(damask_job: DamaskJob.YieldPointMultiaxial) -> NDArray[np.float64]:
+    # The target stress is given as upper triangle, unconstrained components ('x') are taken as zero.
+    target_stress = damask_job.target_stress[-1]
+    stress = np.zeros((3, 3))
+    for i in range(3):
+        for j in range(i, 3):
+            if isinstance(target_stress[i][j], (int, float)):
+                stress[i][j] = target_stress[i][j]
+                stress[j][i] = target_stress[i][j]
+    return stress
+
+def prune_equivalent_yield_surface_jobs(problem_definition: ProblemDefinition, damask_jobs: list[DamaskJobTypes]) -> list[DamaskJobTypes]:
+    # Keeps the first job of every set of equivalent jobs, the other jobs are stored as equivalent results on it.
+    material_symmetry = get_material_symmetry(problem_definition)
+    operations = symmetry_operations(material_symmetry)
+
+    jobs_to_run: list[DamaskJobTypes] = []
+    stresses_to_run: list[NDArray[np.float64]] = []
+    number_of_pruned_jobs = 0
+
+    for damask_job in damask_jobs:
+        if not isinstance(damask_job, DamaskJob.YieldPointMultiaxial):
+            jobs_to_run.append(damask_job)
+            stresses_to_run.append(np.full((3, 3), np.nan))
+            continue
+
+        stress = target_stress_as_array(damask_job)
+        stress_scale = max(float(np.max(np.abs(stress))), 1.)
+
+        equivalent_job_found = False
+        for job_to_run, stress_to_run in zip(jobs_to_run, stresses_to_run):
+            if not isinstance(job_to_run, DamaskJob.YieldPointMultiaxial):
+                continue
+            for operation in operations:
+                if np.allclose(operation @ stress_to_run @ operation.T, stress, rtol=0, atol=1e-9*stress_scale):
+                    job_to_run.equivalent_results.append((damask_job.field_name, operation.tolist()))
+                    equivalent_job_found = True
+                    break
+            if equivalent_job_found:
+                break
+
+        if equivalent_job_found:
+            number_of_pruned_jobs += 1
+        else:
+            jobs_to_run.append(damask_job)
+            stresses_to_run.append(stress)
+
+    Messages.YieldSurface.pruned_equivalent_jobs(number_of_pruned_jobs, len(damask_jobs), material_symmetry)
+
+    return jobs_to_run
@@ -0,0 +1,51 @@
+# System packages
+import sys
+import os
+import time
+
+# Local-packages
+from homogenization_scripts.pre_processor.get_project_name_and_folder import get_project_name_and_folder
+from homogenization_scripts.damask_monitor.common_classes_damask_monitor.progress_feed import show_progress
+
+# Get the folder (directory) containing this script
+scripts_folder = os.path.dirname(os.path.abspath(__file__))
+
+def show_project_progress(project_name_input: str, refresh_time: float | None = None) -> None:
+    # Shows the newest entry of the progress feed of every job of the project, see progress_feed.py
+    (_, project_path) = get_project_name_and_folder(project_name_input, scripts_folder)
+    results_folder = os.path.join(project_path, 'results')
+
+    if refresh_time is None:
+        show_progress(results_folder)
+        return
+
+    try:
+        while True:
+            print("\033[2J\033[H", end="")
+            show_progress(results_folder)
+            time.sleep(refresh_time)
+    except KeyboardInterrupt:
+        print("")
+
+if __name__ == "__main__":
+    if not (len(sys.argv) == 2 or len(sys.argv) == 3):
+        print("Not the right amount of arguments given!")
+        print("Use:")
+        print("python show_progress.py 'project' [refresh_time]")
+        print("project is either the name of a folder in the 'projects' folder, or...")
+        print("a full path to a project folder (any folder containing a problem_definition.yaml file)")
+        print("refresh_time is optional: keep showing the progress, refreshed every refresh_time seconds (stop with ctrl+c)")
+        print("Got the following arguments:")
+        for arg in range(len(sys.argv[1:])):
+            if arg == 0:
+                print(f"project = {sys.argv[arg+1]}")
+            elif arg == 1:
+                print(f"refresh_time = {sys.argv[arg+1]}")
+            else:
+                print(f"arg_{arg} = {sys.argv[arg+1]}")
+        print("")
+        raise ValueError("Not the right number of arguments supplied! See previous output for help")
+
+    project_name: str = sys.argv[1]
+    refresh_time: float | None = float(sys.argv[2]) if len(sys.argv) == 3 else None
+    show_project_progress(project_name, refresh_time)